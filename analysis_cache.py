@@ -0,0 +1,500 @@
+import os
+import json
+import math
+import time
+import atexit
+import signal
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Any, Optional, Tuple, List
+
+# ========================================
+# CACHE CONFIGURATION
+# ========================================
+
+class CacheSettings:
+    LOCAL_MAX_ENTRIES = 256
+    LOCAL_TTL_SECONDS = 15 * 60
+    SHARED_TTL_SECONDS = 6 * 60 * 60
+    DYNAMO_TABLE_NAME = "FundamentalAnalysisData"
+    SQLITE_PATH = "analysis_cache.sqlite3"
+
+    BACKEND_ENV = "ANALYSIS_CACHE_BACKEND"
+    SQLITE_PATH_ENV = "ANALYSIS_CACHE_SQLITE_PATH"
+
+    WRITE_BEHIND_COALESCE_SECONDS = 0.0
+    WRITE_BEHIND_DRAIN_SECONDS = 2.0
+
+    BACKEND_DYNAMODB = "dynamodb"
+    BACKEND_SQLITE = "sqlite"
+    BACKEND_NONE = "none"
+
+CacheKey = Tuple[str, str]
+
+# ========================================
+# UTILITY FUNCTIONS
+# ========================================
+
+def current_trade_date() -> str:
+    return datetime.now().date().isoformat()
+
+def make_cache_key(ticker: str, trade_date: Optional[str] = None) -> CacheKey:
+    return ticker.upper().strip(), trade_date or current_trade_date()
+
+def convert_floats_to_decimals(obj: Any) -> Any:
+    if isinstance(obj, float):
+        return Decimal(str(obj))
+    elif isinstance(obj, dict):
+        return {key: convert_floats_to_decimals(value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [convert_floats_to_decimals(item) for item in obj]
+    return obj
+
+def convert_decimals_to_floats(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    elif isinstance(obj, dict):
+        return {key: convert_decimals_to_floats(value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [convert_decimals_to_floats(item) for item in obj]
+    return obj
+
+def _dynamo_number(number: Any) -> Optional[Decimal]:
+    # DynamoDB rejects NaN/Infinity, so non-finite floats are stored as NULL
+    number = float(number)
+    return Decimal(repr(number)) if math.isfinite(number) else None
+
+def _same(value: Any) -> Any:
+    return value
+
+def _score_breakdown(breakdown: Dict[str, Any]) -> Dict[str, int]:
+    return {metric: int(metric_score) for metric, metric_score in breakdown.items()}
+
+# Known analysis_data shape: one codec per field, so no value is type-walked; unknown keys fall back to the recursive converters
+ANALYSIS_FLOAT_FIELDS = (
+    "peRatio", "roe", "evToEbitda", "eps", "debtToEquity", "marketCap", "closePrice",
+    "totalScore", "fundamentalScore", "technicalScore", "quantScore", "rank", "score"
+)
+ANALYSIS_TEXT_FIELDS = ("companyName", "sector", "industry", "dataRetrievedAt", "tradeDate", "valuation")
+
+ANALYSIS_ITEM_ENCODERS = {
+    **{field: _dynamo_number for field in ANALYSIS_FLOAT_FIELDS},
+    **{field: _same for field in ANALYSIS_TEXT_FIELDS},
+    "metricsAnalyzed": _same,
+    "scoreBreakdown": _same,
+}
+ANALYSIS_ITEM_DECODERS = {
+    **{field: float for field in ANALYSIS_FLOAT_FIELDS},
+    **{field: _same for field in ANALYSIS_TEXT_FIELDS},
+    "metricsAnalyzed": int,
+    "scoreBreakdown": _score_breakdown,
+}
+DYNAMO_ITEM_KEYS = frozenset(("ticker", "lastUpdated", "cacheDate"))
+
+def analysis_to_dynamo_item(value: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: None if field_value is None else ANALYSIS_ITEM_ENCODERS.get(key, convert_floats_to_decimals)(field_value)
+        for key, field_value in value.items()
+    }
+
+def analysis_from_dynamo_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: None if field_value is None else ANALYSIS_ITEM_DECODERS.get(key, convert_decimals_to_floats)(field_value)
+        for key, field_value in item.items()
+        if key not in DYNAMO_ITEM_KEYS
+    }
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.errors = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "errors": self.errors,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+# ========================================
+# IN-PROCESS TIER
+# ========================================
+
+class LRUTTLCache:
+    def __init__(self, max_entries: int = CacheSettings.LOCAL_MAX_ENTRIES, ttl_seconds: float = CacheSettings.LOCAL_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: CacheKey, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# ========================================
+# SHARED TIERS
+# ========================================
+
+class SQLiteCacheTier:
+    name = CacheSettings.BACKEND_SQLITE
+
+    def __init__(self, path: str = CacheSettings.SQLITE_PATH, ttl_seconds: float = CacheSettings.SHARED_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS analysis_cache ("
+            "ticker TEXT NOT NULL, trade_date TEXT NOT NULL, stored_at REAL NOT NULL, payload TEXT NOT NULL, "
+            "PRIMARY KEY (ticker, trade_date))"
+        )
+        self._connection.commit()
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT stored_at, payload FROM analysis_cache WHERE ticker = ? AND trade_date = ?", key
+            ).fetchone()
+
+        if row is None:
+            self.stats.misses += 1
+            return None
+
+        stored_at, payload = row
+        if time.time() - stored_at > self.ttl_seconds:
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return json.loads(payload)
+
+    def set(self, key: CacheKey, value: Dict[str, Any]) -> None:
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO analysis_cache (ticker, trade_date, stored_at, payload) VALUES (?, ?, ?, ?)",
+                (key[0], key[1], time.time(), payload)
+            )
+            self._connection.commit()
+
+_dynamodb_resource = None
+_dynamodb_resource_lock = threading.Lock()
+
+def get_dynamodb_resource() -> Any:
+    global _dynamodb_resource
+    with _dynamodb_resource_lock:
+        if _dynamodb_resource is None:
+            import boto3
+            _dynamodb_resource = boto3.resource("dynamodb")
+        return _dynamodb_resource
+
+class WriteBehindStats:
+    def __init__(self):
+        self.enqueued = 0
+        self.coalesced = 0
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "written": self.written,
+            "batches": self.batches,
+            "failed": self.failed
+        }
+
+class DynamoDBWriteBehindQueue:
+    def __init__(self, table: Any, partition_key: str = "ticker", coalesce_seconds: float = CacheSettings.WRITE_BEHIND_COALESCE_SECONDS):
+        self.logger = logging.getLogger("DynamoDBWriteBehindQueue")
+        self.table = table
+        self.partition_key = partition_key
+        self.coalesce_seconds = coalesce_seconds
+        self.stats = WriteBehindStats()
+        self._pending: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+        self._in_flight = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        _register_write_behind_queue(self)
+
+    def enqueue(self, item: Dict[str, Any]) -> None:
+        key = item[self.partition_key]
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Write-behind queue is closed")
+            if key in self._pending:
+                self.stats.coalesced += 1
+                del self._pending[key]
+            self._pending[key] = item
+            self.stats.enqueued += 1
+            self._ensure_worker()
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._pending or self._in_flight:
+                self._ensure_worker()
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        drained = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        return drained
+
+    def pending_count(self) -> int:
+        with self._condition:
+            return len(self._pending) + self._in_flight
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="dynamodb-write-behind", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending and self._closed:
+                    return
+            
+            if self.coalesce_seconds:
+                time.sleep(self.coalesce_seconds)
+            
+            with self._condition:
+                items = list(self._pending.values())
+                self._pending.clear()
+                self._in_flight = len(items)
+            
+            try:
+                self._write_batch(items)
+            finally:
+                with self._condition:
+                    self._in_flight = 0
+                    self._condition.notify_all()
+
+    def _write_batch(self, items: List[Dict[str, Any]]) -> None:
+        try:
+            with self.table.batch_writer(overwrite_by_pkeys=[self.partition_key]) as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+            self.stats.written += len(items)
+            self.stats.batches += 1
+        except Exception as error:
+            self.stats.failed += len(items)
+            self.logger.error(f"Write-behind flush of {len(items)} items failed: {str(error)}")
+
+_write_behind_queues: List[DynamoDBWriteBehindQueue] = []
+_write_behind_lock = threading.Lock()
+_shutdown_hooks_installed = False
+
+def _register_write_behind_queue(queue: DynamoDBWriteBehindQueue) -> None:
+    with _write_behind_lock:
+        _write_behind_queues.append(queue)
+    _install_shutdown_hooks()
+
+def drain_write_behind_queues(timeout: float = CacheSettings.WRITE_BEHIND_DRAIN_SECONDS) -> bool:
+    deadline = time.monotonic() + timeout
+    with _write_behind_lock:
+        queues = list(_write_behind_queues)
+    drained = True
+    for queue in queues:
+        drained = queue.flush(max(0.0, deadline - time.monotonic())) and drained
+    return drained
+
+def _install_shutdown_hooks() -> None:
+    global _shutdown_hooks_installed
+    if _shutdown_hooks_installed:
+        return
+    _shutdown_hooks_installed = True
+    
+    atexit.register(drain_write_behind_queues)
+    
+    # Lambda sends SIGTERM before shutting a container down; signals can only be hooked from the main thread
+    if threading.current_thread() is not threading.main_thread():
+        return
+    previous_handler = signal.getsignal(signal.SIGTERM)
+    
+    def _drain_on_sigterm(signum, frame):
+        drain_write_behind_queues()
+        if callable(previous_handler):
+            previous_handler(signum, frame)
+        elif previous_handler == signal.SIG_DFL:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os.kill(os.getpid(), signal.SIGTERM)
+    
+    try:
+        signal.signal(signal.SIGTERM, _drain_on_sigterm)
+    except ValueError:
+        pass
+
+class DynamoDBCacheTier:
+    name = CacheSettings.BACKEND_DYNAMODB
+
+    def __init__(self, table_name: str = CacheSettings.DYNAMO_TABLE_NAME, ttl_seconds: float = CacheSettings.SHARED_TTL_SECONDS, write_behind: bool = True):
+        self.table_name = table_name
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self.table = get_dynamodb_resource().Table(table_name)
+        self.write_queue = DynamoDBWriteBehindQueue(self.table) if write_behind else None
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        ticker, trade_date = key
+        item = self.table.get_item(Key={"ticker": ticker}).get("Item")
+
+        if item is None or item.get("cacheDate") != trade_date:
+            self.stats.misses += 1
+            return None
+
+        try:
+            age_seconds = (datetime.utcnow() - datetime.fromisoformat(item["lastUpdated"])).total_seconds()
+        except (KeyError, ValueError):
+            age_seconds = float("inf")
+
+        if age_seconds > self.ttl_seconds:
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return analysis_from_dynamo_item(item)
+
+    def set(self, key: CacheKey, value: Dict[str, Any]) -> None:
+        ticker, trade_date = key
+        item = {
+            "ticker": ticker,
+            "lastUpdated": datetime.utcnow().isoformat(),
+            "cacheDate": trade_date,
+            **analysis_to_dynamo_item(value)
+        }
+        if self.write_queue is not None:
+            self.write_queue.enqueue(item)
+        else:
+            self.table.put_item(Item=item)
+
+    def get_write_stats(self) -> Dict[str, Any]:
+        if self.write_queue is None:
+            return {}
+        return {**self.write_queue.stats.to_dict(), "pending": self.write_queue.pending_count()}
+
+# ========================================
+# TIERED READ-THROUGH CACHE
+# ========================================
+
+class TieredAnalysisCache:
+    def __init__(self, local_cache: Optional[LRUTTLCache] = None, shared_tier: Any = None):
+        self.logger = logging.getLogger("TieredAnalysisCache")
+        self.local_cache = local_cache or LRUTTLCache()
+        self.shared_tier = shared_tier
+
+    def get(self, ticker: str, trade_date: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        key = make_cache_key(ticker, trade_date)
+
+        value = self.local_cache.get(key)
+        if value is not None:
+            return value
+
+        if self.shared_tier is None:
+            return None
+
+        try:
+            value = self.shared_tier.get(key)
+        except Exception as error:
+            self.shared_tier.stats.errors += 1
+            self.logger.warning(f"Shared cache read failed for {key[0]}: {str(error)}")
+            return None
+
+        if value is not None:
+            self.local_cache.set(key, value)
+        return value
+
+    def set(self, ticker: str, value: Dict[str, Any], trade_date: Optional[str] = None) -> None:
+        key = make_cache_key(ticker, trade_date)
+        self.local_cache.set(key, value)
+
+        if self.shared_tier is None:
+            return
+
+        try:
+            self.shared_tier.set(key, value)
+        except Exception as error:
+            self.shared_tier.stats.errors += 1
+            self.logger.error(f"Shared cache write failed for {key[0]}: {str(error)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {"local": {**self.local_cache.stats.to_dict(), "size": len(self.local_cache)}}
+        if self.shared_tier is not None:
+            stats[self.shared_tier.name] = self.shared_tier.stats.to_dict()
+            if hasattr(self.shared_tier, "get_write_stats"):
+                stats["writeBehind"] = self.shared_tier.get_write_stats()
+        return stats
+
+def create_shared_tier(backend: Optional[str] = None, table_name: str = CacheSettings.DYNAMO_TABLE_NAME) -> Any:
+    logger = logging.getLogger("TieredAnalysisCache")
+    backend = (backend or os.getenv(CacheSettings.BACKEND_ENV, CacheSettings.BACKEND_DYNAMODB)).lower()
+
+    if backend == CacheSettings.BACKEND_NONE:
+        return None
+
+    if backend == CacheSettings.BACKEND_SQLITE:
+        return SQLiteCacheTier(os.getenv(CacheSettings.SQLITE_PATH_ENV, CacheSettings.SQLITE_PATH))
+
+    try:
+        return DynamoDBCacheTier(table_name)
+    except ImportError:
+        logger.warning("boto3 not available - shared DynamoDB cache tier disabled")
+    except Exception as error:
+        logger.error(f"Failed to initialize DynamoDB cache tier: {str(error)}")
+    return None
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import os
+import asyncio
+import weakref
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Callable, AsyncIterator
+
+from analysis_cache import current_trade_date
+from single_flight import AsyncSingleFlight
+
+if TYPE_CHECKING:
+    from lambda_function import FinancialDataService, StockVectorDatabase, ScreenPage
+    from screening import Criteria
+    from stock_history import DateLike, StockHistory
+    from stock_record import StockRecord, StockRecordBatch
+
+# ========================================
+# ASYNC BRIDGE CONFIGURATION
+# ========================================
+
+class AsyncSettings:
+    MAX_WORKERS_ENV = "ASYNC_MAX_WORKERS"
+    TIMEOUT_ENV = "ASYNC_TIMEOUT_SECONDS"
+
+    MAX_WORKERS = 8
+    TIMEOUT_SECONDS = 30.0
+
+_USE_DEFAULT = object()
+
+# ========================================
+# BOUNDED THREAD-POOL BRIDGE
+# ========================================
+
+class BridgeStats:
+    def __init__(self):
+        self.calls = 0
+        self.completed = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.timed_out = 0
+        self.active = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "completed": self.completed,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "timedOut": self.timed_out,
+            "active": self.active
+        }
+
+class BlockingCallBridge:
+    # Runs blocking calls on a bounded pool so the event loop keeps serving other users meanwhile
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = _USE_DEFAULT,
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
+        self.max_workers = max_workers or int(os.getenv(AsyncSettings.MAX_WORKERS_ENV, AsyncSettings.MAX_WORKERS))
+        if timeout is _USE_DEFAULT:
+            timeout = float(os.getenv(AsyncSettings.TIMEOUT_ENV, AsyncSettings.TIMEOUT_SECONDS))
+        self.timeout = timeout
+        self._executor = executor or ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="async-bridge")
+        self._owns_executor = executor is None
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.stats = BridgeStats()
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        # One per loop: scripts that call asyncio.run() per message get a fresh loop each time
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_workers)
+            return semaphore
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = _USE_DEFAULT, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(loop)
+        timeout = self.timeout if timeout is _USE_DEFAULT else timeout
+
+        # Callers past the limit wait here, on the loop, rather than queueing unbounded work in the pool
+        await semaphore.acquire()
+        self.stats.calls += 1
+        self.stats.active += 1
+        future = loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+        def _release(_):
+            self.stats.active -= 1
+            semaphore.release()
+
+        # The slot is held until the thread really finishes, even if the awaiting caller gave up earlier
+        future.add_done_callback(_release)
+        try:
+            # shield: a thread cannot be interrupted, so cancelling only detaches the caller from the result
+            if timeout is None:
+                result = await asyncio.shield(future)
+            else:
+                result = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.CancelledError:
+            self.stats.cancelled += 1
+            raise
+        except asyncio.TimeoutError:
+            self.stats.timed_out += 1
+            raise
+        except Exception:
+            self.stats.errors += 1
+            raise
+        self.stats.completed += 1
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats.to_dict(), "maxWorkers": self.max_workers}
+
+    def close(self, wait: bool = True) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+
+# ========================================
+# ASYNC VECTOR DATABASE
+# ========================================
+
+class AsyncStockVectorDatabase:
+    def __init__(self, stock_db: StockVectorDatabase, bridge: Optional[BlockingCallBridge] = None):
+        self.stock_db = stock_db
+        self.bridge = bridge or BlockingCallBridge()
+
+    async def find_similar_stocks(self, target_security: str, target_date: str = None, top_k: int = 10, query_by_id: bool = True) -> list:
+        return await self.bridge.run(self.stock_db.find_similar_stocks, target_security, target_date, top_k, query_by_id)
+
+    async def fetch_latest_by_securities(self, securities: list) -> Dict[str, StockRecord]:
+        return await self.bridge.run(self.stock_db.fetch_latest_by_securities, securities)
+
+    async def missing_securities(self, securities: list) -> List[str]:
+        return await self.bridge.run(self.stock_db.missing_securities, securities)
+
+    async def search_by_criteria(self, criteria: Criteria, top_k: int = 20, sort_by: str = "total_score", descending: bool = True) -> list:
+        return await self.bridge.run(self.stock_db.search_by_criteria, criteria, top_k, sort_by, descending)
+
+    async def screen(self, criteria: Criteria = None, order_by: Optional[str] = None, limit: Optional[int] = None, page_size: int = 100) -> List[StockRecord]:
+        # screen() is a lazy generator; it is drained inside the worker so no page fetch runs on the loop
+        return await self.bridge.run(lambda: list(self.stock_db.screen(criteria, order_by, limit, page_size)))
+
+    async def screen_page(
+        self,
+        criteria: Criteria,
+        sort_by: str = "total_score",
+        descending: bool = True,
+        page_size: int = 50,
+        cursor: Optional[str] = None
+    ) -> ScreenPage:
+        return await self.bridge.run(self.stock_db.screen_page, criteria, sort_by, descending, page_size, cursor)
+
+    async def iter_screen(
+        self,
+        criteria: Criteria,
+        sort_by: str = "total_score",
+        descending: bool = True,
+        page_size: int = 50
+    ) -> AsyncIterator[StockRecord]:
+        cursor = None
+        while True:
+            page = await self.screen_page(criteria, sort_by, descending, page_size, cursor)
+            for record in page.results:
+                yield record
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    async def cross_section(self, trade_date: str) -> StockRecordBatch:
+        return await self.bridge.run(self.stock_db.cross_section, trade_date)
+
+    async def known_securities(self) -> set:
+        return await self.bridge.run(self.stock_db.known_securities)
+
+    async def get_history(self, security: str, start: DateLike, end: DateLike, **kwargs: Any) -> StockHistory:
+        return await self.bridge.run(self.stock_db.get_history, security, start, end, **kwargs)
+
+    async def get_stock_document(self, target_security: str, target_date: str = None) -> str:
+        return await self.bridge.run(self.stock_db.get_stock_document, target_security, target_date)
+
+    async def get_index_stats(self) -> dict:
+        return await self.bridge.run(self.stock_db.get_index_stats)
+
+    async def is_healthy(self) -> bool:
+        return await self.bridge.run(self.stock_db.is_healthy)
+
+# ========================================
+# ASYNC FINANCIAL DATA SERVICE
+# ========================================
+
+class AsyncFinancialDataService:
+    # Delegates to a FinancialDataService, so scoring, caching and reports are the exact same code paths
+    def __init__(self, service: FinancialDataService, bridge: Optional[BlockingCallBridge] = None):
+        self.service = service
+        self.bridge = bridge or BlockingCallBridge()
+        self.stock_db = AsyncStockVectorDatabase(service.stock_db, self.bridge)
+        self.single_flight = AsyncSingleFlight()
+
+    @classmethod
+    async def create(cls, bridge: Optional[BlockingCallBridge] = None, **service_kwargs: Any) -> "AsyncFinancialDataService":
+        from lambda_function import FinancialDataService
+        bridge = bridge or BlockingCallBridge()
+        # Connecting to the index blocks, so construction goes through the pool as well
+        service = await bridge.run(lambda: FinancialDataService(**service_kwargs), timeout=None)
+        return cls(service, bridge)
+
+    async def analyze_stock(self, ticker: str, include_report: bool = True, timeout: Optional[float] = _USE_DEFAULT) -> Dict[str, Any]:
+        normalized = str(ticker).upper().strip()
+        # Coalescing on the loop means waiters for a hot ticker hold no pool thread at all
+        key = (normalized, current_trade_date(), include_report)
+        try:
+            result = await self.single_flight.do(
+                key, lambda: self.bridge.run(self.service.analyze_stock, ticker, include_report, timeout=timeout)
+            )
+        except asyncio.TimeoutError:
+            return self.service._create_error_response(f"Analysis for '{normalized}' timed out. Please try again.")
+        return self.service._copy_result(result)
+
+    async def analyze_stocks(self, tickers: List[str], include_report: bool = True, timeout: Optional[float] = _USE_DEFAULT) -> Dict[str, Any]:
+        try:
+            return await self.bridge.run(self.service.analyze_stocks, tickers, include_report, timeout=timeout)
+        except asyncio.TimeoutError:
+            return self.service._create_error_response("Batch analysis timed out. Please try again.")
+
+    async def score_sector_relative(self, ticker: str, trade_date: Optional[str] = None) -> Dict[str, Any]:
+        return await self.bridge.run(self.service.score_sector_relative, ticker, trade_date)
+
+    async def top_n(self, sector: Optional[str] = None, n: int = 10) -> Dict[str, Any]:
+        return await self.bridge.run(self.service.top_n, sector, n)
+
+    async def rank_of(self, ticker: str) -> Dict[str, Any]:
+        return await self.bridge.run(self.service.rank_of, ticker)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return self.service.get_cache_stats()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return self.service.get_metrics()
+
+    def get_concurrency_stats(self) -> Dict[str, Any]:
+        return {"bridge": self.bridge.get_stats(), "singleFlight": self.single_flight.get_stats()}
+
+    async def aclose(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.bridge.close)
+
+    async def __aenter__(self) -> "AsyncFinancialDataService":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_service import AsyncFinancialDataService, BlockingCallBridge
+from bench_single_flight import BACKEND_LATENCY_SECONDS, make_service
+
+USERS = (8, 32)
+HEARTBEAT_SECONDS = 0.005
+
+async def measure(label: str, run_requests) -> None:
+    # A heartbeat task stands in for every other Discord user: its lag is how long the loop was frozen
+    lags = []
+
+    async def heartbeat():
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            lags.append(time.perf_counter() - started - HEARTBEAT_SECONDS)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    results = await run_requests()
+    elapsed = time.perf_counter() - started
+    # Let the heartbeat wake once more so a stall that lasted the whole run is recorded too
+    await asyncio.sleep(HEARTBEAT_SECONDS * 2)
+    beat.cancel()
+    assert all(result["success"] for result in results), "analysis failed"
+    print(f"{label:<40} wall={elapsed * 1000:8.1f}ms  max loop stall={max(lags, default=0.0) * 1000:8.1f}ms")
+
+async def main():
+    logging.disable(logging.CRITICAL)
+    print(f"Concurrent users on one event loop, {BACKEND_LATENCY_SECONDS * 1000:.0f}ms backend, distinct tickers")
+    print("-" * 80)
+
+    for users in USERS:
+        tickers = [f"T{position:03d}" for position in range(users)]
+        blocking = make_service(coalesce=True)
+
+        async def on_loop():
+            # What the bots do today: call the blocking service straight from a coroutine
+            return [blocking.analyze_stock(ticker) for ticker in tickers]
+
+        await measure(f"{users} users, blocking on the loop", on_loop)
+
+        bridged = AsyncFinancialDataService(make_service(coalesce=True), BlockingCallBridge(max_workers=8))
+
+        async def through_bridge():
+            return await asyncio.gather(*(bridged.analyze_stock(ticker) for ticker in tickers))
+
+        await measure(f"{users} users, AsyncFinancialDataService", through_bridge)
+        await bridged.aclose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUNS = 7
+IMPORT_BUDGET_MS = 150.0
+HEAVY_MODULES = ("numpy", "pandas", "pinecone", "pyarrow", "dotenv")
+
+# Runs in a fresh interpreter per sample so nothing is already imported or warmed
+PROBE = """
+import os, sys, json, time
+start = time.perf_counter()
+import lambda_function
+import_ms = (time.perf_counter() - start) * 1000
+loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+
+init_ms = None
+if os.getenv("PINECONE_API_KEY") or os.getenv("VECTOR_BACKEND") == "local":
+    start = time.perf_counter()
+    lambda_function.FinancialDataService(use_caching=False)
+    init_ms = (time.perf_counter() - start) * 1000
+
+start = time.perf_counter()
+lambda_function.lambda_handler({"actionGroup": "bench", "function": "analyze", "parameters": []}, None)
+first_error_ms = (time.perf_counter() - start) * 1000
+
+print(json.dumps({"import_ms": import_ms, "init_ms": init_ms, "first_error_ms": first_error_ms, "loaded": loaded}))
+"""
+
+def run_probe() -> dict:
+    env = {**os.environ, "AWS_LAMBDA_FUNCTION_NAME": os.getenv("AWS_LAMBDA_FUNCTION_NAME", "bench-cold-start")}
+    output = subprocess.run(
+        [sys.executable, "-c", f"HEAVY_MODULES = {HEAVY_MODULES!r}\n{PROBE}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def summarize(label: str, samples: list) -> None:
+    if not samples:
+        print(f"{label:<34} skipped (set PINECONE_API_KEY or VECTOR_BACKEND=local)")
+        return
+    print(f"{label:<34} p50={statistics.median(samples):8.1f}ms  max={max(samples):8.1f}ms")
+
+def main() -> int:
+    probes = [run_probe() for _ in range(RUNS)]
+    import_samples = [probe["import_ms"] for probe in probes]
+    loaded = sorted({name for probe in probes for name in probe["loaded"]})
+
+    print(f"Cold start over {RUNS} fresh interpreters (budget: import p50 < {IMPORT_BUDGET_MS:.0f}ms, no heavy modules)")
+    print("-" * 80)
+    summarize("import lambda_function", import_samples)
+    summarize("FinancialDataService() init", [probe["init_ms"] for probe in probes if probe["init_ms"] is not None])
+    summarize("first handler call (error path)", [probe["first_error_ms"] for probe in probes])
+    print(f"{'heavy modules loaded by import':<34} {', '.join(loaded) or 'none'}")
+
+    regressed = statistics.median(import_samples) > IMPORT_BUDGET_MS or bool(loaded)
+    print("\nREGRESSION" if regressed else "\nOK")
+    return 1 if regressed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+import logging
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_builder import create_bedrock_error_response
+from lambda_function import lambda_handler
+
+ITERATIONS = 10_000
+P99_BUDGET_MS = 1.0
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def measure(label, fn, iterations=ITERATIONS):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    
+    p50 = statistics.median(samples)
+    p99 = percentile(samples, 99)
+    status = "OK" if p99 < P99_BUDGET_MS else "OVER BUDGET"
+    print(f"{label:<40} p50={p50:.4f}ms  p99={p99:.4f}ms  [{status}]")
+    return p99
+
+def main():
+    # Keep handler logging out of the measurement
+    logging.disable(logging.CRITICAL)
+    
+    print(f"Error path latency over {ITERATIONS:,} iterations (budget p99 < {P99_BUDGET_MS}ms)")
+    print("-" * 80)
+    
+    builder_p99 = measure(
+        "create_bedrock_error_response",
+        lambda: create_bedrock_error_response(
+            "Missing required parameter: ticker symbol",
+            "FinancialAnalysisActionGroup", "getFinancialAnalysis", "1.0"
+        )
+    )
+    handler_p99 = measure(
+        "lambda_handler (missing ticker)",
+        lambda: lambda_handler({"actionGroup": "FinancialAnalysisActionGroup", "parameters": []}, None)
+    )
+    
+    return 0 if max(builder_p99, handler_p99) < P99_BUDGET_MS else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
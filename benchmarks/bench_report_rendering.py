@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lambda_function import FinancialDataService, FinancialMetricsScorer, VectorizedMetricsScorer
+
+ROW_COUNTS = (1_000, 100_000)
+
+def make_rows(rows: int, seed: int = 7) -> list:
+    rng = np.random.default_rng(seed)
+    columns = {
+        "peRatio": rng.uniform(0.5, 40, rows),
+        "roe": rng.uniform(0.5, 40, rows),
+        "evToEbitda": rng.uniform(0.5, 30, rows),
+        "eps": rng.uniform(0.1, 12, rows),
+        "marketCap": rng.uniform(1e6, 3e12, rows),
+    }
+    return [
+        {
+            "companyName": f"SEC{row:06d}",
+            "sector": "BANK",
+            **{name: float(values[row]) for name, values in columns.items()}
+        }
+        for row in range(rows)
+    ]
+
+def scoring_service(lazy_reports: bool = True) -> FinancialDataService:
+    # Scoring and rendering do not touch Pinecone, so skip __init__ and its connection
+    service = object.__new__(FinancialDataService)
+    service.metrics_scorer = FinancialMetricsScorer()
+    service.vectorized_scorer = VectorizedMetricsScorer()
+    service.lazy_reports = lazy_reports
+    return service
+
+def lazy_rendered(service: FinancialDataService, rows: list) -> list:
+    results = service._perform_batch_financial_analysis(rows)
+    for analysis_results in results:
+        str(analysis_results["rationale"])
+        str(analysis_results["userFriendlyReport"])
+    return results
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main():
+    lazy_service = scoring_service()
+    eager_service = scoring_service(lazy_reports=False)
+
+    print(f"{'rows':>9} {'eager (s)':>10} {'lazy, unread (s)':>17} {'opt-out (s)':>12} {'lazy, all read (s)':>19} {'saving':>8}")
+    print("-" * 82)
+
+    for rows in ROW_COUNTS:
+        data = make_rows(rows)
+        eager_seconds = timed(lambda: eager_service._perform_batch_financial_analysis(data))
+        lazy_seconds = timed(lambda: lazy_service._perform_batch_financial_analysis(data))
+        opt_out_seconds = timed(lambda: lazy_service._perform_batch_financial_analysis(data, include_report=False))
+        lazy_read_seconds = timed(lambda: lazy_rendered(lazy_service, data))
+        print(
+            f"{rows:>9,} {eager_seconds:>10.3f} {lazy_seconds:>17.3f} {opt_out_seconds:>12.3f} "
+            f"{lazy_read_seconds:>19.3f} {eager_seconds / opt_out_seconds:>7.1f}x"
+        )
+    print("\nEvery report read: lazy rendering costs more than eager, so the Lambda handler renders eagerly.")
+
+    sample = make_rows(200)
+    eager = eager_service._perform_batch_financial_analysis(sample)
+    lazy = lazy_rendered(lazy_service, sample)
+    for before, after in zip(eager, lazy):
+        assert before["rationale"] == str(after["rationale"]), "rationale mismatch"
+        assert before["userFriendlyReport"] == str(after["userFriendlyReport"]), "report mismatch"
+    print("Lazily rendered reports identical to eager rendering.")
+
+if __name__ == "__main__":
+    main()
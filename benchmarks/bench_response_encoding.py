@@ -0,0 +1,106 @@
+import os
+import sys
+import json
+import time
+import statistics
+from datetime import datetime
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import response_builder
+from response_builder import create_batch_report, deduplicate_technical_data
+from lambda_function import FinancialDataService, FinancialMetricsScorer, VectorizedMetricsScorer
+
+ITERATIONS = 2_000
+BATCH_TICKERS = 25
+
+def scoring_service() -> FinancialDataService:
+    # Building payloads does not touch Pinecone, so skip __init__ and its connection
+    service = object.__new__(FinancialDataService)
+    service.metrics_scorer = FinancialMetricsScorer()
+    service.lazy_reports = True
+    service.vectorized_scorer = VectorizedMetricsScorer()
+    return service
+
+def make_result(service: FinancialDataService, ticker: str, offset: int) -> dict:
+    financial_data = {
+        "companyName": ticker,
+        "peRatio": 12.5 + offset,
+        "roe": 18.25,
+        "evToEbitda": 8.75 + offset / 2,
+        "eps": 3.4,
+        "debtToEquity": None,
+        "marketCap": Decimal("254300000000.5"),
+        "sector": "BANK",
+        "industry": "Commercial Banks",
+        "dataRetrievedAt": datetime.now(),
+        "closePrice": Decimal("42.35"),
+        "totalScore": Decimal("71.2"),
+        "fundamentalScore": Decimal("73"),
+        "technicalScore": 64.1,
+        "quantScore": 70.9,
+        "rank": offset + 1,
+        "tradeDate": "2024-01-03"
+    }
+    return {
+        'success': True,
+        'ticker': ticker,
+        'timestamp': datetime.now().isoformat(),
+        'data': {**financial_data, **service._perform_financial_analysis(financial_data)}
+    }
+
+def legacy_body(analysis_results: dict) -> str:
+    # Previous behaviour: full technicalData (report included) through json.dumps(default=str)
+    if 'results' in analysis_results:
+        formatted = {"analysisReport": create_batch_report(analysis_results), "technicalData": analysis_results}
+    else:
+        formatted = {"analysisReport": analysis_results['data']['userFriendlyReport'], "technicalData": analysis_results}
+    return json.dumps(formatted, default=str)
+
+def new_body(analysis_results: dict, encoder) -> str:
+    if 'results' in analysis_results:
+        report = create_batch_report(analysis_results)
+    else:
+        report = analysis_results['data']['userFriendlyReport']
+    return encoder({"analysisReport": report, "technicalData": deduplicate_technical_data(analysis_results)})
+
+def measure(fn) -> float:
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(samples)
+
+def main():
+    service = scoring_service()
+    single = make_result(service, "COMI", 0)
+    tickers = [f"T{index:03d}" for index in range(BATCH_TICKERS)]
+    batch = {
+        'success': True,
+        'tickers': tickers,
+        'timestamp': datetime.now().isoformat(),
+        'results': {ticker: make_result(service, ticker, index) for index, ticker in enumerate(tickers)},
+        'failed': {}
+    }
+    for payload in [single] + list(batch['results'].values()):
+        str(payload['data']['userFriendlyReport'])
+
+    encoders = [("stdlib compact", response_builder._encode_stdlib)]
+    if response_builder.orjson is not None:
+        encoders.append(("orjson", response_builder._encode_orjson))
+
+    print(f"{'payload':<10} {'encoder':<16} {'bytes':>9} {'p50 (us)':>10}")
+    print("-" * 48)
+    for label, payload in (("single", single), (f"batch x{BATCH_TICKERS}", batch)):
+        legacy = legacy_body(payload)
+        print(f"{label:<10} {'legacy':<16} {len(legacy.encode()):>9,} {measure(lambda: legacy_body(payload)):>10.1f}")
+        for name, encoder in encoders:
+            body = new_body(payload, encoder)
+            decoded = json.loads(body)
+            assert "userFriendlyReport" not in json.dumps(decoded["technicalData"]), "report still duplicated"
+            print(f"{'':<10} {name:<16} {len(body.encode()):>9,} {measure(lambda: new_body(payload, encoder)):>10.1f}")
+
+if __name__ == "__main__":
+    main()
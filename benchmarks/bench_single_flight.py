@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lambda_function import FinancialDataService, FinancialMetricsScorer, setup_logger
+from negative_cache import NegativeTickerCache
+from single_flight import SingleFlight
+from stock_record import StockRecord
+
+BACKEND_LATENCY_SECONDS = 0.05
+BURSTS = ((32, 1), (32, 4), (64, 8))
+
+class SlowStockDatabase:
+    # Stands in for Pinecone: fixed round-trip latency and a count of queries that reached it
+    def __init__(self):
+        self.queries = 0
+        self._lock = threading.Lock()
+
+    def fetch_latest_by_securities(self, securities: list) -> dict:
+        with self._lock:
+            self.queries += 1
+        time.sleep(BACKEND_LATENCY_SECONDS)
+        return {
+            security: StockRecord(
+                security=security, trade_date="2024-01-03", sector="BANK", close_price=42.0,
+                market_cap=5e10, pe_ratio=12.5, fundamental_score=64.0, total_score=71.0, rank=12.0
+            )
+            for security in securities
+        }
+
+class PassThrough:
+    def do(self, key, fn):
+        return fn()
+
+def make_service(coalesce: bool) -> FinancialDataService:
+    # No cache and no Pinecone connection: every uncoalesced call pays the backend round trip
+    service = object.__new__(FinancialDataService)
+    service.logger = setup_logger("FinancialDataService")
+    service.use_caching = False
+    service.lazy_reports = True
+    service.analysis_cache = None
+    service.metrics_scorer = FinancialMetricsScorer()
+    service.negative_cache = NegativeTickerCache()
+    service.stock_db = SlowStockDatabase()
+    service.single_flight = SingleFlight() if coalesce else PassThrough()
+    return service
+
+def run_burst(service: FinancialDataService, callers: int, tickers: int) -> float:
+    requests = [f"T{position % tickers:03d}" for position in range(callers)]
+    barrier = threading.Barrier(callers)
+
+    def call(ticker: str) -> dict:
+        barrier.wait()
+        return service.analyze_stock(ticker)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        results = list(executor.map(call, requests))
+    elapsed = time.perf_counter() - start
+    assert all(result["success"] for result in results), "analysis failed"
+    return elapsed
+
+def main():
+    logging.disable(logging.CRITICAL)
+    print(f"Concurrent analyze_stock bursts against a {BACKEND_LATENCY_SECONDS * 1000:.0f}ms backend")
+    print(f"{'callers':>8} {'tickers':>8} {'queries (off)':>14} {'queries (on)':>13} {'ratio':>7} {'wall off (ms)':>14} {'wall on (ms)':>13}")
+    print("-" * 84)
+
+    for callers, tickers in BURSTS:
+        plain = make_service(coalesce=False)
+        plain_seconds = run_burst(plain, callers, tickers)
+        coalesced = make_service(coalesce=True)
+        coalesced_seconds = run_burst(coalesced, callers, tickers)
+        stats = coalesced.get_coalescing_stats()
+        print(
+            f"{callers:>8} {tickers:>8} {plain.stock_db.queries:>14} {coalesced.stock_db.queries:>13} "
+            f"{stats['coalescingRatio']:>7.2f} {plain_seconds * 1000:>14.1f} {coalesced_seconds * 1000:>13.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
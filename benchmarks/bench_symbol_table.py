@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import random
+import string
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from symbol_table import SymbolTable, normalize_name
+
+UNIVERSE_SIZES = (1_000, 5_000)
+LOOKUPS = 200
+
+def make_universe(size: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    names = {}
+    while len(names) < size:
+        security = "".join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(2, 6)))
+        # Name words longer than any ticker, so a name never collides with another security's symbol
+        words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(7, 10))) for _ in range(rng.randint(1, 2))]
+        names[security] = " ".join(words).title() + " Public Company Limited"
+    return names
+
+def swap_letters(text: str, position: int) -> str:
+    return text[:position] + text[position + 1] + text[position] + text[position + 2:]
+
+def per_call_us(fn, queries: list) -> float:
+    calls = iter(queries * 5)
+    best = min(timeit.repeat(lambda: fn(next(calls)), number=len(queries), repeat=5))
+    return best / len(queries) * 1e6
+
+def main():
+    print(f"{'securities':>10} {'build (ms)':>11} {'exact (us)':>11} {'prefix (us)':>12} {'fuzzy (us)':>11} {'extract (us)':>13}")
+    print("-" * 74)
+
+    for size in UNIVERSE_SIZES:
+        names = make_universe(size)
+        start = time.perf_counter()
+        table = SymbolTable.from_securities(names, names=names)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        sample = random.Random(1).sample(sorted(names), LOOKUPS)
+        first_words = [names[security].split()[0].lower() for security in sample]
+        typos = [swap_letters(normalize_name(names[security]), 1) for security in sample]
+        sentences = [f"what do you think about {typo} this quarter" for typo in typos]
+
+        resolved = sum(
+            1 for security, typo in zip(sample, typos)
+            if (match := table.fuzzy(typo)) is not None and match.security == security
+        )
+        assert all(table.lookup(names[security]) == security for security in sample), "exact lookup missed"
+
+        print(
+            f"{size:>10,} {build_ms:>11.1f} {per_call_us(table.lookup, first_words):>11.2f} "
+            f"{per_call_us(lambda word: table.prefix(word[:3]), first_words):>12.2f} "
+            f"{per_call_us(table.fuzzy, typos):>11.2f} {per_call_us(table.extract, sentences):>13.2f}"
+        )
+        print(f"{'':>10} transposed names resolved to the right security: {resolved}/{LOOKUPS}")
+
+if __name__ == "__main__":
+    main()
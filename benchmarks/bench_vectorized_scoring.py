@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lambda_function import FinancialDataService, FinancialMetricsScorer, VectorizedMetricsScorer
+
+ROW_COUNTS = (10_000, 1_000_000)
+
+def make_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "peRatio": rng.uniform(-5, 40, rows),
+        "roe": rng.uniform(-10, 40, rows),
+        "evToEbitda": rng.uniform(0, 30, rows),
+        "eps": rng.uniform(-2, 12, rows),
+    })
+    # Sprinkle missing values so the validity handling is exercised
+    for column in frame.columns:
+        frame.loc[rng.random(rows) < 0.05, column] = np.nan
+    return frame
+
+def scalar_service() -> FinancialDataService:
+    # Scoring does not touch Pinecone, so skip __init__ and its connection
+    service = object.__new__(FinancialDataService)
+    service.metrics_scorer = FinancialMetricsScorer()
+    return service
+
+def score_scalar(service: FinancialDataService, records: list) -> list:
+    results = []
+    for record in records:
+        score, breakdown, count = service._calculate_overall_score(record)
+        valuation = service._determine_valuation_category(score) if count else VectorizedMetricsScorer.UNABLE_TO_EVALUATE
+        results.append((round(score, 2), valuation, count, breakdown))
+    return results
+
+def assert_identical(scalar_results: list, scored: dict) -> None:
+    for row, (score, valuation, count, breakdown) in enumerate(scalar_results):
+        assert scored["score"][row] == score, f"score mismatch at row {row}"
+        assert scored["valuation"][row] == valuation, f"valuation mismatch at row {row}"
+        assert scored["metricsAnalyzed"][row] == count, f"metric count mismatch at row {row}"
+        assert VectorizedMetricsScorer.breakdown_at(scored, row) == breakdown, f"breakdown mismatch at row {row}"
+
+def main():
+    service = scalar_service()
+    
+    print(f"{'rows':>10} {'scalar (s)':>12} {'vectorized (s)':>15} {'speedup':>9}")
+    print("-" * 50)
+    
+    for rows in ROW_COUNTS:
+        frame = make_frame(rows)
+        records = [
+            {key: (None if pd.isna(value) else value) for key, value in record.items()}
+            for record in frame.to_dict("records")
+        ]
+        
+        start = time.perf_counter()
+        scalar_results = score_scalar(service, records)
+        scalar_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        scored = VectorizedMetricsScorer.score_columns(
+            frame["peRatio"].to_numpy(), frame["roe"].to_numpy(),
+            frame["evToEbitda"].to_numpy(), frame["eps"].to_numpy()
+        )
+        vectorized_seconds = time.perf_counter() - start
+        
+        assert_identical(scalar_results, scored)
+        print(f"{rows:>10,} {scalar_seconds:>12.3f} {vectorized_seconds:>15.4f} {scalar_seconds / vectorized_seconds:>8.0f}x")
+    
+    print("\nVectorized results identical to the scalar path.")
+
+if __name__ == "__main__":
+    main()
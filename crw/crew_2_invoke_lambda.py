@@ -1,11 +1,14 @@
 import json
 import os
-import re
+import sys
 import boto3
 from crewai import Agent, Task, Crew
 from crewai_tools import tool
 from langchain_anthropic import ChatAnthropic
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from symbol_table import DEFAULT_ALIASES, SymbolMatch, SymbolTable, typed_tickers
+
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
@@ -313,6 +316,8 @@ def print_help():
     print("   • Request specific aspects like 'P/E ratio of Apple'")
     print("-" * 60)
 
+symbol_table = SymbolTable.from_securities(DEFAULT_ALIASES)
+
 def extract_stock_symbol(user_input):
     """
     Extract stock symbol from natural language input
@@ -323,49 +328,15 @@ def extract_stock_symbol(user_input):
     Returns:
         tuple: (symbol, confidence) where symbol is the extracted ticker and confidence is how sure we are
     """
-    # Common company name to ticker mappings
-    company_mappings = {
-        'apple': 'AAPL',
-        'microsoft': 'MSFT', 
-        'google': 'GOOGL',
-        'alphabet': 'GOOGL',
-        'amazon': 'AMZN',
-        'tesla': 'TSLA',
-        'facebook': 'META',
-        'meta': 'META',
-        'netflix': 'NFLX',
-        'nvidia': 'NVDA',
-        'samsung': 'SSNLF',
-        'toyota': 'TM',
-        'kasikorn': 'KBANK',
-        'kasikornbank': 'KBANK',
-        'kbank': 'KBANK',
-        'ptt': 'PTT',
-        'true': 'TRUE',
-        'cp': 'CP',
-        'cpall': 'CPALL'
-    }
-    
-    # Clean input
-    cleaned_input = user_input.lower().strip()
+    match = symbol_table.extract(user_input)
+    if match is not None:
+        return match.security, 'medium' if match.kind == SymbolMatch.KIND_FUZZY else 'high'
     
-    # Method 1: Look for explicit ticker symbols (2-5 uppercase letters)
-    ticker_pattern = r'\b[A-Z]{2,5}\b'
-    tickers = re.findall(ticker_pattern, user_input.upper())
+    # Tickers the alias table does not know still go to the Lambda when typed in capitals
+    tickers = typed_tickers(user_input)
     if tickers:
         return tickers[0], 'high'
     
-    # Method 2: Look for company names in our mapping
-    for company, ticker in company_mappings.items():
-        if company in cleaned_input:
-            return ticker, 'high'
-    
-    # Method 3: Look for potential ticker-like patterns in lowercase
-    potential_tickers = re.findall(r'\b[a-zA-Z]{2,5}\b', cleaned_input)
-    for potential in potential_tickers:
-        if potential.upper() in ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NFLX', 'NVDA', 'KBANK', 'PTT']:
-            return potential.upper(), 'medium'
-    
     return None, 'none'
 
 def generate_conversational_response(user_input, symbol):
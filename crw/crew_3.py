@@ -1,5 +1,6 @@
 import json
 import os
+import sys
 import random
 from datetime import datetime
 from crewai import Agent, Task, Crew
@@ -11,6 +12,9 @@ load_dotenv()
 from langfuse import get_client
 from langfuse.langchain import CallbackHandler
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from symbol_table import SymbolTable
+
 # Initialize Langfuse client using environment variables:
 #   LANGFUSE_PUBLIC_KEY, LANGFUSE_SECRET_KEY, LANGFUSE_HOST
 # If not configured, SDK will be disabled gracefully.
@@ -218,6 +222,10 @@ class MockFinancialDataService:
 
 # Initialize mock financial service
 financial_service = MockFinancialDataService()
+symbol_table = SymbolTable.from_securities(
+    financial_service.mock_stocks,
+    names={symbol: stock['name'] for symbol, stock in financial_service.mock_stocks.items()}
+)
 print("✅ Mock Financial Data Service initialized successfully")
 
 # Custom tool to perform fundamental analysis using mock data
@@ -460,8 +468,13 @@ def analyze_stock(symbol: str) -> str:
 
 def extract_stock_symbol(user_input: str) -> str:
     """
-    Use LLM to extract stock symbol from natural language input
+    Resolve the stock symbol from the symbol table, falling back to the LLM only when that finds nothing
     """
+    match = symbol_table.extract(user_input)
+    if match is not None:
+        print(f"🔍 Found {match.kind} match: {match.matched} -> {match.security}")
+        return match.security
+
     try:
         # Create a more specific prompt for the LLM to extract stock symbols
         prompt = f"""
@@ -555,37 +568,10 @@ def chatbot_interface():
                 print("❌ Please enter a question or command.")
                 continue
             
-            # Use LLM to extract stock symbol from natural language
+            # Symbol table first; the LLM is only asked when no name, ticker or close typo matches
             print(f"\n🔍 Processing your request...")
             symbol = extract_stock_symbol(user_input)
             
-            # Fallback: Try direct symbol matching if LLM fails
-            if symbol is None:
-                # Check if user input contains any stock symbols directly
-                user_input_upper = user_input.upper()
-                for stock_symbol in financial_service.mock_stocks.keys():
-                    if stock_symbol in user_input_upper:
-                        symbol = stock_symbol
-                        print(f"🔍 Found direct symbol match: {symbol}")
-                        break
-                
-                # Check for company name variations
-                if symbol is None:
-                    company_mappings = {
-                        'apple': 'AAPL',
-                        'microsoft': 'MSFT', 
-                        'google': 'GOOGL',
-                        'tesla': 'TSLA',
-                        'amazon': 'AMZN'
-                    }
-                    
-                    user_input_lower = user_input.lower()
-                    for company, ticker in company_mappings.items():
-                        if company in user_input_lower:
-                            symbol = ticker
-                            print(f"🔍 Found company name match: {company} -> {symbol}")
-                            break
-            
             if symbol is None:
                 print(f"❌ I couldn't identify a valid stock in your request.")
                 print("Available stocks: AAPL, MSFT, GOOGL, TSLA, AMZN")
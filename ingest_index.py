@@ -0,0 +1,297 @@
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Iterator
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+from lambda_function import StockVectorDatabase, setup_logger
+from vector_store import VectorBackendSettings, create_vector_backend, ensure_pinecone_index
+
+# ========================================
+# INGESTION CONFIGURATION
+# ========================================
+
+class IngestionSettings:
+    BATCH_SIZE = 100
+    WORKERS = 4
+    CHUNK_ROWS = 5000
+    MAX_RETRIES = 5
+    BASE_BACKOFF_SECONDS = 0.5
+    MAX_BACKOFF_SECONDS = 30.0
+
+    SECURITY_COLUMN = "SECURITY"
+    TRADE_DATE_COLUMN = "TRADE_DATE"
+    SECTOR_COLUMN = "SECTOR"
+    INDUSTRY_COLUMN = "INDUSTRY"
+    DOCUMENT_COLUMN = "DOCUMENT"
+    COMPANY_NAME_COLUMN = "COMPANY_NAME"
+
+# Metadata fields read back by StockVectorDatabase and FinancialDataService
+METADATA_FIELDS = {
+    "OPEN_PRC": "open_price",
+    "CLOSE_PRC": "close_price",
+    "MKT_CAP": "market_cap",
+    "PE_RATIO": "pe_ratio",
+    "PB_RATIO": "pb_ratio",
+    "BOOK_VALUE": "book_value",
+    "DVD_YIELD": "dvd_yield",
+    "Total_score": "total_score",
+    "Fundamental_Score": "fundamental_score",
+    "Technic_Score": "technical_score",
+    "Quant_Score": "quant_score",
+    "Rank": "rank",
+    "SECTOR_MKT_PE": "sector_mkt_pe",
+    "SECTOR_MKT_PBV": "sector_mkt_pbv",
+}
+
+REQUIRED_METADATA_FIELDS = ("close_price", "market_cap", "pe_ratio", "total_score", "rank")
+
+# ========================================
+# FEATURE PREPARATION
+# ========================================
+
+def normalize_features(values: np.ndarray) -> np.ndarray:
+    # Signed log scaling keeps prices, ratios and market caps on comparable ranges without cross-row statistics
+    values = np.asarray(values, dtype=np.float64)
+    normalized = np.sign(values) * np.log1p(np.abs(values))
+    return np.nan_to_num(normalized, nan=0.0, posinf=0.0, neginf=0.0).astype(np.float32)
+
+def format_trade_date(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    text = str(value).strip()
+    for date_format in ("%Y-%m-%d", "%Y%m%d", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return pd.Timestamp(text).to_pydatetime()
+
+def build_vector_id(security: str, trade_date: datetime) -> str:
+    return f"{security}_{trade_date.strftime('%Y%m%d')}"
+
+def _text(value: Any, default: str) -> str:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return default
+    text = str(value).strip()
+    return text or default
+
+def build_document(metadata: Dict[str, Any]) -> str:
+    return (
+        f"{metadata['security']} ({metadata.get('sector', 'Unknown')}) on {metadata['trade_date']}: "
+        f"close {metadata['close_price']:.2f}, P/E {metadata['pe_ratio']:.2f}, "
+        f"total score {metadata['total_score']:.1f}, rank {metadata['rank']:.0f}"
+    )
+
+def build_vectors(frame: pd.DataFrame, key_metrics: List[str]) -> List[Dict[str, Any]]:
+    missing = [column for column in key_metrics + [IngestionSettings.SECURITY_COLUMN, IngestionSettings.TRADE_DATE_COLUMN] if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Market file is missing required columns: {', '.join(missing)}")
+
+    metric_values = frame[key_metrics].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+    features = normalize_features(metric_values)
+    metric_positions = {metric: position for position, metric in enumerate(key_metrics)}
+
+    vectors = []
+    for row_number, row in enumerate(frame.itertuples(index=False)):
+        row = row._asdict()
+        security = str(row[IngestionSettings.SECURITY_COLUMN]).upper().strip()
+        trade_date = format_trade_date(row[IngestionSettings.TRADE_DATE_COLUMN])
+
+        metadata = {
+            "security": security,
+            "trade_date": trade_date.strftime("%Y-%m-%d"),
+            "sector": _text(row.get(IngestionSettings.SECTOR_COLUMN), "Unknown"),
+            "industry": _text(row.get(IngestionSettings.INDUSTRY_COLUMN), "Unknown"),
+        }
+        for column, field in METADATA_FIELDS.items():
+            value = metric_values[row_number, metric_positions[column]] if column in metric_positions else np.nan
+            if np.isfinite(value):
+                metadata[field] = float(value)
+            elif field in REQUIRED_METADATA_FIELDS:
+                metadata[field] = 0.0
+        metadata["document"] = _text(row.get(IngestionSettings.DOCUMENT_COLUMN), "") or build_document(metadata)
+        # Optional; lets symbol_table resolve company names to securities straight from the index
+        company_name = _text(row.get(IngestionSettings.COMPANY_NAME_COLUMN), "")
+        if company_name:
+            metadata["company_name"] = company_name
+
+        vectors.append({
+            "id": build_vector_id(security, trade_date),
+            "values": features[row_number].tolist(),
+            "metadata": metadata
+        })
+    return vectors
+
+# ========================================
+# STREAMING SOURCE + CHECKPOINTS
+# ========================================
+
+def iter_market_file(path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if path.lower().endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+        for record_batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield record_batch.to_pandas()
+    else:
+        for chunk in pd.read_csv(path, chunksize=chunk_rows):
+            yield chunk
+
+def describe_target(backend: Any) -> str:
+    location = getattr(backend, "index_name", None) or getattr(backend, "path", None) or ""
+    return f"{getattr(backend, 'name', type(backend).__name__)}:{location}"
+
+class IngestionCheckpoint:
+    def __init__(self, path: str, source: str, target: str = ""):
+        self.path = path
+        self.source = os.path.abspath(source)
+        # A file rewritten in place or a run against another index must start over, not resume at the old offset
+        stat = os.stat(source)
+        self.fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "target": target}
+        self.rows_completed = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as checkpoint_file:
+            state = json.load(checkpoint_file)
+        if state.get("source") == self.source and state.get("fingerprint") == self.fingerprint:
+            self.rows_completed = int(state.get("rows_completed", 0))
+
+    def save(self, rows_completed: int) -> None:
+        self.rows_completed = rows_completed
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as checkpoint_file:
+            json.dump({
+                "source": self.source,
+                "fingerprint": self.fingerprint,
+                "rows_completed": rows_completed,
+                "updated_at": datetime.utcnow().isoformat()
+            }, checkpoint_file)
+        os.replace(temp_path, self.path)
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+# ========================================
+# PARALLEL UPSERTS
+# ========================================
+
+def upsert_with_retry(
+    backend: Any,
+    batch: List[Dict[str, Any]],
+    max_retries: int = IngestionSettings.MAX_RETRIES,
+    base_delay: float = IngestionSettings.BASE_BACKOFF_SECONDS,
+    logger: Optional[logging.Logger] = None
+) -> int:
+    for attempt in range(max_retries + 1):
+        try:
+            backend.upsert(vectors=batch)
+            return len(batch)
+        except Exception as error:
+            if attempt == max_retries:
+                raise
+            delay = min(IngestionSettings.MAX_BACKOFF_SECONDS, base_delay * (2 ** attempt)) * random.uniform(0.5, 1.0)
+            if logger:
+                logger.warning(f"Upsert of {len(batch)} vectors failed ({str(error)}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+    return 0
+
+def ingest_market_file(
+    path: str,
+    backend: Any,
+    key_metrics: List[str],
+    checkpoint_path: Optional[str] = None,
+    batch_size: int = IngestionSettings.BATCH_SIZE,
+    workers: int = IngestionSettings.WORKERS,
+    chunk_rows: int = IngestionSettings.CHUNK_ROWS,
+    max_retries: int = IngestionSettings.MAX_RETRIES
+) -> Dict[str, Any]:
+    logger = setup_logger("IndexIngestion")
+    checkpoint = IngestionCheckpoint(checkpoint_path or f"{path}.checkpoint.json", path, describe_target(backend))
+    rows_seen = 0
+    vectors_upserted = 0
+    start = time.perf_counter()
+
+    if checkpoint.rows_completed:
+        logger.info(f"Resuming {path} after {checkpoint.rows_completed} completed rows")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk in iter_market_file(path, chunk_rows):
+            chunk_start = rows_seen
+            rows_seen += len(chunk)
+            if rows_seen <= checkpoint.rows_completed:
+                continue
+            if chunk_start < checkpoint.rows_completed:
+                chunk = chunk.iloc[checkpoint.rows_completed - chunk_start:]
+
+            vectors = build_vectors(chunk, key_metrics)
+            batches = [vectors[offset:offset + batch_size] for offset in range(0, len(vectors), batch_size)]
+            # A chunk only counts as done once every batch in it has landed, so resuming never skips rows
+            vectors_upserted += sum(executor.map(
+                lambda batch: upsert_with_retry(backend, batch, max_retries, logger=logger), batches
+            ))
+            if hasattr(backend, "save"):
+                backend.save()
+            checkpoint.save(rows_seen)
+            logger.info(f"Ingested {rows_seen} rows ({vectors_upserted} vectors this run)")
+
+    checkpoint.clear()
+
+    return {
+        "rows": rows_seen,
+        "vectorsUpserted": vectors_upserted,
+        "seconds": round(time.perf_counter() - start, 2)
+    }
+
+# ========================================
+# COMMAND LINE
+# ========================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load a daily market file into the stock-analysis vector index")
+    parser.add_argument("path", help="CSV or Parquet file with SECURITY, TRADE_DATE and the key_metrics columns")
+    parser.add_argument("--backend", default=None, help="pinecone or local (defaults to VECTOR_BACKEND)")
+    parser.add_argument("--index-name", default="stock-analysis")
+    parser.add_argument("--local-path", default=None, help="Directory for the local backend")
+    parser.add_argument("--create-index", action="store_true", help="Create the Pinecone index if it does not exist")
+    parser.add_argument("--checkpoint", default=None)
+    parser.add_argument("--batch-size", type=int, default=IngestionSettings.BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=IngestionSettings.WORKERS)
+    parser.add_argument("--chunk-rows", type=int, default=IngestionSettings.CHUNK_ROWS)
+    parser.add_argument("--max-retries", type=int, default=IngestionSettings.MAX_RETRIES)
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    key_metrics = list(StockVectorDatabase.KEY_METRICS)
+    backend_name = (args.backend or os.getenv(VectorBackendSettings.BACKEND_ENV, VectorBackendSettings.BACKEND_PINECONE)).lower()
+
+    if args.create_index and backend_name == VectorBackendSettings.BACKEND_PINECONE:
+        ensure_pinecone_index(os.getenv("PINECONE_API_KEY"), args.index_name, dimension=len(key_metrics))
+
+    backend = create_vector_backend(backend_name, index_name=args.index_name, local_path=args.local_path)
+    summary = ingest_market_file(
+        args.path,
+        backend,
+        key_metrics,
+        checkpoint_path=args.checkpoint,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        chunk_rows=args.chunk_rows,
+        max_retries=args.max_retries
+    )
+    print(json.dumps(summary))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
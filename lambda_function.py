@@ -1,18 +1,64 @@
+from __future__ import annotations
+
 import json
 import sys
+import heapq
+import base64
 import os
 import time
+import functools
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional, Tuple, List
-from decimal import Decimal
-import numpy as np
-import pandas as pd
-from pinecone import Pinecone, ServerlessSpec
-from dotenv import load_dotenv
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, Any, Optional, Tuple, List, Union, Iterator
+from lazy_imports import lazy_module
+from screening import Criteria, Eq, build_metadata_filter, parse_order_by
+from sector_scoring import SectorRelativeScorer
+from ranking_table import RankingTable, default_ranking_path
+from stock_record import StockRecord, StockRecordBatch
+from report_rendering import (
+    LazyText,
+    INSUFFICIENT_DATA_RATIONALE,
+    INSUFFICIENT_DATA_REPORT,
+    attach_reports,
+    render_rationale,
+    render_user_friendly_report,
+    strip_reports
+)
+from vector_store import (
+    VectorIndexMirror,
+    VectorStoreBackend,
+    VectorBackendSettings,
+    create_vector_backend,
+    ensure_pinecone_index
+)
+from analysis_cache import (
+    LRUTTLCache,
+    TieredAnalysisCache,
+    create_shared_tier,
+    current_trade_date
+)
+from stage_metrics import stage_metrics
+from negative_cache import NegativeTickerCache, bloom_enabled
+from single_flight import SingleFlight
+from response_builder import (
+    create_error_response,
+    create_bedrock_success_response,
+    create_bedrock_error_response
+)
+
+# numpy/pandas only load when a batch, screening or ranking path first needs them
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+if TYPE_CHECKING:
+    from stock_history import DateLike, StockHistory
 
-# Load environment variables from .env file
-load_dotenv()
+# Lambda supplies configuration through the function environment; .env files are for local runs
+if not os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 # ========================================
 # CONFIGURATION CONSTANTS
@@ -73,50 +119,6 @@ def setup_logger(name: str) -> logging.Logger:
         logger.setLevel(logging.INFO)
         return logger
 
-def convert_floats_to_decimals(obj: Any) -> Any:
-    if isinstance(obj, float):
-        return Decimal(str(obj))
-    elif isinstance(obj, dict):
-        return {key: convert_floats_to_decimals(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_floats_to_decimals(item) for item in obj]
-    return obj
-
-def format_market_cap(market_cap: Optional[float]) -> str:
-    if market_cap is None:
-        return "N/A"
-    
-    if market_cap >= 1_000_000_000_000:  # Trillions
-        return f"${market_cap / 1_000_000_000_000:.2f}T"
-    elif market_cap >= 1_000_000_000:  # Billions
-        return f"${market_cap / 1_000_000_000:.2f}B"
-    elif market_cap >= 1_000_000:  # Millions
-        return f"${market_cap / 1_000_000:.2f}M"
-    else:
-        return f"${market_cap:,.0f}"
-
-def get_performance_indicator(score: int) -> str:
-    if score >= 90:
-        return "🟢 Excellent"
-    elif score >= 80:
-        return "🔵 Very Good"
-    elif score >= 70:
-        return "🟡 Good"
-    elif score >= 60:
-        return "🟠 Fair"
-    elif score >= 50:
-        return "🔴 Poor"
-    else:
-        return "⚫ Very Poor"
-
-def get_valuation_indicator(valuation: str) -> str:
-    if valuation == "Undervalued":
-        return "💚 Undervalued (Potential Buy)"
-    elif valuation == "Fairly valued":
-        return "💙 Fairly Valued (Hold/Monitor)"
-    else:
-        return "❤️ Overvalued (Consider Carefully)"
-
 def get_metric_explanation(metric: str) -> str:
     explanations = {
         "peRatio": "Price-to-Earnings: How much investors pay per dollar of earnings (lower is generally better)",
@@ -167,31 +169,194 @@ class FinancialMetricsScorer:
         else:
             return ScoreValues.VERY_POOR
 
+class VectorizedMetricsScorer:
+    METRIC_COLUMNS = ("peRatio", "roe", "evToEbitda", "eps")
+    UNABLE_TO_EVALUATE = "Unable to evaluate"
+
+    @staticmethod
+    def as_metric_array(values: Any) -> np.ndarray:
+        if isinstance(values, (np.ndarray, pd.Series)) and values.dtype.kind in "fiu":
+            return np.asarray(values, dtype=np.float64)
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+
+    @staticmethod
+    def valid_mask(values: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            return ~np.isnan(values) & (values > 0)
+
+    @staticmethod
+    def score_pe_ratio(pe_ratio: np.ndarray) -> np.ndarray:
+        return np.select(
+            [pe_ratio < ScoringThresholds.PE_EXCELLENT, pe_ratio < ScoringThresholds.PE_GOOD],
+            [ScoreValues.EXCELLENT, ScoreValues.GOOD],
+            default=ScoreValues.POOR
+        )
+
+    @staticmethod
+    def score_roe(roe: np.ndarray) -> np.ndarray:
+        return np.select(
+            [roe > ScoringThresholds.ROE_EXCELLENT, roe > ScoringThresholds.ROE_GOOD],
+            [ScoreValues.EXCELLENT, ScoreValues.GOOD],
+            default=ScoreValues.POOR
+        )
+
+    @staticmethod
+    def score_ev_ebitda(ev_ebitda: np.ndarray) -> np.ndarray:
+        return np.select(
+            [ev_ebitda < ScoringThresholds.EV_EBITDA_EXCELLENT, ev_ebitda < ScoringThresholds.EV_EBITDA_GOOD],
+            [ScoreValues.EXCELLENT, ScoreValues.FAIR],
+            default=ScoreValues.VERY_POOR
+        )
+
+    @staticmethod
+    def score_eps(eps: np.ndarray) -> np.ndarray:
+        return np.select(
+            [eps > ScoringThresholds.EPS_EXCELLENT, eps > ScoringThresholds.EPS_GOOD],
+            [ScoreValues.EXCELLENT, ScoreValues.FAIR],
+            default=ScoreValues.VERY_POOR
+        )
+
+    @classmethod
+    def score_columns(cls, pe_ratio: Any, roe: Any, ev_to_ebitda: Any, eps: Any) -> Dict[str, Any]:
+        # Breakdown columns hold 0 where a metric was not scored (no real score is 0)
+        metric_specs = [
+            ("peRatio", pe_ratio, cls.score_pe_ratio, ScoringWeights.PE_RATIO),
+            ("roe", roe, cls.score_roe, ScoringWeights.ROE),
+            ("evToEbitda", ev_to_ebitda, cls.score_ev_ebitda, ScoringWeights.EV_EBITDA),
+            ("eps", eps, cls.score_eps, ScoringWeights.EPS),
+        ]
+        
+        total_weighted_score = None
+        valid_metrics_count = None
+        score_breakdown = {}
+        
+        for metric_key, values, scorer, weight in metric_specs:
+            values = cls.as_metric_array(values)
+            valid = cls.valid_mask(values)
+            metric_score = np.where(valid, scorer(values), 0)
+            weighted = np.where(valid, metric_score * weight, 0.0)
+            
+            if total_weighted_score is None:
+                total_weighted_score = weighted
+                valid_metrics_count = valid.astype(np.int64)
+            else:
+                total_weighted_score = total_weighted_score + weighted
+                valid_metrics_count = valid_metrics_count + valid
+            score_breakdown[metric_key] = metric_score.astype(np.int64)
+        
+        valuation_labels = np.array([
+            cls.UNABLE_TO_EVALUATE,
+            ValuationCategories.UNDERVALUED,
+            ValuationCategories.FAIRLY_VALUED,
+            ValuationCategories.OVERVALUED,
+        ], dtype=object)
+        valuation_codes = np.select(
+            [
+                valid_metrics_count == 0,
+                total_weighted_score >= ValuationCategories.UNDERVALUED_THRESHOLD,
+                total_weighted_score >= ValuationCategories.FAIRLY_VALUED_THRESHOLD,
+            ],
+            [0, 1, 2],
+            default=3
+        )
+        valuation = valuation_labels[valuation_codes]
+        
+        return {
+            "weightedScore": total_weighted_score,
+            "score": np.round(total_weighted_score, 2),
+            "valuation": valuation,
+            "metricsAnalyzed": valid_metrics_count,
+            "scoreBreakdown": score_breakdown,
+        }
+
+    @classmethod
+    def score_dataframe(cls, frame: pd.DataFrame) -> pd.DataFrame:
+        scored = cls.score_columns(*(frame[column] if column in frame else np.nan for column in cls.METRIC_COLUMNS))
+        result = pd.DataFrame({
+            "score": scored["score"],
+            "valuation": scored["valuation"],
+            "metricsAnalyzed": scored["metricsAnalyzed"],
+        }, index=frame.index)
+        for metric_key, metric_score in scored["scoreBreakdown"].items():
+            result[f"{metric_key}Score"] = pd.Series(metric_score, index=frame.index, dtype="Int64").mask(metric_score == 0)
+        return result
+
+    @staticmethod
+    def breakdown_at(scored: Dict[str, Any], row: int) -> Dict[str, int]:
+        return {
+            metric_key: int(metric_score[row])
+            for metric_key, metric_score in scored["scoreBreakdown"].items()
+            if metric_score[row] > 0
+        }
+
 # ========================================
 # MAIN SERVICE CLASS
 # ========================================
 
+def _timed_render(renderer: Callable[..., str], *args: Any) -> str:
+    # Lazy reports render whenever they are first read, usually inside the handler's serialize span
+    with stage_metrics.span("report_render"):
+        return renderer(*args)
+
 class FinancialDataService:
-    def __init__(self, use_caching: bool = True, pinecone_api_key: str = None):
+    def __init__(
+        self,
+        use_caching: bool = True,
+        pinecone_api_key: str = None,
+        analysis_cache: TieredAnalysisCache = None,
+        ranking_path: Optional[str] = None,
+        lazy_reports: bool = True
+    ):
         self.logger = setup_logger("FinancialDataService")
         self.use_caching = use_caching
+        # Lazy reports only pay off for callers that may never read them
+        self.lazy_reports = lazy_reports
         self.dynamo_table_name = "FundamentalAnalysisData"
+        self.analysis_cache = None
+        if use_caching:
+            self.analysis_cache = analysis_cache or TieredAnalysisCache(
+                shared_tier=create_shared_tier(table_name=self.dynamo_table_name)
+            )
         self.metrics_scorer = FinancialMetricsScorer()
-        
-        api_key = pinecone_api_key or os.getenv("PINECONE_API_KEY")
-        if not api_key:
-            raise ValueError("Pinecone API key is required. Set PINECONE_API_KEY environment variable or pass it as parameter.")
+        self.vectorized_scorer = VectorizedMetricsScorer()
+        self.sector_scorer = SectorRelativeScorer()
+        self.ranking_path = ranking_path or default_ranking_path()
+        self._ranking_table = None
+        self._ranking_table_version = None
+        self.single_flight = SingleFlight()
         
         try:
-            self.stock_db = StockVectorDatabase(api_key)
-            if not self.stock_db.index:
-                self.stock_db.create_index()
-            self.logger.info("Successfully initialized Pinecone connection")
+            # Backends connect lazily, so a missing Pinecone index surfaces on the first query; create it with ingest_index --create-index
+            self.stock_db = StockVectorDatabase(pinecone_api_key)
+            self.logger.info(f"Initialized {self.stock_db.index.name} vector store for index '{self.stock_db.index_name}'")
         except Exception as e:
-            self.logger.error(f"Failed to initialize Pinecone connection: {str(e)}")
+            self.logger.error(f"Failed to initialize vector store connection: {str(e)}")
             raise
 
-    def analyze_stock(self, ticker: str) -> Dict[str, Any]:
+        # Listing every vector ID is only cheap enough for the Bloom filter with a local mirror or when opted in
+        use_bloom = bloom_enabled() or self.stock_db.mirror is not None
+        # The filter is built from the mirror and rebuilt every few hours, so its rejections are confirmed live
+        self.negative_cache = NegativeTickerCache(
+            securities_source=self.stock_db.known_securities if use_bloom else None,
+            confirm_missing=self.stock_db.missing_securities if use_bloom else None
+        )
+
+    def analyze_stock(self, ticker: str, include_report: bool = True) -> Dict[str, Any]:
+        normalized = str(ticker).upper().strip()
+        with stage_metrics.trace("analyze_stock", ticker=normalized):
+            # Concurrent requests for the same ticker and trade date share one lookup and analysis
+            key = (normalized, current_trade_date(), include_report)
+            result = self.single_flight.do(key, lambda: self._analyze_stock(ticker, include_report))
+            return self._copy_result(result)
+
+    @staticmethod
+    def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        # Coalesced callers each get their own top-level dicts, so one caller's edits never reach another
+        if isinstance(result.get('data'), dict):
+            return {**result, 'data': dict(result['data'])}
+        return dict(result)
+
+    def _analyze_stock(self, ticker: str, include_report: bool) -> Dict[str, Any]:
         try:
             ticker = ticker.upper().strip()
             self.logger.info(f"Starting financial analysis for ticker: {ticker}")
@@ -199,14 +364,32 @@ class FinancialDataService:
             if not ticker:
                 return self._create_error_response("Ticker symbol is required")
 
-            financial_data = self._fetch_financial_data(ticker)
+            with stage_metrics.span("cache_lookup"):
+                cached_data = self._load_from_cache(ticker, include_report)
+            if cached_data is not None:
+                self.logger.info(f"Serving cached financial analysis for {ticker}")
+                return {
+                    'success': True,
+                    'ticker': ticker,
+                    'timestamp': datetime.now().isoformat(),
+                    'data': cached_data
+                }
+
+            try:
+                financial_data = self._fetch_financial_data(ticker)
+            except Exception as error:
+                self.logger.error(f"Error fetching data for {ticker} from Pinecone: {str(error)}")
+                return self._create_error_response(
+                    f"Unable to reach the stock index for '{ticker}'. Please try again.", retryable=True
+                )
             if financial_data is None:
                 return self._create_error_response(
                     f"Unable to retrieve financial data for '{ticker}'. "
                     f"Please verify the ticker symbol is correct."
                 )
 
-            analysis_results = self._perform_financial_analysis(financial_data)
+            with stage_metrics.span("scoring"):
+                analysis_results = self._perform_financial_analysis(financial_data, include_report)
 
             complete_results = {
                 'success': True,
@@ -219,7 +402,8 @@ class FinancialDataService:
             }
             
             if self.use_caching and complete_results['success']:
-                self._save_to_cache(ticker, complete_results['data'])
+                with stage_metrics.span("cache_write"):
+                    self._save_to_cache(ticker, complete_results['data'])
 
             self.logger.info(f"Financial analysis completed successfully for {ticker}")
             return complete_results
@@ -230,52 +414,206 @@ class FinancialDataService:
                 f"Internal error during analysis: {str(error)}"
             )
 
-    def _fetch_financial_data(self, ticker: str) -> Optional[Dict[str, Any]]:
-        self.logger.info(f"Fetching financial data from Pinecone: {ticker}")
+    def analyze_stocks(self, tickers: List[str], include_report: bool = True) -> Dict[str, Any]:
+        requested = []
+        for ticker in tickers or []:
+            normalized = str(ticker).upper().strip()
+            if normalized and normalized not in requested:
+                requested.append(normalized)
+        
+        if not requested:
+            return self._create_error_response("At least one ticker symbol is required")
+        
+        self.logger.info(f"Starting batch financial analysis for {len(requested)} tickers: {', '.join(requested)}")
+        
+        with stage_metrics.trace("analyze_stocks", tickers=len(requested)):
+            return self._analyze_stocks(requested, include_report)
+
+    def _analyze_stocks(self, requested: List[str], include_report: bool) -> Dict[str, Any]:
+        results = {}
+        failed = {}
+        timestamp = datetime.now().isoformat()
+        
+        uncached = []
+        with stage_metrics.span("cache_lookup"):
+            for ticker in requested:
+                cached_data = self._load_from_cache(ticker, include_report)
+                if cached_data is not None:
+                    results[ticker] = {
+                        'success': True,
+                        'ticker': ticker,
+                        'timestamp': timestamp,
+                        'data': cached_data
+                    }
+                elif self.negative_cache.is_known_missing(ticker):
+                    failed[ticker] = (
+                        f"Unable to retrieve financial data for '{ticker}'. "
+                        f"Please verify the ticker symbol is correct."
+                    )
+                else:
+                    uncached.append(ticker)
         
         try:
-            search_results = self.stock_db.search_by_criteria(
-                criteria={"security": ticker.upper()}, 
-                top_k=1
+            with stage_metrics.span("pinecone_fetch"):
+                stock_rows = self.stock_db.fetch_latest_by_securities(uncached) if uncached else {}
+        except Exception as error:
+            self.logger.error(f"Batch fetch failed for {uncached}: {str(error)}")
+            return self._create_error_response(
+                f"Internal error during batch analysis: {str(error)}", retryable=True
             )
+        
+        self._remember_confirmed_missing([ticker for ticker in uncached if ticker not in stock_rows])
+        for ticker in uncached:
+            if ticker not in stock_rows:
+                failed[ticker] = (
+                    f"Unable to retrieve financial data for '{ticker}'. "
+                    f"Please verify the ticker symbol is correct."
+                )
+        found_tickers = [ticker for ticker in uncached if ticker in stock_rows]
+        
+        analyzed = []
+        with stage_metrics.span("scoring"):
+            batch = StockRecordBatch.from_records(stock_rows[ticker] for ticker in found_tickers)
+            try:
+                metric_columns = batch.financial_columns()
+                scored = self.vectorized_scorer.score_columns(
+                    *(metric_columns[metric_key] for metric_key in VectorizedMetricsScorer.METRIC_COLUMNS)
+                ) if found_tickers else None
+            except Exception as error:
+                # Score row by row instead, so a bad row fails only its own ticker
+                self.logger.warning(f"Vectorized scoring failed, scoring {len(found_tickers)} rows individually: {str(error)}")
+                scored = None
             
-            if not search_results:
-                similar_stocks = self.stock_db.find_similar_stocks(ticker.upper(), top_k=1)
-                if similar_stocks and similar_stocks[0]['security'].upper() == ticker.upper():
-                    search_results = similar_stocks
-                else:
-                    self.logger.warning(f"No data found for ticker: {ticker}")
-                    return None
-            
-            stock_data = search_results[0]
-            
-            financial_metrics = {
-                "companyName": stock_data.get("security", ticker),
-                "peRatio": stock_data.get("pe_ratio") if stock_data.get("pe_ratio", 0) > 0 else None,
-                "roe": self._calculate_roe_from_data(stock_data),
-                "evToEbitda": self._estimate_ev_ebitda(stock_data),
-                "eps": self._calculate_eps_from_data(stock_data),
-                "debtToEquity": None,
-                "marketCap": stock_data.get("market_cap"),
-                "sector": stock_data.get("sector", "Unknown"),
-                "industry": stock_data.get("industry", "Unknown"),
-                "dataRetrievedAt": datetime.now().isoformat(),
-                "closePrice": stock_data.get("close_price"),
-                "totalScore": stock_data.get("total_score"),
-                "fundamentalScore": stock_data.get("fundamental_score"),
-                "technicalScore": stock_data.get("technical_score"),
-                "quantScore": stock_data.get("quant_score"),
-                "rank": stock_data.get("rank"),
-                "tradeDate": stock_data.get("trade_date")
+            # Scores come straight from the batch columns; dicts are only built here, to shape each ticker's response
+            retrieved_at = datetime.now().isoformat()
+            for row, ticker in enumerate(found_tickers):
+                try:
+                    if scored is None:
+                        financial_data = self._build_financial_metrics(stock_rows[ticker], ticker)
+                        analysis_results = self._perform_financial_analysis(financial_data, include_report)
+                    else:
+                        financial_data = self._financial_metrics_at(batch, metric_columns, row, ticker, retrieved_at)
+                        analysis_results = self._analysis_at(scored, row, financial_data, include_report)
+                except Exception as error:
+                    self.logger.error(f"Analysis failed for {ticker}: {str(error)}")
+                    failed[ticker] = f"Internal error during analysis: {str(error)}"
+                    continue
+                analyzed.append((ticker, financial_data, analysis_results))
+        
+        for ticker, financial_data, analysis_results in analyzed:
+            results[ticker] = {
+                'success': True,
+                'ticker': ticker,
+                'timestamp': timestamp,
+                'data': {
+                    **financial_data,
+                    **analysis_results
+                }
             }
             
-            self.logger.info(f"Successfully retrieved financial data for {ticker} from Pinecone")
-            return financial_metrics
-            
-        except Exception as error:
-            self.logger.error(f"Error fetching data for {ticker} from Pinecone: {str(error)}")
+            if self.use_caching:
+                with stage_metrics.span("cache_write"):
+                    self._save_to_cache(ticker, results[ticker]['data'])
+        
+        self.logger.info(
+            f"Batch financial analysis completed: {len(results)} succeeded, {len(failed)} failed"
+        )
+        return {
+            'success': bool(results),
+            'tickers': requested,
+            'timestamp': timestamp,
+            'results': results,
+            'failed': failed
+        }
+
+    def _fetch_financial_data(self, ticker: str) -> Optional[Dict[str, Any]]:
+        if self.negative_cache.is_known_missing(ticker):
+            self.logger.info(f"Skipping lookup for known-missing ticker: {ticker}")
             return None
 
+        self.logger.info(f"Fetching financial data from Pinecone: {ticker}")
+        
+        # Index errors propagate so the caller can report them as retryable rather than as an unknown ticker
+        with stage_metrics.span("pinecone_fetch"):
+            stock_data = self.stock_db.fetch_latest_by_securities([ticker.upper()]).get(ticker.upper())
+        
+        if stock_data is None:
+            self.logger.warning(f"No data found for ticker: {ticker}")
+            self._remember_confirmed_missing([ticker])
+            return None
+        
+        financial_metrics = self._build_financial_metrics(stock_data, ticker)
+        
+        self.logger.info(f"Successfully retrieved financial data for {ticker} from Pinecone")
+        return financial_metrics
+
+    def _remember_confirmed_missing(self, tickers: List[str]) -> None:
+        # An empty fetch is not proof the ticker is unknown; only a listing of the live index with no IDs is
+        if not tickers:
+            return
+        try:
+            missing = self.stock_db.missing_securities(tickers)
+        except Exception as error:
+            self.logger.warning(f"Could not confirm missing tickers {tickers}, not caching the miss: {str(error)}")
+            return
+        for ticker in missing:
+            self.negative_cache.remember_missing(ticker)
+
+    def _build_financial_metrics(self, stock_data: Dict[str, Any], ticker: str) -> Dict[str, Any]:
+        return {
+            "companyName": stock_data.get("security", ticker),
+            "peRatio": stock_data.get("pe_ratio") if stock_data.get("pe_ratio", 0) > 0 else None,
+            "roe": self._calculate_roe_from_data(stock_data),
+            "evToEbitda": self._estimate_ev_ebitda(stock_data),
+            "eps": self._calculate_eps_from_data(stock_data),
+            "debtToEquity": None,
+            "marketCap": stock_data.get("market_cap"),
+            "sector": stock_data.get("sector", "Unknown"),
+            "industry": stock_data.get("industry", "Unknown"),
+            "dataRetrievedAt": datetime.now().isoformat(),
+            "closePrice": stock_data.get("close_price"),
+            "totalScore": stock_data.get("total_score"),
+            "fundamentalScore": stock_data.get("fundamental_score"),
+            "technicalScore": stock_data.get("technical_score"),
+            "quantScore": stock_data.get("quant_score"),
+            "rank": stock_data.get("rank"),
+            "tradeDate": stock_data.get("trade_date")
+        }
+
+    def _financial_metrics_at(
+        self,
+        batch: StockRecordBatch,
+        metric_columns: Dict[str, Any],
+        row: int,
+        ticker: str,
+        retrieved_at: str
+    ) -> Dict[str, Any]:
+        # Column form of _build_financial_metrics: the same fields, read from the batch the scores were computed on
+        def number(column: Any) -> Optional[float]:
+            value = column[row]
+            return None if np.isnan(value) else float(value)
+        
+        columns = batch.columns
+        return {
+            "companyName": columns["security"][row] or ticker,
+            "peRatio": number(metric_columns["peRatio"]),
+            "roe": number(metric_columns["roe"]),
+            "evToEbitda": number(metric_columns["evToEbitda"]),
+            "eps": number(metric_columns["eps"]),
+            "debtToEquity": None,
+            "marketCap": number(columns["market_cap"]),
+            "sector": columns["sector"][row] or "Unknown",
+            "industry": columns["industry"][row] or "Unknown",
+            "dataRetrievedAt": retrieved_at,
+            "closePrice": number(columns["close_price"]),
+            "totalScore": number(columns["total_score"]),
+            "fundamentalScore": number(columns["fundamental_score"]),
+            "technicalScore": number(columns["technical_score"]),
+            "quantScore": number(columns["quant_score"]),
+            "rank": number(columns["rank"]),
+            "tradeDate": columns["trade_date"][row]
+        }
+
     def _convert_roe_to_percentage(self, roe_decimal: Optional[float]) -> Optional[float]:
         if roe_decimal is not None:
             return roe_decimal * 100
@@ -319,35 +657,70 @@ class FinancialDataService:
         except Exception:
             return None
 
-    def _perform_financial_analysis(self, financial_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _perform_financial_analysis(self, financial_data: Dict[str, Any], include_report: bool = True) -> Dict[str, Any]:
         overall_score, score_breakdown, valid_metrics_count = self._calculate_overall_score(financial_data)
         
         if valid_metrics_count == 0:
-            return {
+            analysis_results = {
                 "score": 0,
                 "valuation": "Unable to evaluate",
-                "rationale": "Insufficient financial data available for meaningful analysis.",
                 "scoreBreakdown": {},
-                "metricsAnalyzed": 0,
-                "userFriendlyReport": "❌ Unable to generate analysis report due to insufficient data."
+                "metricsAnalyzed": 0
             }
+            if include_report:
+                analysis_results["rationale"] = INSUFFICIENT_DATA_RATIONALE
+                analysis_results["userFriendlyReport"] = INSUFFICIENT_DATA_REPORT
+            return analysis_results
 
         valuation_category = self._determine_valuation_category(overall_score)
-        analysis_rationale = self._generate_analysis_rationale(
-            financial_data, overall_score, valuation_category, valid_metrics_count
-        )
-        
         analysis_results = {
             "score": round(overall_score, 2),
             "valuation": valuation_category,
-            "rationale": analysis_rationale,
             "scoreBreakdown": score_breakdown,
             "metricsAnalyzed": valid_metrics_count
         }
+        if include_report:
+            self._attach_reports(financial_data, analysis_results, overall_score)
         
-        user_friendly_report = self._create_user_friendly_report(financial_data, analysis_results)
-        analysis_results["userFriendlyReport"] = user_friendly_report
+        return analysis_results
+
+    def _attach_reports(self, financial_data: Dict[str, Any], analysis_results: Dict[str, Any], overall_score: float) -> None:
+        rationale_args = (financial_data, overall_score, analysis_results["valuation"], analysis_results["metricsAnalyzed"])
+        if not self.lazy_reports:
+            with stage_metrics.span("report_render"):
+                analysis_results["rationale"] = render_rationale(*rationale_args)
+                analysis_results["userFriendlyReport"] = render_user_friendly_report(financial_data, analysis_results)
+            return
+        # Rendered on first access or when the response is serialized; score/valuation-only callers never pay for it
+        analysis_results["rationale"] = LazyText(_timed_render, render_rationale, *rationale_args)
+        analysis_results["userFriendlyReport"] = LazyText(_timed_render, render_user_friendly_report, financial_data, analysis_results)
+
+    def _perform_batch_financial_analysis(
+        self,
+        financial_data_list: List[Dict[str, Any]],
+        include_report: bool = True
+    ) -> List[Dict[str, Any]]:
+        scored = self.vectorized_scorer.score_columns(
+            *([data.get(metric_key) for data in financial_data_list] for metric_key in VectorizedMetricsScorer.METRIC_COLUMNS)
+        )
+        return [
+            self._analysis_at(scored, row, financial_data, include_report)
+            for row, financial_data in enumerate(financial_data_list)
+        ]
+
+    def _analysis_at(self, scored: Dict[str, Any], row: int, financial_data: Dict[str, Any], include_report: bool) -> Dict[str, Any]:
+        valid_metrics_count = int(scored["metricsAnalyzed"][row])
+        if valid_metrics_count == 0:
+            return self._perform_financial_analysis(financial_data, include_report)
         
+        analysis_results = {
+            "score": float(scored["score"][row]),
+            "valuation": scored["valuation"][row],
+            "scoreBreakdown": self.vectorized_scorer.breakdown_at(scored, row),
+            "metricsAnalyzed": valid_metrics_count
+        }
+        if include_report:
+            self._attach_reports(financial_data, analysis_results, float(scored["weightedScore"][row]))
         return analysis_results
 
     def _calculate_overall_score(self, data: Dict[str, Any]) -> Tuple[float, Dict[str, int], int]:
@@ -399,105 +772,208 @@ class FinancialDataService:
         valuation: str, 
         metrics_count: int
     ) -> str:
-        company_name = data.get('companyName', 'Unknown Company')
-        
-        pe_display = f"{data.get('peRatio', 0):.2f}" if data.get('peRatio') else 'N/A'
-        roe_display = f"{data.get('roe', 0):.2f}%" if data.get('roe') else 'N/A'
-        ev_display = f"{data.get('evToEbitda', 0):.2f}" if data.get('evToEbitda') else 'N/A'
-        eps_display = f"{data.get('eps', 0):.2f}" if data.get('eps') else 'N/A'
-        
-        rationale = (
-            f"Financial Analysis for {company_name}: "
-            f"Overall score of {score:.1f}/100 based on {metrics_count} key metrics. "
-            f"Key metrics - P/E Ratio: {pe_display}, ROE: {roe_display}, "
-            f"EV/EBITDA: {ev_display}, EPS: ${eps_display}. "
-            f"Based on this analysis, the stock appears to be {valuation.lower()}."
-        )
-        
-        return rationale
+        return render_rationale(data, score, valuation, metrics_count)
 
     def _create_user_friendly_report(self, financial_data: Dict[str, Any], analysis_results: Dict[str, Any]) -> str:
-        company_name = financial_data.get('companyName', 'Unknown Company')
-        overall_score = analysis_results.get('score', 0)
-        valuation = analysis_results.get('valuation', 'Unknown')
-        score_breakdown = analysis_results.get('scoreBreakdown', {})
-        
-        report_lines = [
-            f"📊 {company_name} ({financial_data.get('sector', 'Unknown')})",
-            f"💰 Market Cap: {format_market_cap(financial_data.get('marketCap'))}",
-            ""
-        ]
-        
-        report_lines.extend([
-            f"🎯 Overall Score: {overall_score:.1f}/100 {get_performance_indicator(int(overall_score))}",
-            f"💡 {get_valuation_indicator(valuation)}",
-            ""
-        ])
-        
-        report_lines.append("📊 Key Metrics:")
-        
-        metrics_info = [
-            ("peRatio", "P/E Ratio", financial_data.get('peRatio'), "x"),
-            ("roe", "ROE", financial_data.get('roe'), "%"),
-            ("evToEbitda", "EV/EBITDA", financial_data.get('evToEbitda'), "x"),
-            ("eps", "EPS", financial_data.get('eps'), "$")
-        ]
-        
-        for metric_key, metric_name, value, unit in metrics_info:
-            if value is not None and metric_key in score_breakdown:
-                score = score_breakdown[metric_key]
-                if unit == "$":
-                    value_str = f"${value:.2f}"
-                elif unit == "%":
-                    value_str = f"{value:.1f}%"
-                else:
-                    value_str = f"{value:.1f}{unit}"
-                
-                report_lines.append(f"  {metric_name}: {value_str} {get_performance_indicator(score)}")
-        
-        report_lines.append("")
-        if valuation == "Undervalued":
-            report_lines.append("💚 Recommendation: Consider for investment")
-        elif valuation == "Fairly valued":
-            report_lines.append("💙 Recommendation: Hold or monitor")
-        else:
-            report_lines.append("❤️ Recommendation: Proceed with caution")
-        
-        report_lines.extend([
-            "",
-            "⚠️ For informational purposes only. Not investment advice."
-        ])
-        
-        return "\n".join(report_lines)
+        return render_user_friendly_report(financial_data, analysis_results)
+
+    def _load_from_cache(self, ticker: str, include_report: bool = True) -> Optional[Dict[str, Any]]:
+        if not self.use_caching or self.analysis_cache is None:
+            return None
+        cached_data = self.analysis_cache.get(ticker)
+        if cached_data is None:
+            return None
+        if not include_report:
+            return strip_reports(cached_data)
+        if self.lazy_reports:
+            return attach_reports(cached_data)
+        with stage_metrics.span("report_render"):
+            return attach_reports(cached_data, lazy=False)
 
     def _save_to_cache(self, ticker: str, analysis_data: Dict[str, Any]) -> None:
+        if self.analysis_cache is None:
+            return
         try:
-            import boto3
-            
-            dynamo_resource = boto3.resource("dynamodb")
-            table = dynamo_resource.Table(self.dynamo_table_name)
-            
-            cache_item = {
-                "ticker": ticker.upper(),
-                "lastUpdated": datetime.utcnow().isoformat(),
-                **convert_floats_to_decimals(analysis_data)
-            }
-            
-            table.put_item(Item=cache_item)
+            # Reports are re-attached on load, so only the analysis fields are stored
+            self.analysis_cache.set(ticker, strip_reports(analysis_data))
             self.logger.info(f"Successfully cached analysis results for {ticker}")
-            
-        except ImportError:
-            self.logger.warning("boto3 not available - skipping DynamoDB caching")
         except Exception as error:
             self.logger.error(f"Failed to cache data for {ticker}: {str(error)}")
 
-    def _create_error_response(self, error_message: str) -> Dict[str, Any]:
+    def score_sector_relative(self, ticker: str, trade_date: Optional[str] = None) -> Dict[str, Any]:
+        try:
+            ticker = ticker.upper().strip()
+            if not ticker:
+                return self._create_error_response("Ticker symbol is required")
+
+            if trade_date is None:
+                latest = self.stock_db.fetch_latest_by_securities([ticker]).get(ticker)
+                if latest is None:
+                    return self._create_error_response(
+                        f"Unable to retrieve financial data for '{ticker}'. "
+                        f"Please verify the ticker symbol is correct."
+                    )
+                trade_date = latest.trade_date
+
+            table = self.sector_scorer.get_table(trade_date)
+            if table is None:
+                rows = self.stock_db.cross_section(trade_date)
+                if not len(rows):
+                    return self._create_error_response(f"No market data available for trade date {trade_date}")
+                table = self.sector_scorer.build_table(rows.to_frame(), trade_date)
+                self.logger.info(f"Built sector score table for {trade_date} from {len(rows)} securities")
+
+            sector_score = table.lookup(ticker)
+            if sector_score is None:
+                return self._create_error_response(f"No data found for '{ticker}' on {trade_date}")
+            return {
+                'success': True,
+                'ticker': ticker,
+                'timestamp': datetime.now().isoformat(),
+                'data': sector_score
+            }
+
+        except Exception as error:
+            self.logger.error(f"Sector-relative scoring failed for {ticker}: {str(error)}")
+            return self._create_error_response(
+                f"Internal error during sector-relative scoring: {str(error)}"
+            )
+
+    def top_n(self, sector: Optional[str] = None, n: int = 10) -> Dict[str, Any]:
+        rankings = self._load_ranking_table()
+        if rankings is None:
+            return self._create_error_response("Daily rankings are not available yet")
         return {
-            'success': False,
-            'error': error_message,
-            'timestamp': datetime.now().isoformat()
+            'success': True,
+            'tradeDate': rankings.trade_date,
+            'sector': sector,
+            'results': rankings.top_n(sector, n)
         }
 
+    def rank_of(self, ticker: str) -> Dict[str, Any]:
+        rankings = self._load_ranking_table()
+        if rankings is None:
+            return self._create_error_response("Daily rankings are not available yet")
+        ranking = rankings.rank_of(ticker.strip())
+        if ranking is None:
+            return self._create_error_response(f"'{ticker.upper().strip()}' is not in the {rankings.trade_date} rankings")
+        return {
+            'success': True,
+            'ticker': ranking['security'],
+            'tradeDate': rankings.trade_date,
+            'data': ranking
+        }
+
+    def _load_ranking_table(self) -> Optional[RankingTable]:
+        if not self.ranking_path:
+            return None
+        # The nightly job replaces the file atomically, so a changed mtime means a new table to map
+        try:
+            stat = os.stat(self.ranking_path)
+        except OSError:
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+        if self._ranking_table is None or version != self._ranking_table_version:
+            try:
+                self._ranking_table = RankingTable.open(self.ranking_path)
+                self._ranking_table_version = version
+                self.logger.info(f"Loaded {len(self._ranking_table)} rankings from {self.ranking_path}")
+            except Exception as error:
+                self.logger.error(f"Failed to open ranking table {self.ranking_path}: {str(error)}")
+                return self._ranking_table
+        return self._ranking_table
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        if self.analysis_cache is None:
+            return {}
+        return self.analysis_cache.get_stats()
+
+    def get_negative_cache_stats(self) -> Dict[str, Any]:
+        return self.negative_cache.get_stats()
+
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        return self.single_flight.get_stats()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return stage_metrics.get_metrics()
+
+    def _create_error_response(self, error_message: str, retryable: bool = False) -> Dict[str, Any]:
+        return create_error_response(error_message, retryable)
+
+# ========================================
+# SERVICE REGISTRY (WARM CONTAINER REUSE)
+# ========================================
+
+class ServiceRegistry:
+    HEALTH_CHECK_INTERVAL_SECONDS = 300
+
+    def __init__(self, factory=None, health_check_interval: Optional[float] = None):
+        self.logger = setup_logger("ServiceRegistry")
+        self._factory = factory or FinancialDataService
+        self._health_check_interval = (
+            self.HEALTH_CHECK_INTERVAL_SECONDS if health_check_interval is None else health_check_interval
+        )
+        self._service = None
+        self._last_health_check = 0.0
+        self._lock = threading.Lock()
+
+    def get_financial_service(self) -> "FinancialDataService":
+        with self._lock:
+            if self._service is None:
+                return self._connect()
+            
+            if time.monotonic() - self._last_health_check >= self._health_check_interval:
+                if not self._is_healthy(self._service):
+                    self.logger.warning("Cached FinancialDataService failed health check - reconnecting")
+                    return self._connect()
+                self._last_health_check = time.monotonic()
+            
+            return self._service
+
+    def call(self, operation):
+        service = self.get_financial_service()
+        try:
+            result = operation(service)
+        except Exception as error:
+            self.logger.warning(f"Service call failed, reconnecting and retrying once: {str(error)}")
+            return operation(self.reconnect())
+        
+        # Unknown tickers and missing data are ordinary answers; only index failures are worth a health check
+        if isinstance(result, dict) and result.get('retryable') and not self._is_healthy(service):
+            self.logger.warning("Service call failed on an unhealthy connection - reconnecting and retrying once")
+            result = operation(self.reconnect())
+        
+        return result
+
+    def reconnect(self) -> "FinancialDataService":
+        with self._lock:
+            return self._connect()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._service = None
+            self._last_health_check = 0.0
+
+    def _connect(self) -> "FinancialDataService":
+        self._service = None
+        with stage_metrics.span("service_init"):
+            self._service = self._factory()
+        self._last_health_check = time.monotonic()
+        self.logger.info("Initialized FinancialDataService for this container")
+        return self._service
+
+    def _is_healthy(self, service: "FinancialDataService") -> bool:
+        try:
+            return service.stock_db.is_healthy()
+        except Exception:
+            return False
+
+# Every Bedrock response serializes its reports, so deferring them would only add overhead
+_service_registry = ServiceRegistry(factory=functools.partial(FinancialDataService, lazy_reports=False))
+
+def get_financial_service() -> "FinancialDataService":
+    return _service_registry.get_financial_service()
+
 # ========================================
 # AWS LAMBDA HANDLER
 # ========================================
@@ -510,42 +986,63 @@ def lambda_handler(event, context):
     function_name = event.get('function', 'getFinancialAnalysis')
     message_version = event.get('messageVersion', '1.0')
 
-    try:
-        ticker_symbol = extract_ticker_from_event(event, logger)
-        
-        if not ticker_symbol:
+    # Queued cache writes are not awaited before returning: the writer thread resumes when the container thaws for
+    # the next invocation and the SIGTERM/atexit hooks drain it at shutdown. A container reclaimed while frozen
+    # loses those writes, which only costs a later cache miss
+    # Stage spans from analyze_stock/analyze_stocks join this trace, so each invocation logs one timing record
+    with stage_metrics.trace("lambda_handler", function=function_name):
+        try:
+            ticker_symbol = extract_ticker_from_event(event, logger)
+            
+            if not ticker_symbol:
+                error_response = create_bedrock_error_response(
+                    "Missing required parameter: ticker symbol",
+                    action_group, function_name, message_version
+                )
+                return error_response
+            
+            if isinstance(ticker_symbol, list):
+                analysis_results = _service_registry.call(
+                    lambda financial_service: financial_service.analyze_stocks(ticker_symbol)
+                )
+            else:
+                analysis_results = _service_registry.call(
+                    lambda financial_service: financial_service.analyze_stock(ticker_symbol)
+                )
+            
+            with stage_metrics.span("serialize"):
+                bedrock_response = create_bedrock_success_response(
+                    analysis_results, action_group, function_name, message_version
+                )
+            
+            logger.info(f"Analysis completed successfully for {ticker_symbol}")
+            return bedrock_response
+            
+        except Exception as error:
+            logger.error(f"Lambda handler failed: {str(error)}")
             error_response = create_bedrock_error_response(
-                "Missing required parameter: ticker symbol",
+                f"Internal server error: {str(error)}",
                 action_group, function_name, message_version
             )
             return error_response
-        
-        financial_service = FinancialDataService()
-        analysis_results = financial_service.analyze_stock(ticker_symbol)
-        
-        bedrock_response = create_bedrock_success_response(
-            analysis_results, action_group, function_name, message_version
-        )
-        
-        logger.info(f"Analysis completed successfully for {ticker_symbol}")
-        return bedrock_response
-        
-    except Exception as error:
-        logger.error(f"Lambda handler failed: {str(error)}")
-        error_response = create_bedrock_error_response(
-            f"Internal server error: {str(error)}",
-            action_group, function_name, message_version
-        )
-        return error_response
 
-def extract_ticker_from_event(event: Dict[str, Any], logger: logging.Logger) -> str:
+def extract_ticker_from_event(event: Dict[str, Any], logger: logging.Logger) -> Union[str, List[str]]:
     ticker = ''
+    tickers = []
     
     if 'parameters' in event and isinstance(event.get('parameters'), list):
         for param in event['parameters']:
-            if param.get('name') == 'ticker' and param.get('value'):
+            if param.get('name') == 'tickers' and param.get('value'):
+                tickers = parse_tickers_value(param['value'])
+            elif param.get('name') == 'ticker' and param.get('value') and not ticker:
                 ticker = str(param['value']).upper().strip()
-                break
+    
+    if not tickers and event.get('tickers'):
+        tickers = parse_tickers_value(event['tickers'])
+    
+    if tickers:
+        logger.info(f"Extracted ticker symbols: {tickers}")
+        return tickers
     
     if not ticker and event.get('ticker'):
         ticker = str(event['ticker']).upper().strip()
@@ -553,55 +1050,24 @@ def extract_ticker_from_event(event: Dict[str, Any], logger: logging.Logger) ->
     logger.info(f"Extracted ticker symbol: '{ticker}'")
     return ticker
 
-def create_bedrock_success_response(
-    analysis_results: Dict[str, Any],
-    action_group: str,
-    function_name: str,
-    message_version: str
-) -> Dict[str, Any]:
-    if analysis_results.get('success') and analysis_results.get('data', {}).get('userFriendlyReport'):
-        formatted_response = {
-            "analysisReport": analysis_results['data']['userFriendlyReport'],
-            "technicalData": analysis_results
-        }
-    else:
-        formatted_response = analysis_results
-    
-    response_body = {"TEXT": {"body": json.dumps(formatted_response, default=str)}}
+def parse_tickers_value(value: Any) -> List[str]:
+    # Bedrock passes array parameters as strings, e.g. '["PTT", "AOT"]' or 'PTT,AOT'
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith('['):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                value = value.strip('[]')
+        if isinstance(value, str):
+            value = value.replace(';', ',').split(',')
     
-    return {
-        'messageVersion': message_version,
-        'response': {
-            'actionGroup': action_group,
-            'function': function_name,
-            'functionResponse': {'responseBody': response_body}
-        }
-    }
-
-def create_bedrock_error_response(
-    error_message: str,
-    action_group: str,
-    function_name: str,
-    message_version: str
-) -> Dict[str, Any]:
-    service = FinancialDataService()
-    error_details = service._create_error_response(error_message)
-    
-    user_friendly_error = {
-        "analysisReport": f"❌ ANALYSIS ERROR\n{'='*30}\n\n🚨 {error_message}\n\nPlease check the ticker symbol and try again.",
-        "technicalData": error_details
-    }
-    
-    response_body = {"TEXT": {"body": json.dumps(user_friendly_error)}}
-    
-    return {
-        'messageVersion': message_version,
-        'response': {
-            'actionGroup': action_group,
-            'function': function_name,
-            'functionResponse': {'responseBody': response_body}
-        }
-    }
+    tickers = []
+    for item in value or []:
+        ticker = str(item).strip().strip('"\'').upper()
+        if ticker and ticker not in tickers:
+            tickers.append(ticker)
+    return tickers
 
 # ========================================
 # MAIN EXECUTION
@@ -612,21 +1078,96 @@ if __name__ == "__main__":
 
 # --- Begin Minimal StockVectorDatabase (Pinecone-only, no CSV) ---
 
+class ScreenOrdering:
+    def __init__(self, matches: list):
+        self.matches = matches
+        self.positions = {match.id: position for position, match in enumerate(matches)}
+
+class ScreenPage:
+    def __init__(self, results: list, next_cursor: Optional[str], total: int):
+        self.results = results
+        self.next_cursor = next_cursor
+        self.total = total
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"results": [record.to_dict() for record in self.results], "nextCursor": self.next_cursor, "total": self.total}
+
+def encode_screen_cursor(offset: int, last_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"offset": offset, "id": last_id}).encode()).decode()
+
+def decode_screen_cursor(cursor: Optional[str], ordered: ScreenOrdering) -> int:
+    if not cursor:
+        return 0
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError:
+        raise ValueError("Invalid screening cursor")
+    # Resume after the last returned ID so a re-scanned result set does not repeat or skip rows
+    position = ordered.positions.get(state.get("id"))
+    return position + 1 if position is not None else int(state.get("offset", 0))
+
 class StockVectorDatabase:
-    def __init__(self, api_key: str, index_name: str = "stock-analysis", environment: str = "us-east-1"):
-        self.pc = Pinecone(api_key=api_key)
+    MAX_SIMILAR_FETCH = 1000
+    MIRROR_SNAPSHOT = "snapshot"
+    MIRROR_FILE = "file"
+    SCREEN_CACHE_TTL_SECONDS = 60
+    SCAN_PAGE_SIZE = 100
+    FETCH_BATCH_SIZE = 100
+    FETCH_WORKERS = 4
+    LATEST_PROBE_DAYS = 8
+    VECTOR_ID_TTL_SECONDS = 15 * 60
+    KEY_METRICS = (
+        'OPEN_PRC', 'CLOSE_PRC', 'LOW_PRC', 'HIGH_PRC', 'DVD_YIELD',
+        'BOOK_VALUE', 'PB_RATIO', 'PE_RATIO', 'Q_VOLUME', 'MKT_CAP',
+        'TURNOVER', 'Baro_Index', 'Fundamental_Score', 'Technic_Score',
+        'Quant_Score', 'Total_score', 'Rank', 'SET_CLOSE', 'SET50_CLOSE',
+        'SECTOR_YIELD', 'SECTOR_MKT_PE', 'SECTOR_MKT_CAP', 'SECTOR_MKT_PBV'
+    )
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        index_name: str = "stock-analysis",
+        environment: str = "us-east-1",
+        mirror_mode: Optional[str] = None,
+        mirror_path: Optional[str] = None,
+        mirror_refresh_seconds: Optional[float] = 3600,
+        backend: Optional[VectorStoreBackend] = None
+    ):
+        self.api_key = api_key
         self.index_name = index_name
         self.environment = environment
-        self.index = None
+        self.index = backend
         self.logger = self._setup_logger()
-        self.key_metrics = [
-            'OPEN_PRC', 'CLOSE_PRC', 'LOW_PRC', 'HIGH_PRC', 'DVD_YIELD',
-            'BOOK_VALUE', 'PB_RATIO', 'PE_RATIO', 'Q_VOLUME', 'MKT_CAP',
-            'TURNOVER', 'Baro_Index', 'Fundamental_Score', 'Technic_Score',
-            'Quant_Score', 'Total_score', 'Rank', 'SET_CLOSE', 'SET50_CLOSE',
-            'SECTOR_YIELD', 'SECTOR_MKT_PE', 'SECTOR_MKT_CAP', 'SECTOR_MKT_PBV'
-        ]
+        self._latest_vector_ids: Dict[str, Tuple[str, float]] = {}
+        self._vector_id_lock = threading.Lock()
+        self._screen_cache = LRUTTLCache(max_entries=32, ttl_seconds=self.SCREEN_CACHE_TTL_SECONDS)
+        self.key_metrics = list(self.KEY_METRICS)
         self._connect_index()
+        self.mirror = None
+        mirror_mode = mirror_mode or os.getenv("STOCK_INDEX_MIRROR_MODE")
+        if mirror_mode:
+            self.enable_local_mirror(
+                mirror_mode,
+                mirror_path or os.getenv("STOCK_INDEX_MIRROR_PATH"),
+                mirror_refresh_seconds
+            )
+
+    def enable_local_mirror(self, mode: str, path: Optional[str] = None, refresh_seconds: Optional[float] = 3600) -> None:
+        if mode == self.MIRROR_SNAPSHOT:
+            self.mirror = VectorIndexMirror(source_index=self.index, snapshot_path=path, refresh_seconds=refresh_seconds)
+        elif mode == self.MIRROR_FILE:
+            if not path:
+                raise ValueError("A snapshot path is required for the file mirror mode")
+            self.mirror = VectorIndexMirror(snapshot_path=path, refresh_seconds=refresh_seconds)
+        else:
+            raise ValueError(f"Unknown mirror mode '{mode}'. Use '{self.MIRROR_SNAPSHOT}' or '{self.MIRROR_FILE}'.")
+        self.logger.info(f"Serving reads from a local '{mode}' mirror of index '{self.index_name}'")
+
+    def _reader(self):
+        if self.mirror is not None:
+            return self.mirror.current()
+        return self.index
 
     def _setup_logger(self) -> logging.Logger:
         logger = logging.getLogger('StockVectorDB')
@@ -639,98 +1180,389 @@ class StockVectorDatabase:
         return logger
 
     def _connect_index(self):
-        if self.index_name in self.pc.list_indexes().names():
-            self.logger.info(f"Index '{self.index_name}' already exists")
-            self.index = self.pc.Index(self.index_name)
-        else:
-            raise Exception(f"Pinecone index '{self.index_name}' does not exist. Please create and upload data first.")
+        if self.index is None:
+            self.index = create_vector_backend(api_key=self.api_key, index_name=self.index_name)
 
-    def find_similar_stocks(self, target_security: str, target_date: str = None, top_k: int = 10) -> list:
+    def create_index(self) -> None:
+        ensure_pinecone_index(
+            self.api_key or os.getenv("PINECONE_API_KEY"),
+            self.index_name,
+            dimension=len(self.key_metrics),
+            region=self.environment
+        )
+        self.index = create_vector_backend(
+            VectorBackendSettings.BACKEND_PINECONE, api_key=self.api_key, index_name=self.index_name
+        )
+
+    def find_similar_stocks(self, target_security: str, target_date: str = None, top_k: int = 10, query_by_id: bool = True) -> list:
         try:
             if not self.index:
                 self.logger.error("Index not initialized")
                 return []
-            if target_date:
-                query_id = f"{target_security}_{datetime.strptime(target_date, '%Y-%m-%d').strftime('%Y%m%d')}"
-            else:
-                query_response = self.index.query(
-                    filter={"security": {"$eq": target_security}},
-                    top_k=1,
-                    include_metadata=True
-                )
-                if not query_response.matches:
-                    self.logger.warning(f"No data found for security: {target_security}")
-                    return []
-                query_id = query_response.matches[0].id
-            fetch_response = self.index.fetch(ids=[query_id])
-            if query_id not in fetch_response.vectors:
+            query_id = self.resolve_vector_id(target_security, target_date)
+            if not query_id:
+                self.logger.warning(f"No data found for security: {target_security}")
+                return []
+            similar_stocks = self._query_similar(target_security, query_id, top_k, query_by_id)
+            if similar_stocks is None and not target_date:
+                # The cached ID may point at a vector that has since been replaced; re-resolve once
+                self._forget_vector_id(target_security)
+                query_id = self.resolve_vector_id(target_security)
+                if query_id:
+                    similar_stocks = self._query_similar(target_security, query_id, top_k, query_by_id)
+            if similar_stocks is None:
                 self.logger.warning(f"Vector not found for ID: {query_id}")
                 return []
-            target_vector = fetch_response.vectors[query_id].values
-            similar_response = self.index.query(
-                vector=target_vector,
-                top_k=top_k + 5,
-                include_metadata=True,
-                filter={"security": {"$ne": target_security}}
-            )
-            similar_stocks = []
-            for match in similar_response.matches[:top_k]:
-                similar_stocks.append({
-                    'security': match.metadata['security'],
-                    'similarity_score': float(match.score),
-                    'close_price': match.metadata['close_price'],
-                    'market_cap': match.metadata['market_cap'],
-                    'pe_ratio': match.metadata['pe_ratio'],
-                    'total_score': match.metadata['total_score'],
-                    'rank': match.metadata['rank'],
-                    'sector': match.metadata['sector'],
-                    'trade_date': match.metadata['trade_date'],
-                    'document': match.metadata.get('document', '')
-                })
             return similar_stocks
         except Exception as e:
             self.logger.error(f"Failed to find similar stocks: {str(e)}")
             return []
 
-    def search_by_criteria(self, criteria: dict, top_k: int = 20) -> list:
+    def resolve_vector_id(self, security: str, target_date: str = None) -> Optional[str]:
+        if target_date:
+            return f"{security}_{datetime.strptime(target_date, '%Y-%m-%d').strftime('%Y%m%d')}"
+        return self.latest_vector_ids([security]).get(security.upper())
+
+    def latest_vector_ids(self, securities: list) -> Dict[str, str]:
+        # Entries expire so a warm container picks up the next daily ingest instead of serving yesterday's vector
+        securities = list(dict.fromkeys(security.upper().strip() for security in securities))
+        now = time.monotonic()
+        latest_ids = {}
+        stale = []
+        with self._vector_id_lock:
+            for security in securities:
+                cached = self._latest_vector_ids.get(security)
+                if cached and now - cached[1] < self.VECTOR_ID_TTL_SECONDS:
+                    latest_ids[security] = cached[0]
+                else:
+                    stale.append(security)
+        if stale:
+            resolved = {security: vector.id for security, vector in self._resolve_latest_vectors(self._reader(), stale).items()}
+            self._remember_latest_ids(resolved)
+            latest_ids.update(resolved)
+        return latest_ids
+
+    def refresh_vector_ids(self, securities: list) -> None:
+        self.fetch_latest_by_securities(securities)
+
+    def _query_similar(self, target_security: str, query_id: str, top_k: int, query_by_id: bool) -> Optional[list]:
+        if query_by_id:
+            query_kwargs = {"id": query_id}
+        else:
+            fetch_response = self._reader().fetch(ids=[query_id])
+            if query_id not in fetch_response.vectors:
+                return None
+            query_kwargs = {"vector": fetch_response.vectors[query_id].values}
+        
+        fetch_k = top_k
+        while True:
+            similar_response = self._reader().query(
+                **query_kwargs,
+                top_k=fetch_k,
+                include_metadata=True,
+                filter={"security": {"$ne": target_security}}
+            )
+            if not similar_response.matches and query_by_id and fetch_k == top_k:
+                return None
+            similar_stocks = self._distinct_similar_matches(similar_response.matches, target_security, top_k)
+            # Several trade dates of one peer can crowd the page; widen only when that actually happened
+            if (len(similar_stocks) >= top_k or len(similar_response.matches) < fetch_k
+                    or fetch_k >= self.MAX_SIMILAR_FETCH):
+                return similar_stocks
+            fetch_k = min(fetch_k * 2, self.MAX_SIMILAR_FETCH)
+
+    def _distinct_similar_matches(self, matches: list, target_security: str, top_k: int) -> list:
+        similar_stocks = []
+        seen = {target_security.upper()}
+        for match in matches:
+            security = match.metadata['security']
+            if security.upper() in seen:
+                continue
+            seen.add(security.upper())
+            similar_stocks.append(StockRecord.from_metadata(match.metadata, similarity_score=match.score))
+            if len(similar_stocks) >= top_k:
+                break
+        return similar_stocks
+
+    def _remember_latest_ids(self, latest_ids: Dict[str, str]) -> None:
+        # Only fed by fetch_latest_by_securities: rows seen in similarity or screening results need not be the newest
+        resolved_at = time.monotonic()
+        with self._vector_id_lock:
+            for security, vector_id in latest_ids.items():
+                self._latest_vector_ids[security] = (vector_id, resolved_at)
+
+    def _forget_vector_id(self, security: str) -> None:
+        with self._vector_id_lock:
+            self._latest_vector_ids.pop(security.upper(), None)
+
+    def search_by_criteria(self, criteria: Criteria, top_k: int = 20, sort_by: str = "total_score", descending: bool = True) -> list:
         try:
             if not self.index:
                 self.logger.error("Index not initialized")
                 return []
-            filter_dict = {}
-            for key, value in criteria.items():
-                if key.startswith('min_'):
-                    metric = key.replace('min_', '')
-                    filter_dict[metric] = {"$gte": value}
-                elif key.startswith('max_'):
-                    metric = key.replace('max_', '')
-                    filter_dict[metric] = {"$lte": value}
-                else:
-                    filter_dict[key] = {"$eq": value}
-            response = self.index.query(
-                vector=[0] * len(self.key_metrics),
-                top_k=top_k,
-                include_metadata=True,
-                filter=filter_dict
-            )
-            results = []
-            for match in response.matches:
-                results.append({
-                    'security': match.metadata['security'],
-                    'close_price': match.metadata['close_price'],
-                    'market_cap': match.metadata['market_cap'],
-                    'pe_ratio': match.metadata['pe_ratio'],
-                    'total_score': match.metadata['total_score'],
-                    'rank': match.metadata['rank'],
-                    'sector': match.metadata['sector'],
-                    'trade_date': match.metadata['trade_date'],
-                    'document': match.metadata.get('document', '')
-                })
-            return results
+            return self.screen_page(criteria, sort_by=sort_by, descending=descending, page_size=top_k).results
         except Exception as e:
             self.logger.error(f"Failed to search by criteria: {str(e)}")
             return []
 
+    def build_filter(self, criteria: Criteria) -> dict:
+        return build_metadata_filter(criteria)
+
+    def screen(
+        self,
+        criteria: Criteria = None,
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+        page_size: int = 100
+    ) -> Iterator[StockRecord]:
+        filter_dict = self.build_filter(criteria)
+        reader = self._reader()
+        ordering = parse_order_by(order_by)
+        
+        if ordering is None:
+            emitted = 0
+            for page in reader.scan(filter_dict, max(page_size, self.SCAN_PAGE_SIZE)):
+                for match in self._latest_rows_only(filter_dict, page):
+                    if limit is not None and emitted >= limit:
+                        return
+                    yield self._result_from_metadata(match.metadata)
+                    emitted += 1
+            return
+        
+        # Only (sort value, id) pairs are held for the whole universe; rows are fetched a page at a time
+        ordered_ids = self._ordered_screen_ids(reader, filter_dict, ordering[0], ordering[1], limit, page_size)
+        for start in range(0, len(ordered_ids), page_size):
+            page_ids = ordered_ids[start:start + page_size]
+            fetched = reader.fetch(ids=page_ids).vectors
+            for vector_id in page_ids:
+                vector = fetched.get(vector_id)
+                if vector is not None:
+                    yield self._result_from_metadata(vector.metadata)
+
+    def _ordered_screen_ids(
+        self,
+        reader: Any,
+        filter_dict: dict,
+        sort_field: str,
+        descending: bool,
+        limit: Optional[int],
+        page_size: int
+    ) -> List[str]:
+        keys = []
+        missing = []
+        for page in reader.scan(filter_dict, max(page_size, self.SCAN_PAGE_SIZE)):
+            for match in self._latest_rows_only(filter_dict, page):
+                value = match.metadata.get(sort_field)
+                if value is None:
+                    if limit is None or len(missing) < limit:
+                        missing.append(match.id)
+                else:
+                    keys.append((value, match.id))
+            if limit is not None and len(keys) > 4 * limit:
+                keys = self._top_keys(keys, limit, descending)
+        
+        keys = self._top_keys(keys, limit, descending) if limit is not None else sorted(keys, reverse=descending)
+        ordered_ids = [vector_id for _, vector_id in keys] + sorted(missing)
+        return ordered_ids[:limit] if limit is not None else ordered_ids
+
+    @staticmethod
+    def _top_keys(keys: list, limit: int, descending: bool) -> list:
+        return heapq.nlargest(limit, keys) if descending else heapq.nsmallest(limit, keys)
+
+    def screen_page(
+        self,
+        criteria: Criteria,
+        sort_by: str = "total_score",
+        descending: bool = True,
+        page_size: int = 50,
+        cursor: Optional[str] = None
+    ) -> ScreenPage:
+        ordered = self._screen_ordering(self.build_filter(criteria), sort_by, descending)
+        start = decode_screen_cursor(cursor, ordered)
+        page = ordered.matches[start:start + page_size]
+        end = start + len(page)
+        next_cursor = encode_screen_cursor(end, ordered.matches[end - 1].id) if end < len(ordered.matches) else None
+        return ScreenPage(
+            [self._result_from_metadata(match.metadata) for match in page],
+            next_cursor,
+            len(ordered.matches)
+        )
+
+    def iter_screen(
+        self,
+        criteria: Criteria,
+        sort_by: str = "total_score",
+        descending: bool = True,
+        page_size: int = 50
+    ) -> Iterator[StockRecord]:
+        cursor = None
+        while True:
+            page = self.screen_page(criteria, sort_by, descending, page_size, cursor)
+            yield from page.results
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    def _screen_ordering(self, filter_dict: dict, sort_by: str, descending: bool) -> "ScreenOrdering":
+        cache_key = (json.dumps(filter_dict, sort_keys=True, default=str), f"{sort_by}:{int(descending)}")
+        ordered = self._screen_cache.get(cache_key)
+        if ordered is not None:
+            return ordered
+        
+        matches = []
+        for page in self._reader().scan(filter_dict):
+            matches.extend(page)
+        matches = self._latest_rows_only(filter_dict, matches)
+        
+        present = [match for match in matches if match.metadata.get(sort_by) is not None]
+        missing = [match for match in matches if match.metadata.get(sort_by) is None]
+        present.sort(key=lambda match: (match.metadata[sort_by], match.id), reverse=descending)
+        missing.sort(key=lambda match: match.id)
+        ordered = ScreenOrdering(present + missing)
+        self._screen_cache.set(cache_key, ordered)
+        return ordered
+
+    def _latest_rows_only(self, filter_dict: dict, matches: list) -> list:
+        # A screen judges each security on its newest row, so an older day that passes the criteria cannot stand in
+        # for a latest row that fails them. A filter that pins trade_date asks for that day and is taken as is
+        if not matches or self._pins_trade_date(filter_dict):
+            return matches
+        latest_ids = self.latest_vector_ids([match.id.rsplit("_", 1)[0] for match in matches])
+        return [match for match in matches if latest_ids.get(match.id.rsplit("_", 1)[0].upper()) == match.id]
+
+    @staticmethod
+    def _pins_trade_date(filter_dict: dict) -> bool:
+        return "trade_date" in filter_dict or any("trade_date" in clause for clause in filter_dict.get("$and", []))
+
+    def _result_from_metadata(self, metadata: dict) -> StockRecord:
+        return StockRecord.from_metadata(metadata)
+
+    def scan_metadata(self, trade_date: str) -> Iterator[Dict[str, Any]]:
+        for page in self._reader().scan(self.build_filter(Eq('trade_date', trade_date)), self.SCAN_PAGE_SIZE):
+            for match in page:
+                yield match.metadata
+
+    def cross_section(self, trade_date: str) -> StockRecordBatch:
+        return StockRecordBatch.from_metadata(self.scan_metadata(trade_date))
+
+    def known_securities(self) -> set:
+        # Vector IDs are "<security>_<YYYYMMDD>", so the ID listing alone names every security in the index
+        securities = set()
+        for page in self._reader().list(limit=self.SCAN_PAGE_SIZE):
+            securities.update(vector_id.rsplit("_", 1)[0].upper() for vector_id in page)
+        return securities
+
+    def fetch_latest_by_securities(self, securities: list) -> Dict[str, StockRecord]:
+        if not self.index:
+            self.logger.error("Index not initialized")
+            return {}
+        securities = list(dict.fromkeys(security.upper().strip() for security in securities))
+        if not securities:
+            return {}
+        latest_vectors = self._resolve_latest_vectors(self._reader(), securities)
+        self._remember_latest_ids({security: vector.id for security, vector in latest_vectors.items()})
+        missing = [security for security in securities if security not in latest_vectors]
+        if missing:
+            self.logger.warning(f"No data found for securities: {', '.join(missing)}")
+        return {security: StockRecord.from_metadata(vector.metadata) for security, vector in latest_vectors.items()}
+
+    def missing_securities(self, securities: list) -> List[str]:
+        # Lists the live index rather than the mirror, which may not have picked up a newly listed security yet
+        if not self.index:
+            raise RuntimeError("Index not initialized")
+        securities = list(dict.fromkeys(security.upper().strip() for security in securities))
+        listed_ids = self._list_latest_ids(self.index, securities) if securities else {}
+        return [security for security in securities if security not in listed_ids]
+
+    def _resolve_latest_vectors(self, reader: Any, securities: List[str]) -> Dict[str, Any]:
+        # Vector IDs are "<security>_<YYYYMMDD>", so a security's newest row is its greatest ID. Recent days are
+        # probed with one fetch; only securities with no row in that window list their IDs to find the newest
+        latest_vectors = self._newest_vectors(self._fetch_vectors(reader, self._recent_vector_ids(securities)))
+        unresolved = [security for security in securities if security not in latest_vectors]
+        if unresolved:
+            listed_ids = self._list_latest_ids(reader, unresolved)
+            latest_vectors.update(self._newest_vectors(self._fetch_vectors(reader, list(listed_ids.values()))))
+        return latest_vectors
+
+    def _recent_vector_ids(self, securities: List[str]) -> List[str]:
+        # Starts a day ahead so an index fed from a timezone ahead of this clock still hits its newest date
+        today = datetime.now().date()
+        days = [(today - timedelta(days=offset)).strftime('%Y%m%d') for offset in range(-1, self.LATEST_PROBE_DAYS)]
+        return [f"{security}_{day}" for security in securities for day in days]
+
+    def _fetch_vectors(self, reader: Any, vector_ids: List[str]) -> Dict[str, Any]:
+        chunks = [vector_ids[offset:offset + self.FETCH_BATCH_SIZE] for offset in range(0, len(vector_ids), self.FETCH_BATCH_SIZE)]
+        if len(chunks) <= 1:
+            return dict(reader.fetch(ids=chunks[0]).vectors) if chunks else {}
+        vectors = {}
+        with ThreadPoolExecutor(max_workers=min(self.FETCH_WORKERS, len(chunks))) as executor:
+            for fetch_response in executor.map(lambda chunk: reader.fetch(ids=chunk), chunks):
+                vectors.update(fetch_response.vectors)
+        return vectors
+
+    @staticmethod
+    def _newest_vectors(vectors: Dict[str, Any]) -> Dict[str, Any]:
+        newest_ids: Dict[str, str] = {}
+        for vector_id in vectors:
+            security = vector_id.rsplit("_", 1)[0].upper()
+            if vector_id > newest_ids.get(security, ""):
+                newest_ids[security] = vector_id
+        return {security: vectors[vector_id] for security, vector_id in newest_ids.items()}
+
+    def _list_latest_ids(self, reader: Any, securities: List[str]) -> Dict[str, str]:
+        if len(securities) == 1:
+            latest_ids = [self._list_latest_id(reader, securities[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.FETCH_WORKERS, len(securities))) as executor:
+                latest_ids = list(executor.map(lambda security: self._list_latest_id(reader, security), securities))
+        return {security: vector_id for security, vector_id in zip(securities, latest_ids) if vector_id}
+
+    def _list_latest_id(self, reader: Any, security: str) -> Optional[str]:
+        latest_id = None
+        for page in reader.list(prefix=f"{security}_", limit=self.SCAN_PAGE_SIZE):
+            for vector_id in page:
+                # The prefix also matches "<security>_<suffix>_<date>" IDs of a longer security name
+                if vector_id.rsplit("_", 1)[0] == security and (latest_id is None or vector_id > latest_id):
+                    latest_id = vector_id
+        return latest_id
+
+    def get_history(
+        self,
+        security: str,
+        start: DateLike,
+        end: DateLike,
+        weekdays_only: bool = True,
+        chunk_size: int = 100,
+        max_workers: int = 4
+    ) -> StockHistory:
+        from stock_history import StockHistory, history_days, history_vector_ids
+        
+        security = security.upper()
+        vector_ids = history_vector_ids(security, history_days(start, end, weekdays_only))
+        chunks = [vector_ids[offset:offset + chunk_size] for offset in range(0, len(vector_ids), chunk_size)]
+        reader = self._reader()
+        
+        vectors = {}
+        if chunks:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                for fetch_response in executor.map(lambda chunk: reader.fetch(ids=chunk), chunks):
+                    vectors.update(fetch_response.vectors)
+        
+        self.logger.info(
+            f"Fetched {len(vectors)} of {len(vector_ids)} trade dates for {security} in {len(chunks)} parallel requests"
+        )
+        return StockHistory.from_vectors(security, vectors, self.key_metrics)
+
+    def is_healthy(self) -> bool:
+        if not self.index:
+            return False
+        try:
+            self.index.describe_index_stats()
+            return True
+        except Exception as e:
+            self.logger.warning(f"Index health check failed: {str(e)}")
+            return False
+
     def get_index_stats(self) -> dict:
         try:
             if not self.index:
@@ -750,19 +1582,11 @@ class StockVectorDatabase:
             if not self.index:
                 self.logger.error("Index not initialized")
                 return ""
-            if target_date:
-                query_id = f"{target_security}_{datetime.strptime(target_date, '%Y-%m-%d').strftime('%Y%m%d')}"
-                fetch_response = self.index.fetch(ids=[query_id])
+            query_id = self.resolve_vector_id(target_security, target_date)
+            if query_id:
+                fetch_response = self._reader().fetch(ids=[query_id])
                 if query_id in fetch_response.vectors:
                     return fetch_response.vectors[query_id].metadata.get('document', '')
-            else:
-                query_response = self.index.query(
-                    filter={"security": {"$eq": target_security}},
-                    top_k=1,
-                    include_metadata=True
-                )
-                if query_response.matches:
-                    return query_response.matches[0].metadata.get('document', '')
             return ""
         except Exception as e:
             self.logger.error(f"Failed to get document for {target_security}: {str(e)}")
@@ -21,6 +21,8 @@ except ImportError:
 # Add parent directory to path to import test financial function
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from test_financial_function import TestFinancialDataService
+from symbol_table import SymbolTable
+from async_service import BlockingCallBridge
 
 # Load environment variables
 load_dotenv()
@@ -72,6 +74,9 @@ class EnhancedAgenticChatbot:
         
         # Initialize financial service
         self.financial_service = TestFinancialDataService()
+        self.symbol_table = SymbolTable.from_securities(self.financial_service.get_available_tickers())
+        # Tools call the blocking financial service; running them on a bounded pool keeps the event loop free
+        self.tool_bridge = BlockingCallBridge()
         
         # Setup logging
         self.logger = self._setup_logger()
@@ -457,18 +462,17 @@ Remember: This is for educational purposes only. Always include appropriate disc
         """Intelligently select tools based on user message"""
         message_lower = user_message.lower()
         selected_tools = []
+        symbol_match = self.symbol_table.extract(user_message)
         
         # Analyze message for different intents
         if any(word in message_lower for word in ['analyze', 'analysis', 'look at', 'check out']):
             # Extract ticker if mentioned
-            for ticker in ['aapl', 'msft', 'googl', 'tsla', 'nvda', 'jpm', 'wmt']:
-                if ticker in message_lower:
-                    selected_tools.append({
-                        'tool': 'analyze_stock',
-                        'params': {'ticker': ticker.upper()},
-                        'confidence': 0.9
-                    })
-                    break
+            if symbol_match is not None:
+                selected_tools.append({
+                    'tool': 'analyze_stock',
+                    'params': {'ticker': symbol_match.security},
+                    'confidence': 0.9
+                })
         
         if any(word in message_lower for word in ['compare', 'rank', 'best', 'top', 'better']):
             selected_tools.append({
@@ -479,14 +483,12 @@ Remember: This is for educational purposes only. Always include appropriate disc
         
         if any(word in message_lower for word in ['risk', 'risky', 'safe', 'dangerous']):
             # Try to extract ticker for risk assessment
-            for ticker in ['aapl', 'msft', 'googl', 'tsla', 'nvda', 'jpm', 'wmt']:
-                if ticker in message_lower:
-                    selected_tools.append({
-                        'tool': 'risk_assessment',
-                        'params': {'ticker': ticker.upper()},
-                        'confidence': 0.7
-                    })
-                    break
+            if symbol_match is not None:
+                selected_tools.append({
+                    'tool': 'risk_assessment',
+                    'params': {'ticker': symbol_match.security},
+                    'confidence': 0.7
+                })
         
         if any(word in message_lower for word in ['portfolio', 'invest', 'allocation', 'diversify']):
             # Try to extract risk level
@@ -539,7 +541,10 @@ Remember: This is for educational purposes only. Always include appropriate disc
         for tool_info in selected_tools:
             if tool_info['confidence'] >= self.available_tools[tool_info['tool']].confidence_threshold:
                 tool_func = self.available_tools[tool_info['tool']].function
-                result = tool_func(**tool_info['params'])
+                try:
+                    result = await self.tool_bridge.run(tool_func, **tool_info['params'])
+                except asyncio.TimeoutError:
+                    result = {'success': False, 'error': f"{tool_info['tool']} timed out"}
                 tool_results.append({
                     'tool': tool_info['tool'],
                     'result': result,
@@ -0,0 +1,41 @@
+import importlib
+import threading
+from typing import Any
+
+# ========================================
+# DEFERRED MODULE IMPORTS
+# ========================================
+
+class LazyModule:
+    # Stands in for a heavy module (numpy, pandas) until an attribute is first used
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self) -> Any:
+        module = self.__dict__["_module"]
+        if module is None:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__dict__["_name"])
+                    self.__dict__["_module"] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attribute: str) -> Any:
+        value = getattr(self._load(), attribute)
+        # Later lookups hit the instance dict and never reach __getattr__ again
+        self.__dict__[attribute] = value
+        return value
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+def lazy_module(name: str) -> LazyModule:
+    return LazyModule(name)
@@ -0,0 +1,189 @@
+import os
+import math
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Iterable, Callable, List
+
+# ========================================
+# NEGATIVE CACHE CONFIGURATION
+# ========================================
+
+class NegativeCacheSettings:
+    MISSING_TTL_SECONDS = 15 * 60
+    MISSING_MAX_ENTRIES = 4096
+
+    BLOOM_ENV = "NEGATIVE_CACHE_BLOOM"
+    BLOOM_FALSE_POSITIVE_RATE = 0.001
+    BLOOM_REFRESH_SECONDS = 6 * 60 * 60
+
+def bloom_enabled() -> bool:
+    return os.getenv(NegativeCacheSettings.BLOOM_ENV, "").lower() in ("1", "true", "yes")
+
+# ========================================
+# BLOOM FILTER OF KNOWN SECURITIES
+# ========================================
+
+class BloomFilter:
+    def __init__(self, capacity: int, false_positive_rate: float = NegativeCacheSettings.BLOOM_FALSE_POSITIVE_RATE):
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_items(cls, items: Iterable[str], false_positive_rate: float = NegativeCacheSettings.BLOOM_FALSE_POSITIVE_RATE) -> "BloomFilter":
+        items = set(items)
+        bloom = cls(len(items), false_positive_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing over one digest stands in for hash_count independent hash functions
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + step * second) % self.size for step in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+# ========================================
+# NEGATIVE TICKER CACHE
+# ========================================
+
+class NegativeCacheStats:
+    def __init__(self):
+        self.missing_hits = 0
+        self.bloom_rejections = 0
+        self.passes = 0
+        self.remembered = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "missingHits": self.missing_hits,
+            "bloomRejections": self.bloom_rejections,
+            "passes": self.passes,
+            "remembered": self.remembered
+        }
+
+class NegativeTickerCache:
+    def __init__(
+        self,
+        ttl_seconds: float = NegativeCacheSettings.MISSING_TTL_SECONDS,
+        max_entries: int = NegativeCacheSettings.MISSING_MAX_ENTRIES,
+        securities_source: Optional[Callable[[], Iterable[str]]] = None,
+        bloom_refresh_seconds: Optional[float] = NegativeCacheSettings.BLOOM_REFRESH_SECONDS,
+        confirm_missing: Optional[Callable[[List[str]], List[str]]] = None
+    ):
+        self.logger = logging.getLogger("NegativeTickerCache")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.securities_source = securities_source
+        self.bloom_refresh_seconds = bloom_refresh_seconds
+        self.confirm_missing = confirm_missing
+        self.stats = NegativeCacheStats()
+        self._missing: "OrderedDict[str, float]" = OrderedDict()
+        self._bloom: Optional[BloomFilter] = None
+        self._bloom_loaded_at = 0.0
+        self._building = False
+        self._lock = threading.Lock()
+
+    def is_known_missing(self, ticker: str) -> bool:
+        ticker = ticker.upper().strip()
+        with self._lock:
+            expires_at = self._missing.get(ticker)
+            if expires_at is not None:
+                if time.monotonic() < expires_at:
+                    self.stats.missing_hits += 1
+                    return True
+                del self._missing[ticker]
+            bloom = self._bloom
+
+        if self.securities_source is not None and self._bloom_is_stale():
+            self._build_in_background()
+        # A Bloom filter has no false negatives, so "not in the filter" means the listing it was built from never held it
+        if bloom is not None and ticker not in bloom and self._confirm_rejection(ticker, bloom):
+            self.stats.bloom_rejections += 1
+            return True
+        self.stats.passes += 1
+        return False
+
+    def _confirm_rejection(self, ticker: str, bloom: BloomFilter) -> bool:
+        # The listing may predate a newly listed security, so a rejection is checked once against the live index
+        if self.confirm_missing is None:
+            return True
+        try:
+            confirmed = ticker in self.confirm_missing([ticker])
+        except Exception as error:
+            self.logger.warning(f"Could not confirm Bloom rejection of {ticker}, looking it up instead: {str(error)}")
+            return False
+        if confirmed:
+            self.remember_missing(ticker)
+        else:
+            with self._lock:
+                bloom.add(ticker)
+        return confirmed
+
+    def remember_missing(self, ticker: str) -> None:
+        with self._lock:
+            self._missing[ticker.upper().strip()] = time.monotonic() + self.ttl_seconds
+            self._missing.move_to_end(ticker.upper().strip())
+            while len(self._missing) > self.max_entries:
+                self._missing.popitem(last=False)
+            self.stats.remembered += 1
+
+    def forget(self, ticker: str) -> None:
+        with self._lock:
+            self._missing.pop(ticker.upper().strip(), None)
+
+    def load_known_securities(self, securities: Iterable[str]) -> BloomFilter:
+        bloom = BloomFilter.from_items(security.upper().strip() for security in securities)
+        with self._lock:
+            self._bloom = bloom
+            self._bloom_loaded_at = time.monotonic()
+        self.logger.info(f"Loaded known-securities filter with {bloom.count} securities")
+        return bloom
+
+    def _bloom_is_stale(self) -> bool:
+        # A failed build also stamps the load time, so it is retried on the refresh interval rather than per lookup
+        if not self._bloom_loaded_at:
+            return True
+        return self.bloom_refresh_seconds is not None and time.monotonic() - self._bloom_loaded_at > self.bloom_refresh_seconds
+
+    def _build_in_background(self) -> None:
+        # Lookups fall back to the TTL set until the first build lands, so a cold start never waits on the listing
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+
+        def _run():
+            try:
+                self.load_known_securities(self.securities_source())
+            except Exception as error:
+                self.logger.error(f"Known-securities filter build failed: {str(error)}")
+                with self._lock:
+                    self._bloom_loaded_at = time.monotonic()
+            finally:
+                with self._lock:
+                    self._building = False
+
+        threading.Thread(target=_run, name="known-securities-filter", daemon=True).start()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats.to_dict(),
+                "missingEntries": len(self._missing),
+                "knownSecurities": self._bloom.count if self._bloom is not None else None
+            }
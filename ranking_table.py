@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Dict, Any, Optional, List
+
+from lazy_imports import lazy_module
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+# ========================================
+# RANKING TABLE CONFIGURATION
+# ========================================
+
+class RankingSettings:
+    PATH_ENV = "RANKING_TABLE_PATH"
+
+    # Minimum widths for the .npy format; columns widen to fit longer values instead of truncating them
+    STRING_COLUMNS = {"security": 16, "sector": 48, "valuation": 24, "tradeDate": 10}
+    INT_COLUMNS = ("metricsAnalyzed", "overallRank", "sectorRank", "sectorSize")
+    FLOAT_COLUMNS = ("score", "closePrice", "marketCap", "peRatio", "roe", "evToEbitda", "eps", "totalScore")
+
+def default_ranking_path() -> Optional[str]:
+    # No shared fallback location: two deployments on one host must never read each other's table
+    return os.getenv(RankingSettings.PATH_ENV) or None
+
+# ========================================
+# BUILD + PERSIST
+# ========================================
+
+def build_ranking_frame(financial_data: pd.DataFrame, scored: pd.DataFrame, trade_date: str) -> pd.DataFrame:
+    frame = pd.DataFrame({
+        "security": financial_data["companyName"].astype(str).str.upper(),
+        "sector": financial_data["sector"].fillna("Unknown").astype(str),
+        "valuation": scored["valuation"].astype(str),
+        "tradeDate": trade_date,
+        "metricsAnalyzed": scored["metricsAnalyzed"].astype(np.int32),
+        "score": scored["score"].astype(np.float64),
+    })
+    for column in RankingSettings.FLOAT_COLUMNS[1:]:
+        frame[column] = pd.to_numeric(financial_data.get(column), errors="coerce").astype(np.float64)
+
+    # Rows are stored in descending score order, so the file itself is the sorted index
+    frame = frame.sort_values(["score", "security"], ascending=[False, True], kind="stable").reset_index(drop=True)
+    frame["overallRank"] = frame["score"].rank(ascending=False, method="min").astype(np.int32)
+    frame["sectorRank"] = frame.groupby("sector", sort=False)["score"].rank(ascending=False, method="min").astype(np.int32)
+    frame["sectorSize"] = frame.groupby("sector", sort=False)["sector"].transform("size").astype(np.int32)
+    return frame
+
+def string_column_width(values: pd.Series, minimum: int) -> int:
+    longest = values.astype(str).str.len().max() if len(values) else 0
+    return max(minimum, int(longest))
+
+def write_ranking_table(frame: pd.DataFrame, path: str) -> str:
+    temp_path = f"{path}.tmp"
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if path.endswith(".npy"):
+        dtype = (
+            [(name, f"U{string_column_width(frame[name], width)}") for name, width in RankingSettings.STRING_COLUMNS.items()]
+            + [(name, np.int32) for name in RankingSettings.INT_COLUMNS]
+            + [(name, np.float64) for name in RankingSettings.FLOAT_COLUMNS]
+        )
+        records = np.empty(len(frame), dtype=dtype)
+        for name, _ in dtype:
+            records[name] = frame[name].to_numpy()
+        with open(temp_path, "wb") as table_file:
+            np.save(table_file, records)
+    else:
+        import pyarrow as pa
+        table = pa.table({
+            name: pa.array(frame[name].to_numpy())
+            for name in list(RankingSettings.STRING_COLUMNS) + list(RankingSettings.INT_COLUMNS) + list(RankingSettings.FLOAT_COLUMNS)
+        })
+        with pa.OSFile(temp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    os.replace(temp_path, path)
+    return path
+
+def materialize_rankings(service: Any, trade_date: str, path: Optional[str] = None) -> Dict[str, Any]:
+    path = path or default_ranking_path()
+    if not path:
+        raise ValueError(f"No ranking table path given; pass one or set {RankingSettings.PATH_ENV}")
+
+    start = time.perf_counter()
+    batch = service.stock_db.cross_section(trade_date)
+    if not len(batch):
+        raise ValueError(f"No market data available for trade date {trade_date}")
+
+    financial_data = pd.DataFrame({
+        "companyName": batch.column("security"),
+        "sector": batch.column("sector"),
+        "closePrice": batch.column("close_price"),
+        "marketCap": batch.column("market_cap"),
+        "totalScore": batch.column("total_score"),
+        **batch.financial_columns()
+    })
+    scored = service.vectorized_scorer.score_dataframe(financial_data)
+    frame = build_ranking_frame(financial_data, scored, trade_date)
+    path = write_ranking_table(frame, path)
+
+    return {
+        "path": path,
+        "tradeDate": trade_date,
+        "securities": len(frame),
+        "sectors": int(frame["sector"].nunique()),
+        "seconds": round(time.perf_counter() - start, 2)
+    }
+
+# ========================================
+# MEMORY-MAPPED READER
+# ========================================
+
+class RankingTable:
+    def __init__(self, columns: Dict[str, Any], securities: List[str], sectors: List[str]):
+        self.columns = columns
+        self.trade_date = str(columns["tradeDate"][0]) if len(securities) else None
+        self._positions = {security: row for row, security in enumerate(securities)}
+        self._sector_positions: Dict[str, np.ndarray] = {}
+        sector_codes = pd.factorize(pd.Series(sectors, dtype=object))
+        for code, sector in enumerate(sector_codes[1]):
+            self._sector_positions[sector] = np.flatnonzero(sector_codes[0] == code)
+
+    @classmethod
+    def open(cls, path: str) -> "RankingTable":
+        if path.endswith(".npy"):
+            records = np.load(path, mmap_mode="r")
+            columns = {name: records[name] for name in records.dtype.names}
+            return cls(columns, records["security"].tolist(), records["sector"].tolist())
+
+        import pyarrow as pa
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        columns = {}
+        for name in table.column_names:
+            column = table.column(name).combine_chunks()
+            if name in RankingSettings.STRING_COLUMNS:
+                columns[name] = column.to_pylist()
+            else:
+                columns[name] = column.to_numpy(zero_copy_only=False)
+        return cls(columns, columns["security"], columns["sector"])
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def sectors(self) -> List[str]:
+        return list(self._sector_positions)
+
+    def row(self, position: int) -> Dict[str, Any]:
+        result = {}
+        for name, column in self.columns.items():
+            value = column[position]
+            if name in RankingSettings.STRING_COLUMNS:
+                result[name] = str(value)
+            elif name in RankingSettings.INT_COLUMNS:
+                result[name] = int(value)
+            else:
+                result[name] = None if np.isnan(value) else float(value)
+        return result
+
+    def top_n(self, sector: Optional[str] = None, n: int = 10) -> List[Dict[str, Any]]:
+        if sector is None:
+            positions = range(min(n, len(self)))
+        else:
+            positions = self._sector_positions.get(sector, np.empty(0, dtype=np.int64))[:n]
+        return [self.row(int(position)) for position in positions]
+
+    def rank_of(self, ticker: str) -> Optional[Dict[str, Any]]:
+        position = self._positions.get(ticker.upper())
+        return None if position is None else self.row(position)
+
+# ========================================
+# COMMAND LINE
+# ========================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Materialize the daily stock ranking table from the vector index")
+    parser.add_argument("trade_date", help="Trade date to rank, as stored in the index (YYYY-MM-DD)")
+    parser.add_argument("--output", default=None, help=f"Destination file (defaults to {RankingSettings.PATH_ENV}); .npy writes the NumPy format")
+    args = parser.parse_args(argv)
+    if not (args.output or default_ranking_path()):
+        parser.error(f"--output is required when {RankingSettings.PATH_ENV} is not set")
+
+    from lambda_function import FinancialDataService
+    service = FinancialDataService(use_caching=False)
+    print(json.dumps(materialize_rankings(service, args.trade_date, args.output)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+from typing import Dict, Any, Optional, Callable
+
+# ========================================
+# DISPLAY HELPERS
+# ========================================
+
+def format_market_cap(market_cap: Optional[float]) -> str:
+    if market_cap is None:
+        return "N/A"
+
+    if market_cap >= 1_000_000_000_000:  # Trillions
+        return f"${market_cap / 1_000_000_000_000:.2f}T"
+    elif market_cap >= 1_000_000_000:  # Billions
+        return f"${market_cap / 1_000_000_000:.2f}B"
+    elif market_cap >= 1_000_000:  # Millions
+        return f"${market_cap / 1_000_000:.2f}M"
+    else:
+        return f"${market_cap:,.0f}"
+
+def get_performance_indicator(score: int) -> str:
+    if score >= 90:
+        return "🟢 Excellent"
+    elif score >= 80:
+        return "🔵 Very Good"
+    elif score >= 70:
+        return "🟡 Good"
+    elif score >= 60:
+        return "🟠 Fair"
+    elif score >= 50:
+        return "🔴 Poor"
+    else:
+        return "⚫ Very Poor"
+
+def get_valuation_indicator(valuation: str) -> str:
+    if valuation == "Undervalued":
+        return "💚 Undervalued (Potential Buy)"
+    elif valuation == "Fairly valued":
+        return "💙 Fairly Valued (Hold/Monitor)"
+    else:
+        return "❤️ Overvalued (Consider Carefully)"
+
+# ========================================
+# PRECOMPILED TEMPLATES
+# ========================================
+
+INSUFFICIENT_DATA_RATIONALE = "Insufficient financial data available for meaningful analysis."
+INSUFFICIENT_DATA_REPORT = "❌ Unable to generate analysis report due to insufficient data."
+
+RATIONALE_TEMPLATE = (
+    "Financial Analysis for {}: "
+    "Overall score of {:.1f}/100 based on {} key metrics. "
+    "Key metrics - P/E Ratio: {}, ROE: {}, "
+    "EV/EBITDA: {}, EPS: ${}. "
+    "Based on this analysis, the stock appears to be {}."
+).format
+
+REPORT_HEADER_TEMPLATE = (
+    "📊 {} ({})\n"
+    "💰 Market Cap: {}\n"
+    "\n"
+    "🎯 Overall Score: {:.1f}/100 {}\n"
+    "💡 {}\n"
+    "\n"
+    "📊 Key Metrics:"
+).format
+
+METRIC_LINE_TEMPLATES = (
+    ("peRatio", "\n  P/E Ratio: {:.1f}x {}".format),
+    ("roe", "\n  ROE: {:.1f}% {}".format),
+    ("evToEbitda", "\n  EV/EBITDA: {:.1f}x {}".format),
+    ("eps", "\n  EPS: ${:.2f} {}".format),
+)
+
+DISCLAIMER = "⚠️ For informational purposes only. Not investment advice."
+CAUTION_FOOTER = f"\n\n❤️ Recommendation: Proceed with caution\n\n{DISCLAIMER}"
+RECOMMENDATION_FOOTERS = {
+    "Undervalued": f"\n\n💚 Recommendation: Consider for investment\n\n{DISCLAIMER}",
+    "Fairly valued": f"\n\n💙 Recommendation: Hold or monitor\n\n{DISCLAIMER}",
+}
+
+# ========================================
+# RENDERERS
+# ========================================
+
+def _ratio_display(value: Any, suffix: str = "") -> str:
+    return f"{value:.2f}{suffix}" if value else "N/A"
+
+def render_rationale(data: Dict[str, Any], score: float, valuation: str, metrics_count: int) -> str:
+    return RATIONALE_TEMPLATE(
+        data.get('companyName', 'Unknown Company'),
+        score,
+        metrics_count,
+        _ratio_display(data.get('peRatio')),
+        _ratio_display(data.get('roe'), "%"),
+        _ratio_display(data.get('evToEbitda')),
+        _ratio_display(data.get('eps')),
+        valuation.lower()
+    )
+
+def render_user_friendly_report(financial_data: Dict[str, Any], analysis_results: Dict[str, Any]) -> str:
+    overall_score = analysis_results.get('score', 0)
+    valuation = analysis_results.get('valuation', 'Unknown')
+    score_breakdown = analysis_results.get('scoreBreakdown', {})
+
+    parts = [REPORT_HEADER_TEMPLATE(
+        financial_data.get('companyName', 'Unknown Company'),
+        financial_data.get('sector', 'Unknown'),
+        format_market_cap(financial_data.get('marketCap')),
+        overall_score,
+        get_performance_indicator(int(overall_score)),
+        get_valuation_indicator(valuation)
+    )]
+    for metric_key, line_template in METRIC_LINE_TEMPLATES:
+        value = financial_data.get(metric_key)
+        if value is not None and metric_key in score_breakdown:
+            parts.append(line_template(value, get_performance_indicator(score_breakdown[metric_key])))
+    parts.append(RECOMMENDATION_FOOTERS.get(valuation, CAUTION_FOOTER))
+
+    return "".join(parts)
+
+# ========================================
+# LAZY REPORT TEXT
+# ========================================
+
+class LazyText:
+    # Renders on first use (str(), formatting, JSON serialization) and keeps the result
+    __slots__ = ("_renderer", "_args", "_text")
+
+    def __init__(self, renderer: Callable[..., str], *args: Any):
+        self._renderer = renderer
+        self._args = args
+        self._text = None
+
+    def render(self) -> str:
+        if self._text is None:
+            self._text = self._renderer(*self._args)
+            self._renderer = self._args = None
+        return self._text
+
+    @property
+    def rendered(self) -> bool:
+        return self._text is not None
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def __repr__(self) -> str:
+        return repr(self.render())
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.render(), format_spec)
+
+    def __len__(self) -> int:
+        return len(self.render())
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __eq__(self, other: Any) -> bool:
+        return self.render() == (other.render() if isinstance(other, LazyText) else other)
+
+    def __hash__(self) -> int:
+        return hash(self.render())
+
+    def __add__(self, other: str) -> str:
+        return self.render() + str(other)
+
+    def __radd__(self, other: str) -> str:
+        return str(other) + self.render()
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.render()
+
+    def __getitem__(self, key: Any) -> str:
+        return self.render()[key]
+
+    def __getattr__(self, name: str) -> Any:
+        # Any other str method (split, splitlines, ...) runs on the rendered text
+        return getattr(self.render(), name)
+
+REPORT_FIELDS = ("rationale", "userFriendlyReport")
+
+def attach_reports(data: Dict[str, Any], lazy: bool = True) -> Dict[str, Any]:
+    if all(field in data for field in REPORT_FIELDS):
+        return data
+    if not data.get('metricsAnalyzed'):
+        return {**data, 'rationale': INSUFFICIENT_DATA_RATIONALE, 'userFriendlyReport': INSUFFICIENT_DATA_REPORT}
+    rationale_args = (data, data.get('score', 0), data.get('valuation', 'Unknown'), data['metricsAnalyzed'])
+    if not lazy:
+        return {**data, 'rationale': render_rationale(*rationale_args), 'userFriendlyReport': render_user_friendly_report(data, data)}
+    return {
+        **data,
+        'rationale': LazyText(render_rationale, *rationale_args),
+        'userFriendlyReport': LazyText(render_user_friendly_report, data, data)
+    }
+
+def strip_reports(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in data.items() if key not in REPORT_FIELDS}
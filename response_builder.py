@@ -0,0 +1,131 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Any
+
+from report_rendering import LazyText
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ========================================
+# RESPONSE ENCODING
+# ========================================
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, LazyText):
+        return value.render()
+    # Row objects (StockRecord, ScreenPage) become dicts only here, at the JSON boundary
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+def _encode_stdlib(payload: Any) -> str:
+    return json.dumps(payload, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+
+def _encode_orjson(payload: Any) -> str:
+    return orjson.dumps(payload, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+
+encode_json = _encode_orjson if orjson is not None else _encode_stdlib
+
+def _without_report(result: Dict[str, Any]) -> Dict[str, Any]:
+    data = result.get('data')
+    if not isinstance(data, dict) or 'userFriendlyReport' not in data:
+        return result
+    return {**result, 'data': {key: value for key, value in data.items() if key != 'userFriendlyReport'}}
+
+def deduplicate_technical_data(analysis_results: Dict[str, Any]) -> Dict[str, Any]:
+    # The report text already goes out as analysisReport; keeping it in technicalData doubles the body
+    if isinstance(analysis_results.get('results'), dict):
+        return {
+            **analysis_results,
+            'results': {ticker: _without_report(result) for ticker, result in analysis_results['results'].items()}
+        }
+    return _without_report(analysis_results)
+
+def create_error_response(error_message: str, retryable: bool = False) -> Dict[str, Any]:
+    error_response = {
+        'success': False,
+        'error': error_message,
+        'timestamp': datetime.now().isoformat()
+    }
+    # Set only when the vector index itself failed, so callers can tell an outage from an unknown ticker
+    if retryable:
+        error_response['retryable'] = True
+    return error_response
+
+def build_bedrock_response(
+    response_body: Dict[str, Any],
+    action_group: str,
+    function_name: str,
+    message_version: str
+) -> Dict[str, Any]:
+    return {
+        'messageVersion': message_version,
+        'response': {
+            'actionGroup': action_group,
+            'function': function_name,
+            'functionResponse': {'responseBody': response_body}
+        }
+    }
+
+def create_bedrock_success_response(
+    analysis_results: Dict[str, Any],
+    action_group: str,
+    function_name: str,
+    message_version: str
+) -> Dict[str, Any]:
+    if analysis_results.get('success') and analysis_results.get('data', {}).get('userFriendlyReport'):
+        formatted_response = {
+            "analysisReport": analysis_results['data']['userFriendlyReport'],
+            "technicalData": deduplicate_technical_data(analysis_results)
+        }
+    elif 'results' in analysis_results:
+        formatted_response = {
+            "analysisReport": create_batch_report(analysis_results),
+            "technicalData": deduplicate_technical_data(analysis_results)
+        }
+    else:
+        formatted_response = analysis_results
+    
+    response_body = {"TEXT": {"body": encode_json(formatted_response)}}
+    
+    return build_bedrock_response(response_body, action_group, function_name, message_version)
+
+def create_batch_report(batch_results: Dict[str, Any]) -> str:
+    report_sections = []
+    
+    for ticker in batch_results.get('tickers', []):
+        result = batch_results.get('results', {}).get(ticker)
+        if result:
+            report_sections.append(str(result['data'].get('userFriendlyReport', '')))
+        else:
+            error_message = batch_results.get('failed', {}).get(ticker, 'Analysis unavailable')
+            report_sections.append(f"❌ {ticker}: {error_message}")
+    
+    return f"\n\n{'='*30}\n\n".join(report_sections)
+
+def create_bedrock_error_response(
+    error_message: str,
+    action_group: str,
+    function_name: str,
+    message_version: str
+) -> Dict[str, Any]:
+    error_details = create_error_response(error_message)
+    
+    user_friendly_error = {
+        "analysisReport": f"❌ ANALYSIS ERROR\n{'='*30}\n\n🚨 {error_message}\n\nPlease check the ticker symbol and try again.",
+        "technicalData": error_details
+    }
+    
+    response_body = {"TEXT": {"body": encode_json(user_friendly_error)}}
+    
+    return build_bedrock_response(response_body, action_group, function_name, message_version)
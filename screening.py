@@ -0,0 +1,132 @@
+from typing import Dict, Any, Optional, Iterable, List, Union
+
+# ========================================
+# COMPOSABLE SCREENING PREDICATES
+# ========================================
+
+class Predicate:
+    def to_filter(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def __and__(self, other: "Predicate") -> "Predicate":
+        return AllOf(self, other)
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        return AnyOf(self, other)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_filter()})"
+
+class Eq(Predicate):
+    def __init__(self, field: str, value: Any):
+        self.field = field
+        self.value = value
+
+    def to_filter(self) -> Dict[str, Any]:
+        return {self.field: {"$eq": self.value}}
+
+class NotEq(Predicate):
+    def __init__(self, field: str, value: Any):
+        self.field = field
+        self.value = value
+
+    def to_filter(self) -> Dict[str, Any]:
+        return {self.field: {"$ne": self.value}}
+
+class Range(Predicate):
+    def __init__(self, field: str, low: Optional[float] = None, high: Optional[float] = None, inclusive: bool = True):
+        if low is None and high is None:
+            raise ValueError(f"Range on '{field}' needs a low or a high bound")
+        self.field = field
+        self.low = low
+        self.high = high
+        self.inclusive = inclusive
+
+    def to_filter(self) -> Dict[str, Any]:
+        condition = {}
+        if self.low is not None:
+            condition["$gte" if self.inclusive else "$gt"] = self.low
+        if self.high is not None:
+            condition["$lte" if self.inclusive else "$lt"] = self.high
+        return {self.field: condition}
+
+class OneOf(Predicate):
+    def __init__(self, field: str, values: Iterable[Any]):
+        self.field = field
+        self.values = list(values)
+
+    def to_filter(self) -> Dict[str, Any]:
+        return {self.field: {"$in": self.values}}
+
+class NoneOf(Predicate):
+    def __init__(self, field: str, values: Iterable[Any]):
+        self.field = field
+        self.values = list(values)
+
+    def to_filter(self) -> Dict[str, Any]:
+        return {self.field: {"$nin": self.values}}
+
+class Sector(OneOf):
+    def __init__(self, *sectors: str):
+        super().__init__("sector", sectors)
+
+class AllOf(Predicate):
+    def __init__(self, *predicates: Predicate):
+        self.predicates = list(predicates)
+
+    def to_filter(self) -> Dict[str, Any]:
+        return {"$and": [predicate.to_filter() for predicate in self.predicates]}
+
+class AnyOf(Predicate):
+    def __init__(self, *predicates: Predicate):
+        self.predicates = list(predicates)
+
+    def to_filter(self) -> Dict[str, Any]:
+        return {"$or": [predicate.to_filter() for predicate in self.predicates]}
+
+# ========================================
+# CRITERIA NORMALIZATION
+# ========================================
+
+Criteria = Union[Dict[str, Any], Predicate, List[Predicate], None]
+
+def criteria_from_dict(criteria: Dict[str, Any]) -> List[Predicate]:
+    # Legacy convention: min_<field> / max_<field> bounds, lists for set membership, scalars for equality
+    bounds: Dict[str, Dict[str, Any]] = {}
+    predicates: List[Predicate] = []
+    for key, value in criteria.items():
+        if key.startswith("min_"):
+            bounds.setdefault(key[len("min_"):], {})["low"] = value
+        elif key.startswith("max_"):
+            bounds.setdefault(key[len("max_"):], {})["high"] = value
+        elif isinstance(value, Predicate):
+            predicates.append(value)
+        elif isinstance(value, (list, tuple, set)):
+            predicates.append(OneOf(key, value))
+        else:
+            predicates.append(Eq(key, value))
+    predicates.extend(Range(field, **limits) for field, limits in bounds.items())
+    return predicates
+
+def build_metadata_filter(criteria: Criteria) -> Dict[str, Any]:
+    if criteria is None:
+        return {}
+    if isinstance(criteria, Predicate):
+        return criteria.to_filter()
+    predicates = criteria_from_dict(criteria) if isinstance(criteria, dict) else list(criteria)
+
+    # Flatten into one field-keyed dict when no field repeats, which is the form Pinecone handles best
+    filter_dict: Dict[str, Any] = {}
+    for predicate in predicates:
+        clause = predicate.to_filter()
+        if any(key.startswith("$") or key in filter_dict for key in clause):
+            return {"$and": [predicate.to_filter() for predicate in predicates]}
+        filter_dict.update(clause)
+    return filter_dict
+
+def parse_order_by(order_by: Optional[str]) -> Optional[tuple]:
+    if not order_by:
+        return None
+    if order_by.startswith("-"):
+        return order_by[1:], True
+    return order_by.lstrip("+"), False
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from lazy_imports import lazy_module
+from stock_record import derive_financial_columns
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+# ========================================
+# SECTOR-RELATIVE SCORING CONFIGURATION
+# ========================================
+
+# Metric -> True when a higher value is better within the sector
+SECTOR_METRICS = {
+    "peRatio": False,
+    "roe": True,
+    "evToEbitda": False,
+    "eps": True,
+    "peVsSector": False,
+    "pbvVsSector": False,
+}
+
+class SectorScoringWeights:
+    PE_RATIO = 0.2
+    ROE = 0.2
+    EV_EBITDA = 0.15
+    EPS = 0.15
+    PE_VS_SECTOR = 0.15
+    PBV_VS_SECTOR = 0.15
+
+    @classmethod
+    def as_dict(cls) -> Dict[str, float]:
+        return {
+            "peRatio": cls.PE_RATIO,
+            "roe": cls.ROE,
+            "evToEbitda": cls.EV_EBITDA,
+            "eps": cls.EPS,
+            "peVsSector": cls.PE_VS_SECTOR,
+            "pbvVsSector": cls.PBV_VS_SECTOR,
+        }
+
+TABLE_CACHE_SIZE = 8
+
+# ========================================
+# PER-TRADE-DATE SCORE TABLE
+# ========================================
+
+class SectorScoreTable:
+    def __init__(self, trade_date: str, scored: pd.DataFrame):
+        self.trade_date = trade_date
+        self.scored = scored
+
+    def lookup(self, ticker: str) -> Optional[Dict[str, Any]]:
+        ticker = ticker.upper()
+        if ticker not in self.scored.index:
+            return None
+        row = self.scored.loc[ticker]
+        return {
+            "ticker": ticker,
+            "sector": row["sector"],
+            "tradeDate": self.trade_date,
+            "sectorScore": None if pd.isna(row["sectorScore"]) else round(float(row["sectorScore"]), 2),
+            "sectorRank": None if pd.isna(row["sectorRank"]) else int(row["sectorRank"]),
+            "sectorSize": int(row["sectorSize"]),
+            "percentiles": {
+                metric: round(float(row[f"{metric}Percentile"]), 2)
+                for metric in SECTOR_METRICS
+                if not pd.isna(row[f"{metric}Percentile"])
+            },
+        }
+
+# ========================================
+# VECTORIZED CROSS-SECTIONAL SCORER
+# ========================================
+
+class SectorRelativeScorer:
+    def __init__(self, weights: Optional[Dict[str, float]] = None):
+        self.weights = weights or SectorScoringWeights.as_dict()
+        self._tables: "OrderedDict[str, SectorScoreTable]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def prepare_cross_section(frame: pd.DataFrame) -> pd.DataFrame:
+        prepared = frame.copy()
+        for field in ("pe_ratio", "close_price", "fundamental_score", "pb_ratio", "sector_mkt_pe", "sector_mkt_pbv"):
+            prepared[field] = pd.to_numeric(prepared[field], errors="coerce") if field in prepared else np.nan
+
+        for metric, values in derive_financial_columns(
+            prepared["pe_ratio"], prepared["close_price"], prepared["fundamental_score"]
+        ).items():
+            prepared[metric] = values
+        prepared["peVsSector"] = prepared["peRatio"] / prepared["sector_mkt_pe"].where(prepared["sector_mkt_pe"] > 0)
+        prepared["pbvVsSector"] = prepared["pb_ratio"] / prepared["sector_mkt_pbv"].where(prepared["sector_mkt_pbv"] > 0)
+        for metric in SECTOR_METRICS:
+            prepared[metric] = prepared[metric].where(prepared[metric] > 0)
+
+        if "sector" not in prepared:
+            prepared["sector"] = "Unknown"
+        prepared["sector"] = prepared["sector"].fillna("Unknown")
+        return prepared
+
+    def score_cross_section(self, frame: pd.DataFrame) -> pd.DataFrame:
+        prepared = self.prepare_cross_section(frame)
+        by_sector = prepared.groupby("sector", sort=False)
+
+        weighted_sum = np.zeros(len(prepared))
+        weight_total = np.zeros(len(prepared))
+        for metric, higher_is_better in SECTOR_METRICS.items():
+            percentile = by_sector[metric].rank(pct=True, ascending=higher_is_better, method="average") * 100
+            prepared[f"{metric}Percentile"] = percentile
+            available = percentile.notna().to_numpy()
+            weighted_sum += np.where(available, percentile.to_numpy() * self.weights[metric], 0.0)
+            weight_total += np.where(available, self.weights[metric], 0.0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            prepared["sectorScore"] = np.where(weight_total > 0, weighted_sum / weight_total, np.nan)
+        prepared["sectorRank"] = prepared.groupby("sector", sort=False)["sectorScore"].rank(ascending=False, method="min")
+        prepared["sectorSize"] = by_sector["sector"].transform("size")
+        return prepared
+
+    def build_table(self, frame: pd.DataFrame, trade_date: str) -> SectorScoreTable:
+        scored = self.score_cross_section(frame)
+        scored.index = scored["security"].astype(str).str.upper()
+
+        table = SectorScoreTable(trade_date, scored)
+        with self._lock:
+            self._tables[trade_date] = table
+            self._tables.move_to_end(trade_date)
+            while len(self._tables) > TABLE_CACHE_SIZE:
+                self._tables.popitem(last=False)
+        return table
+
+    def get_table(self, trade_date: str) -> Optional[SectorScoreTable]:
+        with self._lock:
+            table = self._tables.get(trade_date)
+            if table is not None:
+                self._tables.move_to_end(trade_date)
+            return table
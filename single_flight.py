@@ -0,0 +1,127 @@
+import asyncio
+import threading
+from typing import Dict, Any, Callable, Awaitable, Hashable
+
+# ========================================
+# COALESCING STATS
+# ========================================
+
+class SingleFlightStats:
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+        self.errors = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "maxWaiters": self.max_waiters,
+            "errors": self.errors,
+            "coalescingRatio": round(self.coalesced / self.calls, 4) if self.calls else 0.0
+        }
+
+# ========================================
+# THREADED SINGLE-FLIGHT
+# ========================================
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 1
+
+class SingleFlight:
+    # Concurrent callers with the same key share one execution of fn; later callers start a fresh one
+    def __init__(self):
+        self.stats = SingleFlightStats()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.stats.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats.coalesced += 1
+                self.stats.max_waiters = max(self.stats.max_waiters, call.waiters)
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.stats.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            with self._lock:
+                self.stats.errors += 1
+            raise
+        finally:
+            # Drop the key before waking followers so a caller arriving now triggers a fresh execution
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats.to_dict(), "inFlight": len(self._calls)}
+
+# ========================================
+# ASYNCIO SINGLE-FLIGHT
+# ========================================
+
+class AsyncSingleFlight:
+    # Loop-bound counterpart of SingleFlight; all callers must share one event loop
+    def __init__(self):
+        self.stats = SingleFlightStats()
+        self._tasks: Dict[Hashable, "asyncio.Task"] = {}
+        self._waiters: Dict[Hashable, int] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats.calls += 1
+        task = self._tasks.get(key)
+        if task is not None:
+            self._waiters[key] += 1
+            self.stats.coalesced += 1
+            self.stats.max_waiters = max(self.stats.max_waiters, self._waiters[key])
+        else:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            self._waiters[key] = 1
+            self.stats.executions += 1
+            task.add_done_callback(lambda finished, key=key: self._finish(key, finished))
+        # shield: one caller being cancelled must not cancel the shared execution under everyone else
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Task") -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+            del self._waiters[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.stats.errors += 1
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats.to_dict(), "inFlight": len(self._tasks)}
@@ -0,0 +1,218 @@
+import os
+import sys
+import json
+import time
+import bisect
+import threading
+from typing import Dict, Any, Optional, List
+
+# ========================================
+# METRICS CONFIGURATION
+# ========================================
+
+class MetricsSettings:
+    FORMAT_ENV = "METRICS_FORMAT"
+    NAMESPACE_ENV = "METRICS_NAMESPACE"
+    LAMBDA_ENV = "AWS_LAMBDA_FUNCTION_NAME"
+
+    FORMAT_JSON = "json"
+    FORMAT_EMF = "emf"
+    FORMAT_NONE = "none"
+
+    DEFAULT_NAMESPACE = "StockAnalysis"
+
+    # Upper bounds in milliseconds; the last bucket catches everything slower
+    BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# ========================================
+# IN-PROCESS HISTOGRAMS
+# ========================================
+
+class LatencyHistogram:
+    def __init__(self, bounds_ms: tuple = MetricsSettings.BUCKET_BOUNDS_MS):
+        self.bounds_ms = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+
+    def record(self, duration_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds_ms, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.min_ms = duration_ms if self.min_ms is None else min(self.min_ms, duration_ms)
+        self.max_ms = duration_ms if self.max_ms is None else max(self.max_ms, duration_ms)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        # Upper bound of the bucket holding the pct-th sample, capped at the observed maximum
+        if not self.count:
+            return None
+        rank = max(1, int(round(self.count * pct / 100)))
+        seen = 0
+        for position, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                bound = self.bounds_ms[position] if position < len(self.bounds_ms) else self.max_ms
+                return round(min(bound, self.max_ms), 3)
+        return round(self.max_ms, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "meanMs": round(self.total_ms / self.count, 3) if self.count else None,
+            "minMs": None if self.min_ms is None else round(self.min_ms, 3),
+            "maxMs": None if self.max_ms is None else round(self.max_ms, 3),
+            "p50Ms": self.percentile(50),
+            "p90Ms": self.percentile(90),
+            "p99Ms": self.percentile(99),
+            "buckets": {
+                (f"le{bound:g}" if position < len(self.bounds_ms) else "inf"): bucket_count
+                for position, (bound, bucket_count) in enumerate(zip(self.bounds_ms + (None,), self.counts))
+                if bucket_count
+            }
+        }
+
+# ========================================
+# TRACES + SPANS
+# ========================================
+
+class Trace:
+    def __init__(self, operation: str, dimensions: Dict[str, Any]):
+        self.operation = operation
+        self.dimensions = dimensions
+        self.stages: List[tuple] = []
+        self.started = time.perf_counter()
+
+class _Span:
+    __slots__ = ("_metrics", "_stage", "_started")
+
+    def __init__(self, metrics: "StageMetrics", stage: str):
+        self._metrics = metrics
+        self._stage = stage
+
+    def __enter__(self) -> "_Span":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._metrics.record(self._stage, (time.perf_counter() - self._started) * 1000)
+
+class _TraceScope:
+    def __init__(self, metrics: "StageMetrics", operation: str, dimensions: Dict[str, Any]):
+        self._metrics = metrics
+        self._operation = operation
+        self._dimensions = dimensions
+        self._trace = None
+
+    def __enter__(self) -> Optional[Trace]:
+        # A trace opened inside another one (analyze_stock under lambda_handler) joins the outer trace
+        current = self._metrics._current()
+        if current is not None:
+            current.dimensions.update({key: value for key, value in self._dimensions.items() if key not in current.dimensions})
+            return current
+        self._trace = Trace(self._operation, dict(self._dimensions))
+        self._metrics._local.trace = self._trace
+        return self._trace
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._trace is None:
+            return
+        self._metrics._local.trace = None
+        total_ms = (time.perf_counter() - self._trace.started) * 1000
+        self._metrics._record_histogram(f"{self._trace.operation}.total", total_ms)
+        if exc_type is not None:
+            self._trace.dimensions["error"] = exc_type.__name__
+        self._metrics.emit(self._trace, total_ms)
+
+def default_output_format() -> str:
+    # Only Lambda turns stdout into CloudWatch metrics; bots and scripts would just get their console flooded
+    if os.getenv(MetricsSettings.LAMBDA_ENV):
+        return MetricsSettings.FORMAT_EMF
+    return MetricsSettings.FORMAT_NONE
+
+class StageMetrics:
+    def __init__(self, output_format: Optional[str] = None, namespace: Optional[str] = None, stream: Any = None):
+        self.output_format = (output_format or os.getenv(MetricsSettings.FORMAT_ENV) or default_output_format()).lower()
+        self.namespace = namespace or os.getenv(MetricsSettings.NAMESPACE_ENV, MetricsSettings.DEFAULT_NAMESPACE)
+        self.stream = stream
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _current(self) -> Optional[Trace]:
+        return getattr(self._local, "trace", None)
+
+    def trace(self, operation: str, **dimensions: Any) -> _TraceScope:
+        return _TraceScope(self, operation, dimensions)
+
+    def span(self, stage: str) -> _Span:
+        return _Span(self, stage)
+
+    def record(self, stage: str, duration_ms: float) -> None:
+        current = self._current()
+        if current is not None:
+            current.stages.append((stage, duration_ms))
+            self._record_histogram(f"{current.operation}.{stage}", duration_ms)
+        else:
+            self._record_histogram(stage, duration_ms)
+
+    def _record_histogram(self, name: str, duration_ms: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.record(duration_ms)
+
+    def stage_timings(self, trace: Trace) -> Dict[str, float]:
+        # A stage entered more than once in one trace (e.g. retries) reports its summed time
+        timings: Dict[str, float] = {}
+        for stage, duration_ms in trace.stages:
+            timings[stage] = timings.get(stage, 0.0) + duration_ms
+        return {stage: round(duration_ms, 3) for stage, duration_ms in timings.items()}
+
+    def build_record(self, trace: Trace, total_ms: float) -> Dict[str, Any]:
+        timings = self.stage_timings(trace)
+        if self.output_format == MetricsSettings.FORMAT_EMF:
+            metric_values = {f"{stage}Ms": duration_ms for stage, duration_ms in timings.items()}
+            metric_values["totalMs"] = round(total_ms, 3)
+            return {
+                "_aws": {
+                    "Timestamp": int(time.time() * 1000),
+                    "CloudWatchMetrics": [{
+                        "Namespace": self.namespace,
+                        "Dimensions": [["Operation"]],
+                        "Metrics": [{"Name": name, "Unit": "Milliseconds"} for name in metric_values]
+                    }]
+                },
+                "Operation": trace.operation,
+                **trace.dimensions,
+                **metric_values
+            }
+        return {
+            "metric": "stage_latency",
+            "operation": trace.operation,
+            **trace.dimensions,
+            "stagesMs": timings,
+            "totalMs": round(total_ms, 3)
+        }
+
+    def emit(self, trace: Trace, total_ms: float) -> None:
+        if self.output_format == MetricsSettings.FORMAT_NONE:
+            return
+        # Written as one bare JSON line: CloudWatch only extracts EMF from log events that are pure JSON
+        stream = self.stream or sys.stdout
+        stream.write(json.dumps(self.build_record(trace, total_ms), default=str) + "\n")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: histogram.to_dict() for name, histogram in sorted(self._histograms.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+stage_metrics = StageMetrics()
+
+def get_metrics() -> Dict[str, Any]:
+    return stage_metrics.get_metrics()
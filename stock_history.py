@@ -0,0 +1,150 @@
+import warnings
+from datetime import date, datetime
+from typing import Dict, Any, Optional, List, Sequence, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+DateLike = Union[str, date, datetime, np.datetime64]
+
+# Numeric metadata fields exposed as history columns alongside the vector values
+HISTORY_METADATA_FIELDS = (
+    "close_price", "market_cap", "pe_ratio", "pb_ratio", "total_score",
+    "fundamental_score", "technical_score", "quant_score", "rank"
+)
+
+# ========================================
+# DATE HELPERS
+# ========================================
+
+def to_day(value: DateLike) -> np.datetime64:
+    if isinstance(value, np.datetime64):
+        return value.astype("datetime64[D]")
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return np.datetime64(value.isoformat(), "D")
+    text = str(value).strip()
+    if len(text) == 8 and text.isdigit():
+        text = f"{text[:4]}-{text[4:6]}-{text[6:]}"
+    return np.datetime64(text, "D")
+
+def history_days(start: DateLike, end: DateLike, weekdays_only: bool = True) -> np.ndarray:
+    days = np.arange(to_day(start), to_day(end) + np.timedelta64(1, "D"), dtype="datetime64[D]")
+    return days[np.is_busday(days)] if weekdays_only else days
+
+def history_vector_ids(security: str, days: np.ndarray) -> List[str]:
+    return [f"{security}_{day.astype(object).strftime('%Y%m%d')}" for day in days]
+
+# ========================================
+# COLUMNAR HISTORY
+# ========================================
+
+class StockHistory:
+    def __init__(
+        self,
+        security: str,
+        dates: np.ndarray,
+        values: np.ndarray,
+        key_metrics: Sequence[str],
+        metadata_columns: Optional[Dict[str, np.ndarray]] = None
+    ):
+        order = np.argsort(dates, kind="stable")
+        self.security = security
+        self.dates = np.asarray(dates, dtype="datetime64[D]")[order]
+        self.values = np.asarray(values, dtype=np.float64).reshape(len(order), len(key_metrics))[order]
+        self.key_metrics = list(key_metrics)
+        self.metadata_columns = {
+            name: np.asarray(column, dtype=np.float64)[order]
+            for name, column in (metadata_columns or {}).items()
+        }
+        self._metric_positions = {metric: position for position, metric in enumerate(self.key_metrics)}
+
+    @classmethod
+    def from_vectors(cls, security: str, vectors: Dict[str, Any], key_metrics: Sequence[str]) -> "StockHistory":
+        dates, values = [], []
+        metadata_columns = {field: [] for field in HISTORY_METADATA_FIELDS}
+        for vector_id, vector in vectors.items():
+            dates.append(to_day(vector_id.rsplit("_", 1)[-1]))
+            values.append(vector.values)
+            metadata = vector.metadata or {}
+            for field in HISTORY_METADATA_FIELDS:
+                value = metadata.get(field)
+                metadata_columns[field].append(np.nan if value is None else value)
+        return cls(
+            security,
+            np.asarray(dates, dtype="datetime64[D]"),
+            np.asarray(values, dtype=np.float64).reshape(len(dates), len(key_metrics)),
+            key_metrics,
+            metadata_columns
+        )
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def column(self, name: str) -> np.ndarray:
+        if name in self.metadata_columns:
+            return self.metadata_columns[name]
+        if name in self._metric_positions:
+            return self.values[:, self._metric_positions[name]]
+        raise KeyError(f"Unknown history column: {name}")
+
+    def rolling(self, name: str, window: int, reducer=np.nanmean) -> np.ndarray:
+        column = self.column(name)
+        result = np.full(len(column), np.nan)
+        if window <= 0 or len(column) < window:
+            return result
+        windows = sliding_window_view(column, window)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            result[window - 1:] = reducer(windows, axis=1)
+        return result
+
+    def score_trend(self, window: int = 5, field: str = "total_score") -> Dict[str, Any]:
+        scores = self.column(field)
+        valid = ~np.isnan(scores)
+        slope_per_day = None
+        if valid.sum() >= 2:
+            elapsed_days = (self.dates[valid] - self.dates[valid][0]).astype(np.float64)
+            slope_per_day = float(np.polyfit(elapsed_days, scores[valid], 1)[0])
+        return {
+            "dates": [str(day) for day in self.dates],
+            "scores": scores.tolist(),
+            "rollingMean": self.rolling(field, window).tolist(),
+            "slopePerDay": slope_per_day,
+            "change": float(scores[valid][-1] - scores[valid][0]) if valid.sum() >= 2 else None
+        }
+
+    def pe_percentiles(self, window: Optional[int] = None, percentiles: Sequence[float] = (10, 25, 50, 75, 90)) -> Dict[str, Any]:
+        pe_ratio = self.column("pe_ratio")
+        pe_ratio = np.where(pe_ratio > 0, pe_ratio, np.nan)
+        if window is None:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                levels = np.nanpercentile(pe_ratio, percentiles) if np.any(~np.isnan(pe_ratio)) else np.full(len(percentiles), np.nan)
+            return {f"p{percentile:g}": float(level) for percentile, level in zip(percentiles, levels)}
+
+        rolling = {f"p{percentile:g}": np.full(len(pe_ratio), np.nan) for percentile in percentiles}
+        if len(pe_ratio) >= window:
+            windows = sliding_window_view(pe_ratio, window)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                levels = np.nanpercentile(windows, percentiles, axis=1)
+            for percentile, level in zip(percentiles, levels):
+                rolling[f"p{percentile:g}"][window - 1:] = level
+        return {name: values.tolist() for name, values in rolling.items()}
+
+    def percentile_rank(self, name: str, value: Optional[float] = None) -> Optional[float]:
+        column = self.column(name)
+        column = column[~np.isnan(column)]
+        if column.size == 0:
+            return None
+        value = column[-1] if value is None else value
+        return float((column <= value).mean() * 100)
+
+    def to_frame(self):
+        import pandas as pd
+        frame = pd.DataFrame(self.values, index=pd.DatetimeIndex(self.dates, name="trade_date"), columns=self.key_metrics)
+        for name, column in self.metadata_columns.items():
+            frame[name] = column
+        return frame
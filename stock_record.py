@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from typing import Dict, Any, Optional, Iterable, Iterator, List
+
+from lazy_imports import lazy_module
+
+np = lazy_module("numpy")
+
+# ========================================
+# STOCK ROW FIELDS
+# ========================================
+
+STRING_FIELDS = ("security", "trade_date", "sector", "industry", "document")
+NUMERIC_FIELDS = (
+    "open_price", "close_price", "market_cap", "pe_ratio", "pb_ratio", "book_value", "dvd_yield",
+    "total_score", "fundamental_score", "technical_score", "quant_score", "rank",
+    "sector_mkt_pe", "sector_mkt_pbv", "similarity_score"
+)
+STOCK_RECORD_FIELDS = STRING_FIELDS + NUMERIC_FIELDS
+
+STRING_DEFAULTS = {"sector": "Unknown", "industry": "Unknown", "document": ""}
+
+# ========================================
+# SINGLE ROW
+# ========================================
+
+class StockRecord:
+    __slots__ = STOCK_RECORD_FIELDS
+
+    def __init__(self, **fields: Any):
+        for name in STOCK_RECORD_FIELDS:
+            setattr(self, name, fields.get(name, STRING_DEFAULTS.get(name)))
+
+    @classmethod
+    def from_metadata(cls, metadata: Dict[str, Any], similarity_score: Optional[float] = None) -> "StockRecord":
+        record = cls.__new__(cls)
+        for name in STOCK_RECORD_FIELDS:
+            setattr(record, name, metadata.get(name, STRING_DEFAULTS.get(name)))
+        if similarity_score is not None:
+            record.similarity_score = float(similarity_score)
+        return record
+
+    # Mapping-style access keeps callers written against the old row dicts working
+    def __getitem__(self, key: str) -> Any:
+        if key not in STOCK_RECORD_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in STOCK_RECORD_FIELDS and getattr(self, key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in STOCK_RECORD_FIELDS else None
+        return default if value is None else value
+
+    def keys(self) -> List[str]:
+        return [name for name in STOCK_RECORD_FIELDS if getattr(self, name) is not None]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in STOCK_RECORD_FIELDS if getattr(self, name) is not None}
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, StockRecord) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"StockRecord({self.security!r}, {self.trade_date!r})"
+
+# ========================================
+# COLUMNAR BATCH
+# ========================================
+
+class StockRecordBatch:
+    def __init__(self, columns: Dict[str, Any]):
+        self.columns = columns
+        self._length = len(columns["security"])
+
+    @classmethod
+    def from_metadata(cls, metadata_rows: Iterable[Dict[str, Any]]) -> "StockRecordBatch":
+        metadata_rows = list(metadata_rows)
+        columns: Dict[str, Any] = {
+            name: [metadata.get(name, STRING_DEFAULTS.get(name)) for metadata in metadata_rows]
+            for name in STRING_FIELDS
+        }
+        for name in NUMERIC_FIELDS:
+            columns[name] = np.array(
+                [metadata.get(name) for metadata in metadata_rows], dtype=np.float64
+            ) if metadata_rows else np.empty(0, dtype=np.float64)
+        return cls(columns)
+
+    @classmethod
+    def from_records(cls, records: Iterable[StockRecord]) -> "StockRecordBatch":
+        records = list(records)
+        columns: Dict[str, Any] = {name: [getattr(record, name) for record in records] for name in STRING_FIELDS}
+        for name in NUMERIC_FIELDS:
+            columns[name] = np.array(
+                [getattr(record, name) for record in records], dtype=np.float64
+            ) if records else np.empty(0, dtype=np.float64)
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[StockRecord]:
+        return (self.record(row) for row in range(self._length))
+
+    def column(self, name: str) -> Any:
+        return self.columns[name]
+
+    def record(self, row: int) -> StockRecord:
+        record = StockRecord.__new__(StockRecord)
+        for name in STRING_FIELDS:
+            setattr(record, name, self.columns[name][row])
+        for name in NUMERIC_FIELDS:
+            value = self.columns[name][row]
+            setattr(record, name, None if np.isnan(value) else float(value))
+        return record
+
+    def financial_columns(self) -> Dict[str, np.ndarray]:
+        return derive_financial_columns(self.columns["pe_ratio"], self.columns["close_price"], self.columns["fundamental_score"])
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [record.to_dict() for record in self]
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.columns)
+
+# ========================================
+# DERIVED FINANCIAL METRICS
+# ========================================
+
+def derive_financial_columns(pe_ratio: Any, close_price: Any, fundamental_score: Any) -> Dict[str, np.ndarray]:
+    # Column form of FinancialDataService's per-ticker estimates; NaN where the scalar path returns None
+    pe_ratio = np.asarray(pe_ratio, dtype=np.float64)
+    close_price = np.asarray(close_price, dtype=np.float64)
+    fundamental_score = np.asarray(fundamental_score, dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        positive_pe = np.where(pe_ratio > 0, pe_ratio, np.nan)
+        eps = close_price / positive_pe
+        return {
+            "peRatio": positive_pe,
+            "roe": np.where(fundamental_score > 0, np.clip(fundamental_score / 100 * 25, 0, 50), np.nan),
+            "evToEbitda": np.clip(positive_pe * 0.7, 0, 100),
+            "eps": np.where(eps > 0, eps, np.nan),
+        }
@@ -0,0 +1,317 @@
+import re
+from typing import Dict, Any, Optional, Iterable, Iterator, List, Tuple
+
+# ========================================
+# SYMBOL TABLE CONFIGURATION
+# ========================================
+
+# Company names and nicknames for securities whose index metadata carries no company_name
+DEFAULT_ALIASES = {
+    "AAPL": ("apple",),
+    "MSFT": ("microsoft",),
+    "GOOGL": ("google", "alphabet"),
+    "AMZN": ("amazon",),
+    "TSLA": ("tesla",),
+    "META": ("meta", "facebook"),
+    "NFLX": ("netflix",),
+    "NVDA": ("nvidia",),
+    "JPM": ("jpmorgan", "jp morgan"),
+    "WMT": ("walmart",),
+    "SSNLF": ("samsung",),
+    "TM": ("toyota",),
+    "KBANK": ("kasikorn", "kasikornbank", "kasikorn bank"),
+    "PTT": ("ptt",),
+    "TRUE": ("true corporation",),
+    "CP": ("charoen pokphand",),
+    "CPALL": ("cp all",),
+}
+
+# Trailing words dropped from company names so "Apple Inc." and "apple" share one key
+CORPORATE_SUFFIXES = frozenset((
+    "inc", "corp", "corporation", "co", "company", "ltd", "limited", "plc", "pcl", "public", "holdings", "group"
+))
+
+# Ordinary words that are also tickers; they only resolve as symbols when typed in capitals
+COMMON_WORDS = frozenset((
+    "a", "about", "all", "an", "analysis", "analyze", "and", "any", "apply", "are", "at", "be", "best", "beta",
+    "buy", "by", "can", "company", "compare", "cp", "do", "for", "from", "get", "give", "go", "good", "has",
+    "have", "how", "i", "if", "in", "is", "it", "market", "me", "my", "new", "now", "of", "on", "one", "or",
+    "out", "please", "price", "rank", "report", "risk", "see", "sell", "share", "shares", "so", "stock",
+    "stocks", "tell", "that", "the", "think", "this", "to", "top", "true", "up", "us", "was", "what", "when",
+    "which", "who", "why", "will", "with", "you"
+))
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9&]+")
+
+def normalize_name(text: str) -> str:
+    words = [word.lower() for word in TOKEN_PATTERN.findall(text)]
+    while len(words) > 1 and words[-1] in CORPORATE_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+# Keys of 8+ characters index two deletions and shorter keys one, which covers every default fuzzy_budget
+MAX_FUZZY_DISTANCE = 2
+
+def typed_tickers(text: str) -> List[str]:
+    # Tokens written in capitals ("KBANK", "PTT") are deliberate tickers even when the table does not know them
+    return [token for token in TOKEN_PATTERN.findall(text) if 2 <= len(token) <= 6 and token.isupper() and token.isalpha()]
+
+def fuzzy_budget(key: str) -> int:
+    # Short keys get no slack: one edit turns most 3-4 letter words into some other ticker
+    if len(key) < 5:
+        return 0
+    return 1 if len(key) < 8 else 2
+
+# ========================================
+# MATCH RESULT
+# ========================================
+
+class SymbolMatch:
+    KIND_EXACT = "exact"
+    KIND_FUZZY = "fuzzy"
+
+    __slots__ = ("security", "matched", "kind", "distance")
+
+    def __init__(self, security: str, matched: str, kind: str, distance: int = 0):
+        self.security = security
+        self.matched = matched
+        self.kind = kind
+        self.distance = distance
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"security": self.security, "matched": self.matched, "kind": self.kind, "distance": self.distance}
+
+    def __repr__(self) -> str:
+        return f"SymbolMatch({self.security!r}, {self.matched!r}, {self.kind!r}, distance={self.distance})"
+
+# ========================================
+# PREFIX TRIE
+# ========================================
+
+class _TrieNode:
+    __slots__ = ("children", "key", "securities")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.key: Optional[str] = None
+        self.securities: Optional[set] = None
+
+class SymbolTrie:
+    def __init__(self):
+        self.root = _TrieNode()
+
+    def insert(self, key: str, security: str) -> None:
+        node = self.root
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+        node.key = key
+        if node.securities is None:
+            node.securities = set()
+        node.securities.add(security)
+
+    def _walk(self, node: _TrieNode) -> Iterator[_TrieNode]:
+        if node.securities:
+            yield node
+        for char in sorted(node.children):
+            yield from self._walk(node.children[char])
+
+    def with_prefix(self, prefix: str) -> List[Tuple[str, set]]:
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [(terminal.key, terminal.securities) for terminal in self._walk(node)]
+
+# ========================================
+# BOUNDED EDIT DISTANCE
+# ========================================
+
+def edit_distance(left: str, right: str, max_distance: int) -> int:
+    # Optimal string alignment: Levenshtein plus adjacent swaps ("appel"), the most common typo in typed names.
+    # Only the band of cells within max_distance of the diagonal can stay under the bound, so only it is filled
+    if abs(len(left) - len(right)) > max_distance:
+        return max_distance + 1
+    over = max_distance + 1
+    row_before: Optional[List[int]] = None
+    previous_row = [column if column <= max_distance else over for column in range(len(right) + 1)]
+    for row_index in range(1, len(left) + 1):
+        row = [over] * (len(right) + 1)
+        if row_index <= max_distance:
+            row[0] = row_index
+        low = max(1, row_index - max_distance)
+        high = min(len(right), row_index + max_distance)
+        left_char = left[row_index - 1]
+        left_before = left[row_index - 2] if row_index > 1 else ""
+        # Plain comparisons instead of min(): this loop is the whole cost of a fuzzy lookup
+        for column in range(low, high + 1):
+            right_char = right[column - 1]
+            cost = previous_row[column - 1] + (left_char != right_char)
+            if row[column - 1] + 1 < cost:
+                cost = row[column - 1] + 1
+            if previous_row[column] + 1 < cost:
+                cost = previous_row[column] + 1
+            if (row_before is not None and column > 1 and left_char == right[column - 2]
+                    and left_before == right_char and row_before[column - 2] + 1 < cost):
+                cost = row_before[column - 2] + 1
+            row[column] = cost if cost < over else over
+        if min(row[low - 1:high + 1]) > max_distance:
+            return over
+        row_before, previous_row = previous_row, row
+    return previous_row[-1]
+
+def deletion_variants(key: str, depth: int) -> set:
+    variants = {key}
+    frontier = {key}
+    for _ in range(depth):
+        frontier = {word[:position] + word[position + 1:] for word in frontier if len(word) > 1 for position in range(len(word))}
+        variants |= frontier
+    return variants
+
+# ========================================
+# SYMBOL TABLE
+# ========================================
+
+class SymbolTable:
+    def __init__(self):
+        self.securities: set = set()
+        self.names: Dict[str, str] = {}
+        self._keys: Dict[str, str] = {}
+        self._trie = SymbolTrie()
+        self._key_securities: Dict[str, set] = {}
+        self._deletions: Dict[str, List[str]] = {}
+        self._max_key_words = 1
+
+    @classmethod
+    def from_securities(
+        cls,
+        securities: Iterable[str],
+        names: Optional[Dict[str, str]] = None,
+        aliases: Optional[Dict[str, Iterable[str]]] = None
+    ) -> "SymbolTable":
+        table = cls()
+        names = names or {}
+        for security in securities:
+            table.add(security, names.get(security))
+        table.add_aliases(DEFAULT_ALIASES if aliases is None else aliases, known_only=True)
+        return table
+
+    @classmethod
+    def from_metadata(cls, metadata_rows: Iterable[Dict[str, Any]], aliases: Optional[Dict[str, Iterable[str]]] = None) -> "SymbolTable":
+        table = cls()
+        for metadata in metadata_rows:
+            table.add(metadata["security"], metadata.get("company_name"))
+        table.add_aliases(DEFAULT_ALIASES if aliases is None else aliases, known_only=True)
+        return table
+
+    @classmethod
+    def from_vector_db(cls, stock_db: Any, trade_date: Optional[str] = None, aliases: Optional[Dict[str, Iterable[str]]] = None) -> "SymbolTable":
+        # One trade date's metadata carries company names; without one, the ID listing gives securities only
+        if trade_date:
+            return cls.from_metadata(stock_db.scan_metadata(trade_date), aliases)
+        return cls.from_securities(stock_db.known_securities(), aliases=aliases)
+
+    def add(self, security: str, name: Optional[str] = None, aliases: Iterable[str] = ()) -> None:
+        security = security.upper().strip()
+        if not security:
+            return
+        self.securities.add(security)
+        self._add_key(normalize_name(security), security)
+        if name:
+            self.names.setdefault(security, name)
+            self._add_key(normalize_name(name), security)
+        for alias in aliases:
+            self._add_key(normalize_name(alias), security)
+
+    def add_aliases(self, aliases: Dict[str, Iterable[str]], known_only: bool = False) -> None:
+        # known_only keeps aliases from inventing securities the index does not hold
+        for security, security_aliases in aliases.items():
+            if known_only and security.upper() not in self.securities:
+                continue
+            self.add(security, aliases=security_aliases)
+
+    def _add_key(self, key: str, security: str) -> None:
+        if not key:
+            return
+        # The first security to claim a key keeps it, except that a ticker always reclaims its own symbol
+        if key not in self._keys or normalize_name(security) == key:
+            self._keys[key] = security
+        securities = self._key_securities.get(key)
+        if securities is None:
+            securities = self._key_securities[key] = set()
+            for variant in deletion_variants(key, MAX_FUZZY_DISTANCE if len(key) >= 8 else 1):
+                self._deletions.setdefault(variant, []).append(key)
+        securities.add(security)
+        self._trie.insert(key, security)
+        self._max_key_words = max(self._max_key_words, key.count(" ") + 1)
+
+    def __contains__(self, security: str) -> bool:
+        return security.upper() in self.securities
+
+    def __len__(self) -> int:
+        return len(self.securities)
+
+    def lookup(self, text: str) -> Optional[str]:
+        return self._keys.get(normalize_name(text))
+
+    def prefix(self, text: str, limit: int = 10) -> List[str]:
+        matches: List[str] = []
+        for _, securities in sorted(self._trie.with_prefix(normalize_name(text)), key=lambda entry: (len(entry[0]), entry[0])):
+            for security in sorted(securities):
+                if security not in matches:
+                    matches.append(security)
+                    if len(matches) >= limit:
+                        return matches
+        return matches
+
+    def fuzzy(self, text: str, max_distance: Optional[int] = None) -> Optional[SymbolMatch]:
+        key = normalize_name(text)
+        budget = min(fuzzy_budget(key) if max_distance is None else max_distance, MAX_FUZZY_DISTANCE)
+        if not key or budget <= 0:
+            return None
+        # Symmetric deletion: two strings within distance d share a variant with at most d characters deleted
+        distances: Dict[str, int] = {}
+        for variant in deletion_variants(key, budget):
+            for candidate in self._deletions.get(variant, ()):
+                if candidate not in distances:
+                    distances[candidate] = edit_distance(key, candidate, budget)
+        candidates = sorted((distance, candidate) for candidate, distance in distances.items() if distance <= budget)
+        if not candidates:
+            return None
+        best_distance, best_key = candidates[0]
+        best = {
+            security for distance, candidate in candidates if distance == best_distance
+            for security in self._key_securities[candidate]
+        }
+        # Two different securities equally close is a guess, not a resolution
+        if len(best) != 1:
+            return None
+        return SymbolMatch(best.pop(), best_key, SymbolMatch.KIND_FUZZY, best_distance)
+
+    def resolve(self, text: str) -> Optional[SymbolMatch]:
+        key = normalize_name(text)
+        security = self._keys.get(key)
+        if security is not None:
+            return SymbolMatch(security, key, SymbolMatch.KIND_EXACT)
+        return self.fuzzy(text)
+
+    def extract(self, text: str) -> Optional[SymbolMatch]:
+        # Longest exact phrase first ("kasikorn bank" before "kasikorn"), then single-word typos
+        tokens = TOKEN_PATTERN.findall(text)
+        lowered = [token.lower() for token in tokens]
+        for size in range(min(self._max_key_words, len(tokens)), 0, -1):
+            for start in range(len(tokens) - size + 1):
+                key = normalize_name(" ".join(lowered[start:start + size]))
+                security = self._keys.get(key)
+                if security is None:
+                    continue
+                if size == 1 and key in COMMON_WORDS and not tokens[start].isupper():
+                    continue
+                return SymbolMatch(security, key, SymbolMatch.KIND_EXACT)
+        for token in lowered:
+            if token in COMMON_WORDS:
+                continue
+            match = self.fuzzy(token)
+            if match is not None:
+                return match
+        return None
@@ -0,0 +1,121 @@
+import os
+import sys
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lambda_function import FinancialDataService, StockVectorDatabase
+from screening import Range
+from stage_metrics import stage_metrics
+from vector_store import NumpyBackend
+
+# Old enough that the recent-days probe misses and the newest row comes from the ID listing
+HISTORICAL_LATEST = date(2026, 7, 10)
+SECURITIES = ("PTT", "PTTEP", "AOT", "KBANK", "SCB", "CPALL", "ADVANC", "BDMS", "GULF", "TRUE")
+
+def build_backend(latest: date, days: dict, lag: dict = None, newest_scores: dict = None) -> NumpyBackend:
+    rng = np.random.default_rng(7)
+    ids, metadata = [], []
+    for security, day_count in days.items():
+        first_offset = (lag or {}).get(security, 0)
+        for offset in range(first_offset, first_offset + day_count):
+            trade_date = latest - timedelta(days=offset)
+            ids.append(f"{security}_{trade_date:%Y%m%d}")
+            metadata.append({
+                "security": security,
+                "trade_date": trade_date.isoformat(),
+                "sector": "ENERG",
+                "close_price": 30.0 + offset,
+                "market_cap": 1e10,
+                "pe_ratio": 12.0,
+                "total_score": (newest_scores or {}).get(security, 60.0) if offset == first_offset else 60.0,
+                "fundamental_score": 55.0,
+                "rank": float(offset)
+            })
+    vectors = rng.random((len(ids), len(StockVectorDatabase.KEY_METRICS))).astype(np.float32)
+    return NumpyBackend(ids, vectors, metadata)
+
+@pytest.fixture(params=["recent", "historical"])
+def latest(request) -> date:
+    return date.today() if request.param == "recent" else HISTORICAL_LATEST
+
+def test_single_security_gets_newest_trade_date(latest):
+    stock_db = StockVectorDatabase(backend=build_backend(latest, {security: 30 for security in SECURITIES}))
+    rows = stock_db.fetch_latest_by_securities(["ptt"])
+    assert list(rows) == ["PTT"]
+    assert rows["PTT"].trade_date == latest.isoformat()
+
+def test_batch_is_not_crowded_out_by_longer_histories(latest):
+    days = {security: 30 for security in SECURITIES}
+    days["PTT"] = 400
+    stock_db = StockVectorDatabase(backend=build_backend(latest, days))
+    rows = stock_db.fetch_latest_by_securities(list(SECURITIES) + ["UNKNOWN"])
+    assert sorted(rows) == sorted(SECURITIES)
+    assert {row.trade_date for row in rows.values()} == {latest.isoformat()}
+
+def test_security_whose_name_prefixes_another(latest):
+    # "PTT_R_<date>" IDs share the "PTT_" prefix and sort after "PTT_<date>"
+    stock_db = StockVectorDatabase(backend=build_backend(latest, {"PTT": 10, "PTT_R": 20}, lag={"PTT": 3}))
+    rows = stock_db.fetch_latest_by_securities(["PTT", "PTT_R"])
+    assert rows["PTT"].security == "PTT"
+    assert rows["PTT"].trade_date == (latest - timedelta(days=3)).isoformat()
+    assert rows["PTT_R"].trade_date == latest.isoformat()
+
+def test_analyze_stock_reports_newest_trade_date(latest, tmp_path, monkeypatch):
+    build_backend(latest, {security: 30 for security in SECURITIES}).save(str(tmp_path))
+    monkeypatch.setenv("VECTOR_BACKEND", "local")
+    monkeypatch.setenv("LOCAL_VECTOR_STORE_PATH", str(tmp_path))
+    service = FinancialDataService(use_caching=False)
+    result = service.analyze_stock("PTT", include_report=False)
+    assert result["success"]
+    assert result["data"]["tradeDate"] == latest.isoformat()
+    batch = service.analyze_stocks(list(SECURITIES), include_report=False)
+    assert sorted(batch["results"]) == sorted(SECURITIES)
+    assert {result["data"]["tradeDate"] for result in batch["results"].values()} == {latest.isoformat()}
+
+def test_only_confirmed_misses_are_negatively_cached(tmp_path, monkeypatch):
+    build_backend(HISTORICAL_LATEST, {security: 30 for security in SECURITIES}).save(str(tmp_path))
+    monkeypatch.setenv("VECTOR_BACKEND", "local")
+    monkeypatch.setenv("LOCAL_VECTOR_STORE_PATH", str(tmp_path))
+    service = FinancialDataService(use_caching=False)
+    # A fetch that comes back short (stale mirror, partial response) must not mark real tickers as unknown
+    monkeypatch.setattr(service.stock_db, "fetch_latest_by_securities", lambda securities: {})
+    assert not service.analyze_stock("PTT", include_report=False)["success"]
+    batch = service.analyze_stocks(["AOT", "UNKNOWN"], include_report=False)
+    assert sorted(batch["failed"]) == ["AOT", "UNKNOWN"]
+    assert not service.negative_cache.is_known_missing("PTT")
+    assert not service.negative_cache.is_known_missing("AOT")
+    assert service.negative_cache.is_known_missing("UNKNOWN")
+
+def test_screen_judges_each_security_on_its_newest_row(latest):
+    # PTT passes the screen on every older day, but its newest row does not
+    stock_db = StockVectorDatabase(backend=build_backend(latest, {security: 30 for security in SECURITIES}, newest_scores={"PTT": 40.0}))
+    rows = stock_db.search_by_criteria(Range("total_score", 50), top_k=100)
+    assert sorted(row.security for row in rows) == sorted(set(SECURITIES) - {"PTT"})
+    assert {row.trade_date for row in rows} == {latest.isoformat()}
+    assert stock_db.screen_page(Range("total_score", 50), page_size=5).total == len(SECURITIES) - 1
+
+def test_screen_streams_one_newest_row_per_security(latest):
+    stock_db = StockVectorDatabase(backend=build_backend(latest, {security: 30 for security in SECURITIES}, newest_scores={"PTT": 40.0}))
+    for order_by in (None, "-total_score"):
+        rows = list(stock_db.screen(order_by=order_by))
+        assert sorted(row.security for row in rows) == sorted(SECURITIES)
+        assert {row.trade_date for row in rows} == {latest.isoformat()}
+        rows = list(stock_db.screen(Range("total_score", 50), order_by=order_by, limit=100))
+        assert sorted(row.security for row in rows) == sorted(set(SECURITIES) - {"PTT"})
+
+@pytest.mark.parametrize("lazy_reports", [True, False])
+def test_report_rendering_has_its_own_span(lazy_reports, tmp_path, monkeypatch):
+    build_backend(HISTORICAL_LATEST, {security: 5 for security in SECURITIES}).save(str(tmp_path))
+    monkeypatch.setenv("VECTOR_BACKEND", "local")
+    monkeypatch.setenv("LOCAL_VECTOR_STORE_PATH", str(tmp_path))
+    service = FinancialDataService(use_caching=False, lazy_reports=lazy_reports)
+    stage_metrics.reset()
+    result = service.analyze_stock("PTT")
+    str(result["data"]["rationale"]), str(result["data"]["userFriendlyReport"])
+    # Eager reports render inside the analyze_stock trace; lazy ones when first read, after it has closed
+    expected_stage = "report_render" if lazy_reports else "analyze_stock.report_render"
+    assert stage_metrics.get_metrics()[expected_stage]["count"] == (2 if lazy_reports else 1)
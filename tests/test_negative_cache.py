@@ -0,0 +1,38 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from negative_cache import NegativeTickerCache
+
+class LiveIndex:
+    def __init__(self, securities):
+        self.securities = set(securities)
+        self.checks = []
+
+    def missing_securities(self, tickers):
+        self.checks.extend(tickers)
+        return [ticker for ticker in tickers if ticker not in self.securities]
+
+def test_bloom_rejections_are_confirmed_against_the_live_index():
+    # NEWCO was listed after the filter was built from the mirror
+    listed = [f"SEC{position:04d}" for position in range(1000)] + ["PTT"]
+    live = LiveIndex(listed + ["NEWCO"])
+    cache = NegativeTickerCache(confirm_missing=live.missing_securities)
+    cache.load_known_securities(listed)
+
+    assert not cache.is_known_missing("NEWCO")
+    assert not cache.is_known_missing("NEWCO")
+    assert cache.is_known_missing("BOGUS")
+    assert cache.is_known_missing("BOGUS")
+    assert not cache.is_known_missing("PTT")
+    # One live check per rejected ticker: NEWCO joins the filter and BOGUS the remembered misses
+    assert live.checks == ["NEWCO", "BOGUS"]
+
+def test_unconfirmed_rejection_falls_through_to_a_lookup():
+    def unavailable(tickers):
+        raise ConnectionError("index unavailable")
+
+    cache = NegativeTickerCache(confirm_missing=unavailable)
+    cache.load_known_securities(["PTT"])
+    assert not cache.is_known_missing("NEWCO")
@@ -0,0 +1,655 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional, List, Iterator
+
+from lazy_imports import lazy_module
+
+np = lazy_module("numpy")
+
+# ========================================
+# BACKEND CONFIGURATION
+# ========================================
+
+class VectorBackendSettings:
+    BACKEND_ENV = "VECTOR_BACKEND"
+    LOCAL_PATH_ENV = "LOCAL_VECTOR_STORE_PATH"
+
+    BACKEND_PINECONE = "pinecone"
+    BACKEND_LOCAL = "local"
+
+    LOCAL_PATH = "vector_store"
+    VECTORS_FILE = "vectors.npy"
+    METADATA_JSON_FILE = "metadata.json"
+    METADATA_PARQUET_FILE = "metadata.parquet"
+    ID_FIELD = "_id"
+
+    # Pinecone caps top_k at 1000 when metadata is returned
+    SCAN_QUERY_TOP_K = 1000
+    # Written on every row at ingest, so range partitions on them never drop a row missing the field
+    SCAN_SPLIT_FIELDS = ("rank", "close_price", "market_cap", "total_score", "pe_ratio")
+
+# ========================================
+# PINECONE-COMPATIBLE RESPONSE TYPES
+# ========================================
+
+class VectorMatch:
+    __slots__ = ("id", "score", "values", "metadata")
+
+    def __init__(self, id: str, score: float, values: Optional[List[float]], metadata: Optional[Dict[str, Any]]):
+        self.id = id
+        self.score = score
+        self.values = values
+        self.metadata = metadata
+
+class QueryResponse:
+    def __init__(self, matches: List[VectorMatch]):
+        self.matches = matches
+
+class FetchResponse:
+    def __init__(self, vectors: Dict[str, VectorMatch]):
+        self.vectors = vectors
+
+class IndexStats:
+    def __init__(self, total_vector_count: int, dimension: int):
+        self.total_vector_count = total_vector_count
+        self.dimension = dimension
+        self.index_fullness = 0.0
+        self.namespaces = {"": {"vector_count": total_vector_count}}
+
+# ========================================
+# METADATA FILTER EVALUATION
+# ========================================
+
+SUPPORTED_FILTER_OPERATORS = ("$eq", "$ne", "$gt", "$gte", "$lt", "$lte", "$in", "$nin")
+
+def _compare(value: Any, operator: str, operand: Any) -> bool:
+    if operator not in SUPPORTED_FILTER_OPERATORS:
+        raise ValueError(f"Unsupported filter operator: {operator}")
+    if operator == "$eq":
+        return value == operand
+    if operator == "$ne":
+        return value != operand
+    if operator == "$in":
+        return value in operand
+    if operator == "$nin":
+        return value not in operand
+    if value is None:
+        return False
+    try:
+        if operator == "$gt":
+            return value > operand
+        if operator == "$gte":
+            return value >= operand
+        if operator == "$lt":
+            return value < operand
+        return value <= operand
+    except TypeError:
+        return False
+
+def matches_filter(metadata: Dict[str, Any], filter_dict: Optional[Dict[str, Any]]) -> bool:
+    if not filter_dict:
+        return True
+    for field, condition in filter_dict.items():
+        if field == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif field == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+        else:
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            value = metadata.get(field)
+            for operator, operand in condition.items():
+                if not _compare(value, operator, operand):
+                    return False
+    return True
+
+def id_prefix_for_filter(filter_dict: Optional[Dict[str, Any]]) -> Optional[str]:
+    # Vector IDs are {security}_{YYYYMMDD}, so an exact security match can be listed by prefix
+    condition = (filter_dict or {}).get("security")
+    if isinstance(condition, dict):
+        condition = condition.get("$eq") if set(condition) == {"$eq"} else None
+    return f"{condition}_" if isinstance(condition, str) else None
+
+# ========================================
+# BACKEND INTERFACE
+# ========================================
+
+class VectorStoreBackend(ABC):
+    name = ""
+
+    @abstractmethod
+    def query(self, vector: Optional[List[float]] = None, id: Optional[str] = None, top_k: int = 10,
+              filter: Optional[Dict[str, Any]] = None, include_metadata: bool = False,
+              include_values: bool = False, **kwargs) -> Any:
+        ...
+
+    @abstractmethod
+    def fetch(self, ids: List[str], **kwargs) -> Any:
+        ...
+
+    @abstractmethod
+    def describe_index_stats(self, **kwargs) -> Any:
+        ...
+
+    def list(self, prefix: Optional[str] = None, limit: int = 100, **kwargs) -> Iterator[List[str]]:
+        raise NotImplementedError(f"{type(self).__name__} does not support listing vector IDs")
+
+    def upsert(self, vectors: List[Dict[str, Any]], **kwargs) -> Any:
+        raise NotImplementedError(f"{type(self).__name__} does not support upserts")
+
+    def scan(self, filter: Optional[Dict[str, Any]] = None, page_size: int = 100) -> Iterator[List[VectorMatch]]:
+        # Metadata-only traversal: list IDs (narrowed by the ID prefix when the filter pins a security), fetch, filter
+        for id_page in self.list(prefix=id_prefix_for_filter(filter), limit=page_size):
+            fetch_response = self.fetch(ids=list(id_page))
+            page = [
+                VectorMatch(vector_id, 0.0, None, dict(vector.metadata or {}))
+                for vector_id, vector in fetch_response.vectors.items()
+                if matches_filter(vector.metadata or {}, filter)
+            ]
+            if page:
+                yield page
+
+    def __bool__(self) -> bool:
+        return True
+
+class PineconeBackend(VectorStoreBackend):
+    name = VectorBackendSettings.BACKEND_PINECONE
+
+    def __init__(self, api_key: Optional[str] = None, index_name: str = "stock-analysis"):
+        api_key = api_key or os.getenv("PINECONE_API_KEY")
+        if not api_key:
+            raise ValueError("Pinecone API key is required. Set PINECONE_API_KEY environment variable or pass it as parameter.")
+        
+        self.logger = logging.getLogger("StockVectorDB")
+        self.api_key = api_key
+        self.index_name = index_name
+        self._client = None
+        self._index = None
+        self._dimension = None
+        self._connect_lock = threading.Lock()
+
+    # The client and index handle are built on first use, keeping the SDK import and list_indexes call off cold start
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            with self._connect_lock:
+                if self._client is None:
+                    from pinecone import Pinecone
+                    self._client = Pinecone(api_key=self.api_key)
+        return self._client
+
+    @property
+    def index(self) -> Any:
+        if self._index is None:
+            client = self.client
+            with self._connect_lock:
+                if self._index is None:
+                    self._index = self._connect_index(client)
+        return self._index
+
+    def _connect_index(self, client: Any) -> Any:
+        if self.index_name in client.list_indexes().names():
+            self.logger.info(f"Index '{self.index_name}' already exists")
+            return client.Index(self.index_name)
+        raise Exception(f"Pinecone index '{self.index_name}' does not exist. Please create and upload data first.")
+
+    def query(self, vector=None, id=None, top_k=10, filter=None, include_metadata=False, include_values=False, **kwargs):
+        query_kwargs = {"id": id} if id is not None else {"vector": vector}
+        return self.index.query(
+            **query_kwargs,
+            top_k=top_k,
+            filter=filter,
+            include_metadata=include_metadata,
+            include_values=include_values,
+            **kwargs
+        )
+
+    def fetch(self, ids, **kwargs):
+        return self.index.fetch(ids=ids, **kwargs)
+
+    def describe_index_stats(self, **kwargs):
+        return self.index.describe_index_stats(**kwargs)
+
+    def list(self, prefix=None, limit=100, **kwargs):
+        if prefix:
+            kwargs["prefix"] = prefix
+        return self.index.list(limit=limit, **kwargs)
+
+    def upsert(self, vectors, **kwargs):
+        return self.index.upsert(vectors=vectors, **kwargs)
+
+    def scan(self, filter=None, page_size=100):
+        if id_prefix_for_filter(filter):
+            # One security's IDs are a short listing, cheaper than any query partitioning
+            yield from super().scan(filter, page_size)
+            return
+        page = []
+        for match in self._scan_partition(filter, 0):
+            page.append(match)
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def _scan_partition(self, filter: Optional[Dict[str, Any]], split_position: int) -> Iterator[VectorMatch]:
+        # The filter runs server side; a full top_k means rows may be cut off, so the range is split and each half re-queried
+        top_k = VectorBackendSettings.SCAN_QUERY_TOP_K
+        matches = self.query(vector=self._scan_vector(), top_k=top_k, filter=filter, include_metadata=True).matches
+        if len(matches) < top_k:
+            for match in matches:
+                yield VectorMatch(match.id, 0.0, None, dict(match.metadata or {}))
+            return
+
+        for position in range(split_position, len(VectorBackendSettings.SCAN_SPLIT_FIELDS)):
+            field = VectorBackendSettings.SCAN_SPLIT_FIELDS[position]
+            pivot = _split_pivot([(match.metadata or {}).get(field) for match in matches])
+            if pivot is not None:
+                for condition in ({"$lt": pivot}, {"$gte": pivot}):
+                    yield from self._scan_partition(_and_filter(filter, {field: condition}), position)
+                return
+
+        # Every returned row shares the same split values, so only listing every ID can reach the rest
+        self.logger.warning(f"Scan partition {filter} could not be split; listing every vector ID instead")
+        for page in super().scan(filter, top_k):
+            yield from page
+
+    def _scan_vector(self) -> List[float]:
+        # Query order is irrelevant to a scan, but cosine indexes reject an all-zero vector
+        if self._dimension is None:
+            self._dimension = self.describe_index_stats().dimension
+        return [1.0] * self._dimension
+
+def _split_pivot(values: List[Any]) -> Optional[float]:
+    # The sample median, nudged up to the next distinct value so both halves hold at least one sampled row
+    numbers = sorted(value for value in values if isinstance(value, (int, float)))
+    if not numbers or numbers[0] == numbers[-1]:
+        return None
+    pivot = numbers[len(numbers) // 2]
+    if pivot == numbers[0]:
+        pivot = next(value for value in numbers if value > numbers[0])
+    return pivot
+
+def _and_filter(filter_dict: Optional[Dict[str, Any]], condition: Dict[str, Any]) -> Dict[str, Any]:
+    return {"$and": [filter_dict, condition]} if filter_dict else condition
+
+def ensure_pinecone_index(
+    api_key: Optional[str],
+    index_name: str,
+    dimension: int,
+    metric: str = "cosine",
+    cloud: str = "aws",
+    region: str = "us-east-1",
+    timeout_seconds: float = 300
+) -> None:
+    if not api_key:
+        raise ValueError("Pinecone API key is required. Set PINECONE_API_KEY environment variable or pass it as parameter.")
+    
+    from pinecone import Pinecone, ServerlessSpec
+    
+    logger = logging.getLogger("StockVectorDB")
+    client = Pinecone(api_key=api_key)
+    if index_name in client.list_indexes().names():
+        return
+    
+    logger.info(f"Creating Pinecone index '{index_name}' (dimension={dimension}, metric={metric})")
+    client.create_index(
+        name=index_name,
+        dimension=dimension,
+        metric=metric,
+        spec=ServerlessSpec(cloud=cloud, region=region)
+    )
+    deadline = time.monotonic() + timeout_seconds
+    while not client.describe_index(index_name).status["ready"]:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Pinecone index '{index_name}' was not ready after {timeout_seconds}s")
+        time.sleep(2)
+
+# ========================================
+# IN-MEMORY VECTOR INDEX
+# ========================================
+
+class LocalVectorIndex(VectorStoreBackend):
+    name = VectorBackendSettings.BACKEND_LOCAL
+
+    def __init__(self, ids: List[str], vectors: np.ndarray, metadata: List[Dict[str, Any]]):
+        self.ids = list(ids)
+        self.metadata = list(metadata)
+        self._set_vectors(vectors)
+
+    def _set_vectors(self, vectors: np.ndarray) -> None:
+        # Vectors may be a read-only memory map, so keep only the norms in RAM instead of a normalized copy
+        if not isinstance(vectors, np.ndarray) or vectors.dtype != np.float32:
+            vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.size == 0:
+            self.vectors = np.zeros((0, vectors.shape[-1] if vectors.ndim == 2 else 0), dtype=np.float32)
+        else:
+            self.vectors = vectors.reshape(len(self.ids), -1)
+        self.dimension = self.vectors.shape[1]
+        self._positions = {vector_id: position for position, vector_id in enumerate(self.ids)}
+        # Sorted copy for prefix listing: a security's IDs are one contiguous run found by bisection
+        self._sorted_ids = sorted(self.ids)
+        self._norms = np.linalg.norm(self.vectors, axis=1)
+
+    @classmethod
+    def from_pinecone(cls, index: Any, batch_size: int = 100) -> "LocalVectorIndex":
+        ids, vectors, metadata = [], [], []
+        for id_page in index.list():
+            for start in range(0, len(id_page), batch_size):
+                fetch_response = index.fetch(ids=list(id_page[start:start + batch_size]))
+                for vector_id, vector in fetch_response.vectors.items():
+                    ids.append(vector_id)
+                    vectors.append(vector.values)
+                    metadata.append(dict(vector.metadata or {}))
+        return cls(ids, np.asarray(vectors, dtype=np.float32), metadata)
+
+    @classmethod
+    def load(cls, path: str) -> "LocalVectorIndex":
+        if not os.path.exists(path) and os.path.exists(f"{path}.npz"):
+            # Snapshots written before save() kept the exact path got a ".npz" suffix from np.savez
+            path = f"{path}.npz"
+        with open(path, "rb") as snapshot_file, np.load(snapshot_file, allow_pickle=False) as snapshot:
+            return cls(
+                snapshot["ids"].tolist(),
+                snapshot["vectors"],
+                json.loads(str(snapshot["metadata"]))
+            )
+
+    def save(self, path: str) -> None:
+        # np.savez appends ".npz" to a bare path, so write through a handle to keep exactly the path load() opens
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as snapshot_file:
+            np.savez(
+                snapshot_file,
+                ids=np.asarray(self.ids, dtype=str),
+                vectors=self.vectors,
+                metadata=np.asarray(json.dumps(self.metadata, default=str))
+            )
+        os.replace(temp_path, path)
+
+    def query(
+        self,
+        vector: Optional[List[float]] = None,
+        id: Optional[str] = None,
+        top_k: int = 10,
+        filter: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = False,
+        include_values: bool = False,
+        **kwargs
+    ) -> QueryResponse:
+        if id is not None:
+            position = self._positions.get(id)
+            if position is None:
+                return QueryResponse([])
+            query_vector = np.asarray(self.vectors[position], dtype=np.float32)
+            norm = self._norms[position]
+            query_vector = query_vector / norm if norm > 0 else np.zeros(self.dimension, dtype=np.float32)
+        else:
+            query_vector = np.asarray(vector if vector is not None else [], dtype=np.float32)
+            norm = np.linalg.norm(query_vector)
+            query_vector = query_vector / norm if norm > 0 else np.zeros(self.dimension, dtype=np.float32)
+
+        candidates = self.filter_positions(filter)
+        if candidates.size == 0:
+            return QueryResponse([])
+
+        norms = self._norms[candidates]
+        scores = np.divide(self.vectors[candidates] @ query_vector, norms, out=np.zeros(candidates.size, dtype=np.float32), where=norms > 0)
+        if top_k < candidates.size:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            order = best[np.argsort(-scores[best], kind="stable")]
+        else:
+            order = np.argsort(-scores, kind="stable")
+
+        return QueryResponse([
+            self._match(int(candidates[rank]), float(scores[rank]), include_metadata, include_values)
+            for rank in order
+        ])
+
+    def fetch(self, ids: List[str], **kwargs) -> FetchResponse:
+        vectors = {}
+        for vector_id in ids:
+            position = self._positions.get(vector_id)
+            if position is not None:
+                vectors[vector_id] = self._match(position, 0.0, True, True)
+        return FetchResponse(vectors)
+
+    def list(self, prefix: Optional[str] = None, limit: int = 100, **kwargs) -> Iterator[List[str]]:
+        if prefix:
+            start = bisect.bisect_left(self._sorted_ids, prefix)
+            end = start
+            while end < len(self._sorted_ids) and self._sorted_ids[end].startswith(prefix):
+                end += 1
+            matching = self._sorted_ids[start:end]
+        else:
+            matching = self.ids
+        for start in range(0, len(matching), limit):
+            yield matching[start:start + limit]
+
+    def describe_index_stats(self, **kwargs) -> IndexStats:
+        return IndexStats(len(self.ids), self.dimension)
+
+    def scan(self, filter: Optional[Dict[str, Any]] = None, page_size: int = 100) -> Iterator[List[VectorMatch]]:
+        positions = self.filter_positions(filter)
+        for start in range(0, positions.size, page_size):
+            yield [self._match(int(position), 0.0, True, False) for position in positions[start:start + page_size]]
+
+    def filter_positions(self, filter_dict: Optional[Dict[str, Any]]) -> np.ndarray:
+        if not filter_dict:
+            return np.arange(len(self.ids))
+        return np.fromiter(
+            (position for position, metadata in enumerate(self.metadata) if matches_filter(metadata, filter_dict)),
+            dtype=np.int64
+        )
+
+    def _match(self, position: int, score: float, include_metadata: bool, include_values: bool) -> VectorMatch:
+        return VectorMatch(
+            self.ids[position],
+            score,
+            self.vectors[position].tolist() if include_values else None,
+            self.metadata[position] if include_metadata else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+# ========================================
+# PERSISTENT NUMPY BACKEND
+# ========================================
+
+class NumpyBackend(LocalVectorIndex):
+    def __init__(self, ids: List[str], vectors: np.ndarray, metadata: List[Dict[str, Any]], path: Optional[str] = None):
+        super().__init__(ids, vectors, metadata)
+        self.path = path
+        self._pending_upserts: Dict[str, Any] = {}
+        self._pending_lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: str, mmap: bool = True) -> "NumpyBackend":
+        vectors_path = os.path.join(path, VectorBackendSettings.VECTORS_FILE)
+        if not os.path.exists(vectors_path):
+            return cls([], np.zeros((0, 0), dtype=np.float32), [], path)
+        
+        vectors = np.load(vectors_path, mmap_mode="r" if mmap else None)
+        records = cls._read_metadata(path)
+        ids = [record.pop(VectorBackendSettings.ID_FIELD) for record in records]
+        return cls(ids, vectors, records, path)
+
+    @staticmethod
+    def _read_metadata(path: str) -> List[Dict[str, Any]]:
+        parquet_path = os.path.join(path, VectorBackendSettings.METADATA_PARQUET_FILE)
+        if os.path.exists(parquet_path):
+            import pandas as pd
+            frame = pd.read_parquet(parquet_path)
+            return [
+                {key: value for key, value in record.items() if value is not None and value == value}
+                for record in frame.astype(object).to_dict("records")
+            ]
+        with open(os.path.join(path, VectorBackendSettings.METADATA_JSON_FILE)) as metadata_file:
+            return json.load(metadata_file)
+
+    def save(self, path: Optional[str] = None, metadata_format: str = "json") -> None:
+        path = path or self.path
+        if not path:
+            raise ValueError("A directory is required to save the local vector store")
+        self.flush()
+        os.makedirs(path, exist_ok=True)
+        
+        records = [{VectorBackendSettings.ID_FIELD: vector_id, **metadata} for vector_id, metadata in zip(self.ids, self.metadata)]
+        np.save(os.path.join(path, VectorBackendSettings.VECTORS_FILE), np.ascontiguousarray(self.vectors))
+        
+        if metadata_format == "parquet":
+            import pandas as pd
+            pd.DataFrame.from_records(records).to_parquet(os.path.join(path, VectorBackendSettings.METADATA_PARQUET_FILE), index=False)
+        else:
+            with open(os.path.join(path, VectorBackendSettings.METADATA_JSON_FILE), "w") as metadata_file:
+                json.dump(records, metadata_file, default=str)
+        self.path = path
+
+    def upsert(self, vectors: List[Dict[str, Any]], **kwargs) -> Dict[str, int]:
+        # Buffer writes and rebuild the matrix once on the next read, so bulk loads stay linear
+        with self._pending_lock:
+            for vector in vectors:
+                self._pending_upserts[vector["id"]] = (
+                    np.asarray(vector["values"], dtype=np.float32),
+                    dict(vector.get("metadata") or {})
+                )
+        return {"upserted_count": len(vectors)}
+
+    def flush(self) -> None:
+        with self._pending_lock:
+            if not self._pending_upserts:
+                return
+            pending = self._pending_upserts
+            self._pending_upserts = {}
+        
+        ids = list(self.ids)
+        metadata = list(self.metadata)
+        replacements = {}
+        appended = []
+        for vector_id, (values, vector_metadata) in pending.items():
+            position = self._positions.get(vector_id)
+            if position is None:
+                ids.append(vector_id)
+                metadata.append(vector_metadata)
+                appended.append(values)
+            else:
+                metadata[position] = vector_metadata
+                replacements[position] = values
+        
+        vectors = np.array(self.vectors, dtype=np.float32) if replacements else self.vectors
+        for position, values in replacements.items():
+            vectors[position] = values
+        if appended:
+            vectors = np.vstack([vectors, np.vstack(appended)]) if len(self.ids) else np.vstack(appended)
+        
+        self.ids = ids
+        self.metadata = metadata
+        self._set_vectors(vectors)
+
+    def query(self, *args, **kwargs) -> QueryResponse:
+        self.flush()
+        return super().query(*args, **kwargs)
+
+    def fetch(self, ids: List[str], **kwargs) -> FetchResponse:
+        self.flush()
+        return super().fetch(ids, **kwargs)
+
+    def list(self, prefix: Optional[str] = None, limit: int = 100, **kwargs) -> Iterator[List[str]]:
+        self.flush()
+        return super().list(prefix, limit, **kwargs)
+
+    def describe_index_stats(self, **kwargs) -> IndexStats:
+        self.flush()
+        return super().describe_index_stats(**kwargs)
+
+    def scan(self, filter: Optional[Dict[str, Any]] = None, page_size: int = 100) -> Iterator[List[VectorMatch]]:
+        self.flush()
+        return super().scan(filter, page_size)
+
+def create_vector_backend(
+    backend: Optional[str] = None,
+    api_key: Optional[str] = None,
+    index_name: str = "stock-analysis",
+    local_path: Optional[str] = None
+) -> VectorStoreBackend:
+    backend = (backend or os.getenv(VectorBackendSettings.BACKEND_ENV, VectorBackendSettings.BACKEND_PINECONE)).lower()
+    
+    if backend == VectorBackendSettings.BACKEND_PINECONE:
+        return PineconeBackend(api_key, index_name)
+    if backend == VectorBackendSettings.BACKEND_LOCAL:
+        return NumpyBackend.open(local_path or os.getenv(VectorBackendSettings.LOCAL_PATH_ENV, VectorBackendSettings.LOCAL_PATH))
+    raise ValueError(
+        f"Unknown vector backend '{backend}'. Use '{VectorBackendSettings.BACKEND_PINECONE}' or '{VectorBackendSettings.BACKEND_LOCAL}'."
+    )
+
+# ========================================
+# SCHEDULED MIRROR OF A REMOTE INDEX
+# ========================================
+
+class VectorIndexMirror:
+    def __init__(self, source_index: Any = None, snapshot_path: Optional[str] = None, refresh_seconds: Optional[float] = 3600):
+        if source_index is None and snapshot_path is None:
+            raise ValueError("A source index or a snapshot path is required to build a local mirror")
+        self.logger = logging.getLogger("VectorIndexMirror")
+        self.source_index = source_index
+        self.snapshot_path = snapshot_path
+        self.refresh_seconds = refresh_seconds
+        self._local_index: Optional[LocalVectorIndex] = None
+        self._loaded_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def current(self) -> LocalVectorIndex:
+        if self._is_stale():
+            self._refresh_in_background()
+        return self._local_index
+
+    def refresh(self) -> LocalVectorIndex:
+        start = time.perf_counter()
+        if self.source_index is not None:
+            local_index = LocalVectorIndex.from_pinecone(self.source_index)
+            if self.snapshot_path:
+                local_index.save(self.snapshot_path)
+        else:
+            local_index = LocalVectorIndex.load(self.snapshot_path)
+        with self._lock:
+            self._local_index = local_index
+            self._loaded_at = time.monotonic()
+        self.logger.info(
+            f"Loaded local vector mirror with {len(local_index)} vectors in {time.perf_counter() - start:.2f}s"
+        )
+        return local_index
+
+    def _is_stale(self) -> bool:
+        return self.refresh_seconds is not None and time.monotonic() - self._loaded_at > self.refresh_seconds
+
+    def _refresh_in_background(self) -> None:
+        # Keep serving the current snapshot while the next one loads
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def _run():
+            try:
+                self.refresh()
+            except Exception as error:
+                self.logger.error(f"Local vector mirror refresh failed: {str(error)}")
+                with self._lock:
+                    self._loaded_at = time.monotonic()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=_run, name="vector-mirror-refresh", daemon=True).start()